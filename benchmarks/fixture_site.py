@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""本地测试站点
+
+按需生成 BOSS直聘搜索页、职位详情页、JSON 接口和笔趣阁目录页、章节页，
+页面结构与爬虫使用的选择器一致。每个请求可以附加固定延迟以模拟网络耗时。
+"""
+
+import json
+import threading
+import time
+import zlib
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+class FixtureSite:
+    """本地测试站点，在后台线程中运行
+
+    Args:
+        pages: BOSS 搜索结果页数
+        jobs_per_page: 每页职位数
+        chapters: 小说章节数
+        chapter_size: 每章正文字数
+        latency: 每个请求的额外延迟（秒）
+        host: 监听地址
+        port: 监听端口，0 表示随机端口
+    """
+
+    def __init__(
+        self,
+        pages: int = 5,
+        jobs_per_page: int = 30,
+        chapters: int = 200,
+        chapter_size: int = 3000,
+        latency: float = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.pages = pages
+        self.jobs_per_page = jobs_per_page
+        self.chapters = chapters
+        self.chapter_size = chapter_size
+        self.latency = latency
+        self.requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        site = self
+
+        class Handler(FixtureHandler):
+            fixture = site
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def book_url(self) -> str:
+        return f"{self.url}/book/list.html"
+
+    def count(self, kind: str) -> None:
+        with self._lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+
+    def start(self) -> "FixtureSite":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "FixtureSite":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # BOSS直聘页面
+
+    def job_id(self, query: str, page: int, index: int) -> str:
+        return f"{zlib.crc32(query.encode('utf-8')) % 10000}-{page}-{index}"
+
+    def job_list_page(self, query: str, city: str, page: int) -> str:
+        cards = []
+        # 超出页数的页码返回空列表，与真实站点一致
+        for index in range(self.jobs_per_page if page <= self.pages else 0):
+            job_id = self.job_id(query, page, index)
+            cards.append(
+                f"""<li class="job-card-wrapper">
+  <a class="job-card-left" href="/job_detail/{job_id}.html" target="_blank">
+    <span class="job-name">{escape(query)} 工程师 {job_id}</span>
+    <span class="job-area">深圳·南山区·科技园</span>
+    <span class="salary">{15 + index % 20}-{30 + index % 20}K</span>
+    <ul class="job-info-tags"><li>3-5年</li><li>本科</li></ul>
+  </a>
+  <div class="company-name">测试公司 {index}</div>
+  <ul class="company-tag-list"><li>互联网</li><li>B轮</li><li>100-499人</li></ul>
+</li>"""
+            )
+        disabled = " disabled" if page >= self.pages else ""
+        next_url = f"/web/geek/job?query={escape(query)}&city={city}&page={page + 1}"
+        return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{escape(query)} 招聘</title></head>
+<body>
+<div class="job-list-box"><ul>{"".join(cards)}</ul></div>
+<div class="options-pages">
+  <a href="/web/geek/job?query={escape(query)}&city={city}&page={max(1, page - 1)}">上一页</a>
+  <a class="selected">{page}</a>
+  <a class="next{disabled}" href="{next_url if not disabled else 'javascript:;'}">下一页</a>
+</div>
+</body></html>"""
+
+    def job_detail_page(self, job_id: str) -> str:
+        description = "<br>".join(
+            f"{i + 1}. 负责职位 {escape(job_id)} 的核心模块设计与开发；" for i in range(8)
+        )
+        return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>职位详情</title></head>
+<body><div class="job-detail"><div class="job-sec-text">{description}</div></div></body></html>"""
+
+    def job_list_api(self, query: str, page: int) -> Dict:
+        jobs = [
+            {
+                "encryptJobId": self.job_id(query, page, index),
+                "securityId": f"sec-{self.job_id(query, page, index)}",
+                "lid": "lid",
+                "jobName": f"{query} 工程师",
+                "salaryDesc": "15-30K",
+                "brandName": f"测试公司 {index}",
+                "cityName": "深圳",
+                "areaDistrict": "南山区",
+                "businessDistrict": "科技园",
+                "jobLabels": ["3-5年", "本科"],
+                "brandIndustry": "互联网",
+                "brandStageName": "B轮",
+                "brandScaleName": "100-499人",
+            }
+            for index in range(self.jobs_per_page)
+        ]
+        return {"code": 0, "zpData": {"jobList": jobs, "hasMore": page < self.pages}}
+
+    def job_detail_api(self, security_id: str) -> Dict:
+        return {
+            "code": 0,
+            "zpData": {"jobInfo": {"postDescription": f"职位 {security_id} 的描述"}},
+        }
+
+    # 笔趣阁页面
+
+    def book_list_page(self) -> str:
+        links = [f'<dd><a href="/book/{self.chapters}.html">最新章节</a></dd>']
+        links += [
+            f'<dd><a href="/book/{i}.html">第{i}章 测试章节</a></dd>'
+            for i in range(1, self.chapters + 1)
+        ]
+        return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>测试小说</title></head>
+<body><div class="book_last"><dl>{"".join(links)}</dl></div></body></html>"""
+
+    def chapter_page(self, index: int) -> str:
+        sentence = "这是一段用于基准测试的章节正文。"
+        paragraphs = sentence * max(1, self.chapter_size // len(sentence))
+        return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>第{index}章</title></head>
+<body><h1>第{index}章 测试章节</h1>
+<div id="chaptercontent">{paragraphs}</div></body></html>"""
+
+    def route(self, path: str, query: Dict[str, str]) -> Tuple[int, str, str]:
+        """根据路径生成响应，返回 (状态码, Content-Type, 内容)"""
+        html = "text/html; charset=utf-8"
+        if path == "/web/geek/job":
+            self.count("job_list")
+            page = int(query.get("page", 1))
+            return 200, html, self.job_list_page(query.get("query", ""), query.get("city", ""), page)
+        if path.startswith("/job_detail/"):
+            self.count("job_detail")
+            return 200, html, self.job_detail_page(path.rsplit("/", 1)[-1][:-5])
+        if path == "/wapi/zpgeek/search/joblist.json":
+            self.count("api_job_list")
+            data = self.job_list_api(query.get("query", ""), int(query.get("page", 1)))
+            return 200, "application/json", json.dumps(data, ensure_ascii=False)
+        if path == "/wapi/zpgeek/job/detail.json":
+            self.count("api_job_detail")
+            data = self.job_detail_api(query.get("securityId", ""))
+            return 200, "application/json", json.dumps(data, ensure_ascii=False)
+        if path == "/book/list.html":
+            self.count("book_list")
+            return 200, html, self.book_list_page()
+        if path.startswith("/book/") and path.endswith(".html"):
+            self.count("chapter")
+            return 200, html, self.chapter_page(int(path[len("/book/"):-5]))
+        return 404, "text/plain; charset=utf-8", "not found"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """测试站点请求处理器"""
+
+    fixture: FixtureSite = None
+    protocol_version = "HTTP/1.1"
+    # 响应头和正文分两次写入，关闭 Nagle 算法避免与延迟确认叠加产生 40ms 等待
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        if self.fixture.latency:
+            time.sleep(self.fixture.latency)
+        status, content_type, body = self.fixture.route(parsed.path, query)
+        payload = body.encode("utf-8")
+        # 内容不变时 ETag 不变，支持条件请求
+        etag = f'"{zlib.crc32(payload):08x}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.fixture.count("not_modified")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        if status == 200:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # 不输出访问日志，避免影响测量
+        pass
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""离线基准测试
+
+启动本地测试站点，让 BossSpider 和 BiQuGeSpider 爬取站点中生成的页面，
+输出每秒页数、每秒记录数、峰值内存和 CPU 时间：
+
+    uv run python -m benchmarks.run_benchmark --spider biquge --chapters 500 --latency 0.05
+    uv run python -m benchmarks.run_benchmark --output result.json
+    uv run python -m benchmarks.run_benchmark --baseline result.json --max-regression 0.2
+
+每个爬虫在独立进程中运行，峰值内存互不影响；BossSpider 需要本机安装 Chrome。
+"""
+
+import argparse
+import copy
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixture_site import FixtureSite  # noqa: E402
+from spiders.biquge import BiQuGeSpider  # noqa: E402
+from spiders.boss import BossSpider  # noqa: E402
+
+
+class BenchBiQuGeSpider(BiQuGeSpider):
+    """不输出章节内容、只统计章节数的笔趣阁爬虫"""
+
+    def handle_chapter(self, index, title, content, url=""):
+        if content is not None:
+            self.metrics.inc("items")
+
+
+SPIDERS = {
+    "boss": BossSpider,
+    "biquge": BenchBiQuGeSpider,
+}
+
+
+def parse_args() -> argparse.Namespace:
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="使用本地测试站点测量爬虫吞吐量")
+    parser.add_argument(
+        "--spider",
+        choices=["all", *SPIDERS],
+        default="all",
+        help="要测试的爬虫（默认：%(default)s）",
+    )
+    parser.add_argument("--pages", type=int, default=3, help="BOSS 每个关键词的页数（默认：%(default)s）")
+    parser.add_argument("--jobs-per-page", type=int, default=30, help="BOSS 每页职位数（默认：%(default)s）")
+    parser.add_argument("--keywords", nargs="+", default=["Python"], help="BOSS 搜索关键词（默认：%(default)s）")
+    parser.add_argument(
+        "--mode", choices=["dom", "api"], default="dom", help="BOSS 爬取方式（默认：%(default)s）"
+    )
+    parser.add_argument("--chapters", type=int, default=200, help="小说章节数（默认：%(default)s）")
+    parser.add_argument("--chapter-size", type=int, default=3000, help="每章正文字数（默认：%(default)s）")
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="章节并发下载数，0 表示串行下载（默认：%(default)s）"
+    )
+    parser.add_argument("--latency", type=float, default=0, help="每个请求的模拟延迟，秒（默认：%(default)s）")
+    parser.add_argument(
+        "--rate", type=float, default=0, help="每个主机每秒最多请求数，0 表示不限速（默认：%(default)s）"
+    )
+    parser.add_argument("--output", help="把结果写入 JSON 文件")
+    parser.add_argument("--baseline", help="与之前保存的 JSON 结果比较")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="与基线相比每秒页数下降超过该比例时以非零状态退出（默认：%(default)s）",
+    )
+    return parser.parse_args()
+
+
+def build_config(name: str, site: FixtureSite, args: argparse.Namespace, workdir: str) -> Dict[str, Any]:
+    """在项目配置的基础上生成指向测试站点的配置"""
+    from main import load_config
+
+    config = copy.deepcopy(load_config())
+    config["SPIDER_CONFIG"].update(
+        {
+            "max_pages": args.pages,
+            "checkpoint_file": os.path.join(workdir, "checkpoint.db"),
+        }
+    )
+    config["SPIDER_CONFIG"]["rate_limit"] = {"requests_per_second": args.rate, "burst": 1}
+    config["PROXY_CONFIG"].update({"enabled": False, "check_proxy": False})
+    config["PARALLEL_CONFIG"]["enabled"] = False
+    config["BROWSER_CONFIG"]["pool"]["enabled"] = False
+    config["METRICS_CONFIG"] = {"enabled": False}
+    config["LOG_CONFIG"].update({"level": "WARNING", "file": os.path.join(workdir, "spider.log")})
+    config["SEARCH_CONFIG"].update(
+        {
+            "base_url": site.url,
+            "keywords": args.keywords,
+            "city": "深圳",
+            "cities": [],
+            "mode": args.mode,
+        }
+    )
+    config["STORAGE_CONFIG"].update({"csv_enabled": False, "excel_enabled": False})
+    config["BOOK_CONFIG"].update(
+        {
+            "book_url": site.book_url,
+            "async_enabled": args.concurrency > 0,
+            "concurrency": max(1, args.concurrency),
+        }
+    )
+    return config
+
+
+def run_spider(name: str, config: Dict[str, Any], workdir: str, queue) -> None:
+    """在子进程中运行爬虫并把测量结果放入队列"""
+    os.chdir(workdir)
+    start_time = time.perf_counter()
+    result: Dict[str, Any] = {"error": None}
+    spider = None
+    try:
+        spider = SPIDERS[name](config)
+        spider.run()
+    except Exception as e:
+        result["error"] = str(e)
+    elapsed = time.perf_counter() - start_time
+
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # Linux 上 ru_maxrss 的单位是 KB，macOS 上是字节
+    rss_unit = 1 if sys.platform == "darwin" else 1024
+    summary = spider.metrics.summary() if spider is not None else {"counters": {}, "stages": {}}
+    result.update(
+        {
+            "elapsed": elapsed,
+            "cpu_seconds": own.ru_utime + own.ru_stime,
+            "children_cpu_seconds": children.ru_utime + children.ru_stime,
+            "peak_rss_mb": own.ru_maxrss * rss_unit / 1024 / 1024,
+            "children_peak_rss_mb": children.ru_maxrss * rss_unit / 1024 / 1024,
+            "records": int(summary["counters"].get("items", 0)),
+            "stages": summary["stages"],
+        }
+    )
+    queue.put(result)
+
+
+def benchmark(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """启动测试站点，在子进程中运行一个爬虫，返回测量结果"""
+    site = FixtureSite(
+        pages=args.pages,
+        jobs_per_page=args.jobs_per_page,
+        chapters=args.chapters,
+        chapter_size=args.chapter_size,
+        latency=args.latency,
+    )
+    with site, tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as workdir:
+        config = build_config(name, site, args, workdir)
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=run_spider, args=(name, config, workdir, queue))
+        process.start()
+        result = queue.get()
+        process.join()
+
+    pages = sum(site.requests.values())
+    result.update(
+        {
+            "spider": name,
+            "pages": pages,
+            "requests": dict(site.requests),
+            "pages_per_second": pages / result["elapsed"] if result["elapsed"] else 0,
+            "records_per_second": result["records"] / result["elapsed"] if result["elapsed"] else 0,
+        }
+    )
+    return result
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    """输出单个爬虫的测量结果"""
+    print(f"\n== {result['spider']} ==")
+    if result["error"]:
+        print(f"运行出错: {result['error']}")
+    elif not result["pages"]:
+        print("没有请求任何页面，请检查浏览器能否启动（BossSpider 需要本机安装 Chrome）")
+    print(f"耗时          {result['elapsed']:.2f} 秒")
+    print(f"页面          {result['pages']}  ({result['pages_per_second']:.1f} 页/秒)")
+    print(f"记录          {result['records']}  ({result['records_per_second']:.1f} 条/秒)")
+    print(f"CPU           {result['cpu_seconds']:.2f} 秒（子进程 {result['children_cpu_seconds']:.2f} 秒）")
+    print(f"峰值内存      {result['peak_rss_mb']:.1f} MB（子进程 {result['children_peak_rss_mb']:.1f} MB）")
+    for stage, stats in result["stages"].items():
+        print(
+            f"  {stage:<10} {stats['count']:>6} 次  平均 {stats['avg'] * 1000:8.2f} ms"
+            f"  p95 {stats['p95'] * 1000:8.2f} ms"
+        )
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, max_regression: float) -> bool:
+    """与基线比较每秒页数，返回是否没有超出允许范围的性能下降"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {item["spider"]: item for item in json.load(f)}
+    passed = True
+    print()
+    for result in results:
+        previous = baseline.get(result["spider"])
+        if not previous or not previous["pages_per_second"]:
+            continue
+        change = result["pages_per_second"] / previous["pages_per_second"] - 1
+        status = "OK"
+        if change < -max_regression:
+            status = "性能下降"
+            passed = False
+        print(
+            f"{result['spider']}: {previous['pages_per_second']:.1f} -> "
+            f"{result['pages_per_second']:.1f} 页/秒 ({change:+.1%}) {status}"
+        )
+    return passed
+
+
+def main():
+    """主函数"""
+    args = parse_args()
+    names = list(SPIDERS) if args.spider == "all" else [args.spider]
+
+    results = []
+    for name in names:
+        result = benchmark(name, args)
+        print_result(result)
+        results.append(result)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入 {args.output}")
+
+    if args.baseline and not compare(results, args.baseline, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+# 笔趣阁爬虫配置文件
+
+# 书籍下载配置
+BOOK_CONFIG = {
+    "book_url": "https://b3b.zibq.cc/html/225172/list.html",  # 书籍目录页地址
+    "book_urls": [],  # 同步模式的书籍目录页地址列表，非空时只下载各书新增的章节，忽略 book_url
+    "sync_file": "data/book_sync.db",  # 同步模式下记录每本书最后下载章节的文件
+    "async_enabled": True,  # 是否并发下载章节
+    "concurrency": 8,  # 最大并发下载数，请求速率由 SPIDER_CONFIG["rate_limit"] 控制
+    "storage_enabled": True,  # 是否把章节保存到压缩存储中，关闭时直接输出正文
+    "storage_dir": "data/books",  # 章节存储目录
+    "compression": "zlib",  # 压缩算法：zlib/zstd（需要安装 zstandard）
+    "chunk_kb": 256,  # 每个压缩分块包含的正文大小（KB），越大压缩率越高，随机读取越慢
+    "export_txt": True,  # 下载完成后是否把整本书导出为 txt 文件
+}
@@ -2,8 +2,11 @@
 
 # 搜索参数配置
 SEARCH_CONFIG = {
+    "base_url": "https://www.zhipin.com",  # 站点地址，基准测试时指向本地测试站点
     "keywords": ["Python", "Java", "前端"],  # 搜索关键词列表
+    "mode": "dom",  # 爬取方式：dom（解析页面并逐个打开详情页）/api（在浏览器中直接调用 JSON 接口）
     "city": "深圳",  # 城市
+    "cities": [],  # 多城市列表，非空时按关键词 × 城市拆分任务，覆盖 city
     "salary_range": {  # 薪资范围
         "min": 0,  # 最低薪资（K）
         "max": 100,  # 最高薪资（K）
@@ -16,9 +19,19 @@ SEARCH_CONFIG = {
 
 # 数据存储配置
 STORAGE_CONFIG = {
+    "jsonl_file": "jobs.jsonl",  # 逐条追加写入的 JSON Lines 文件路径
+    "fsync_interval": 10,  # 每追加多少条记录同步一次磁盘
     "json_file": "jobs.json",  # JSON文件保存路径
     "csv_enabled": False,  # 是否同时保存为CSV
     "csv_file": "jobs.csv",  # CSV文件保存路径
     "excel_enabled": True,  # 是否同时保存为Excel
-    "excel_file": "jobs.xlsx",  # Excel文件保存路径
+    "excel_file": "jobs.xlsx",  # Excel文件保存路径（超过 1048576 行的部分不会导出）
+    "parquet_enabled": False,  # 是否同时按分区写入 Parquet 数据集（需要安装 pyarrow）
+    "parquet_dir": "jobs_parquet",  # Parquet 数据集目录
+    "partition_by": ["crawl_date", "搜索关键词", "城市"],  # 分区列，crawl_date 为爬取日期
+    "row_group_size": 5000,  # 每个 row group 的记录数
+    "db_enabled": True,  # 是否把职位保存到 SQLite 职位库，跨运行识别新职位和变化的职位
+    "db_file": "jobs.db",  # 职位库文件路径
+    "db_batch_size": 100,  # 每批写入职位库的记录数
+    "skip_unchanged_details": True,  # 职位库中已有且未变化的职位不再获取详情
 }
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""批量检查代理文件
+
+并发检查代理文件中的所有代理，按延迟排序后把可用代理写入新文件供爬虫使用：
+
+    uv run check_proxies.py proxies_raw.txt -o proxies.txt --workers 500 --max-latency 3
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from spiders.proxy_pool import ProxyPool
+
+
+def parse_args(proxy_config: dict) -> argparse.Namespace:
+    """解析命令行参数，输出文件默认为 config.PROXY_CONFIG 中的代理文件"""
+    parser = argparse.ArgumentParser(description="并发检查代理可用性并输出排序后的代理文件")
+    parser.add_argument(
+        "input",
+        nargs="?",
+        default="proxies_raw.txt",
+        help="待检查的代理文件，每行一个代理（默认：%(default)s）",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=proxy_config["proxy_file"],
+        help="输出文件，按延迟从低到高每行一个可用代理，不能与输入文件相同（默认：%(default)s）",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=500,
+        help="并发检查的线程数（默认：%(default)s）",
+    )
+    parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        default=3,
+        help="单个代理的超时时间，秒，可用代理通常在 1-2 秒内响应（默认：%(default)s）",
+    )
+    parser.add_argument(
+        "--target",
+        default=proxy_config.get("check_url", "https://www.baidu.com"),
+        help="检查代理时访问的地址（默认：%(default)s）",
+    )
+    parser.add_argument(
+        "--max-latency",
+        type=float,
+        default=0,
+        help="只保留延迟不超过该值的代理，秒，0 表示不限制",
+    )
+    parser.add_argument(
+        "--proxy-type",
+        default=proxy_config.get("proxy_type", "http"),
+        help="代理没有协议前缀时使用的协议（默认：%(default)s）",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    import config
+
+    args = parse_args(config.PROXY_CONFIG)
+    logging.basicConfig(level=logging.INFO, format=config.LOG_CONFIG["format"])
+    logger = logging.getLogger("check_proxies")
+
+    if os.path.abspath(args.output) == os.path.abspath(args.input):
+        print("错误：输出文件不能与输入文件相同，检查失败时会覆盖原始代理列表！")
+        sys.exit(1)
+
+    proxies = ProxyPool.load(args.input)
+    if not proxies:
+        print(f"错误：代理文件 {args.input} 不存在或为空！")
+        sys.exit(1)
+
+    pool = ProxyPool(
+        proxies,
+        check_url=args.target,
+        timeout=args.timeout,
+        proxy_type=args.proxy_type,
+        check_workers=args.workers,
+        logger=logger,
+    )
+    logger.info(f"开始检查 {len(pool)} 个代理，并发数 {args.workers}")
+    start_time = time.monotonic()
+    pool.validate_all()
+
+    ranked = [
+        stats
+        for stats in pool.ranked()
+        if not args.max_latency or stats.latency <= args.max_latency
+    ]
+    if not ranked:
+        # 网络故障时所有代理都会检查失败，不覆盖之前的结果
+        logger.error(f"没有可用的代理，未写入 {args.output}，请检查网络或目标地址")
+        sys.exit(1)
+    with open(args.output, "w", encoding="utf-8") as f:
+        for stats in ranked:
+            f.write(f"{stats.proxy}\n")
+
+    logger.info(
+        f"共 {len(ranked)} 个代理可用，已写入 {args.output}，"
+        f"耗时 {time.monotonic() - start_time:.1f} 秒"
+    )
+    for stats in ranked[:10]:
+        logger.info(f"{stats.proxy}  延迟 {stats.latency * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,51 @@
 # 爬虫行为配置
 SPIDER_CONFIG = {
     "max_pages": 1,  # 最大爬取页数
-    "delay": {"min": 3, "max": 5},  # 延时配置（秒）
-    "retry": {  # 重试配置
-        "max_attempts": 3,  # 最大重试次数
-        "delay": 5,  # 重试间隔（秒）
+    "delay": {"min": 3, "max": 5},  # 随机延时配置（秒），仅 random_delay 使用
+    "rate_limit": {  # 按主机限速配置（令牌桶），只在请求预算用完时等待
+        "requests_per_second": 0.25,  # 每个主机每秒最多请求数，0 表示不限速
+        "burst": 1,  # 允许的突发请求数
+        "jitter": 0.3,  # 等待时额外增加的随机时间，占请求间隔的比例
+        "hosts": {  # 按主机覆盖每秒请求数
+            "b3b.zibq.cc": 2,
+        },
+    },
+    "retry": {  # 重试配置（指数退避 + 随机抖动），各错误类型可在 policies 中单独覆盖
+        "max_attempts": 3,  # 最多尝试次数（含第一次）
+        "delay": 5,  # 第一次重试前的等待时间（秒）
+        "backoff": 2,  # 每次重试等待时间的增长倍数
+        "max_delay": 60,  # 单次等待时间上限（秒）
+        "jitter": 0.3,  # 随机抖动占等待时间的比例
+        "rotate": "none",  # 重试前的轮换方式：none/proxy（更换代理）/driver（重启浏览器）
+        "policies": {  # 按错误类型覆盖：timeout/proxy/connection/captcha/http
+            "timeout": {},
+            "proxy": {"delay": 1, "rotate": "proxy"},
+            "connection": {"delay": 2, "rotate": "proxy"},
+            "captcha": {"max_attempts": 2, "delay": 30, "rotate": "driver"},
+            "http": {"delay": 10},
+        },
     },
     "timeout": 30,  # 页面加载超时时间（秒）
+    "readiness": {  # 页面就绪检测，条件满足后立即返回而不是等待固定时间
+        "poll_frequency": 0.1,  # 轮询间隔（秒）
+        "stable_for": 0.3,  # 列表元素数量保持不变多久视为渲染完成（秒）
+        "idle_time": 0.5,  # 多久没有新的网络请求完成视为网络空闲（秒）
+    },
+    "checkpoint_file": "data/checkpoint.db",  # 爬取进度文件，配合 --resume 使用
+}
+
+# 爬取队列配置
+FRONTIER_CONFIG = {
+    "bloom_filter": False,  # 是否使用布隆过滤器去重（URL 数量达到百万级时节省内存）
+    "capacity": 1000000,  # 布隆过滤器预计容量
+    "error_rate": 0.001,  # 布隆过滤器误判率
+}
+
+# 并行配置
+PARALLEL_CONFIG = {
+    "enabled": False,  # 是否按关键词（和城市）拆分任务多进程并行爬取
+    "workers": 3,  # 工作进程数，每个进程使用独立的浏览器和代理
+    "split_pages": False,  # 是否按页拆分任务，同一关键词的多页由不同进程同时爬取
 }
 
 # 代理配置
@@ -16,8 +55,13 @@ PROXY_CONFIG = {
     "enabled": True,  # 是否启用代理
     "proxy_file": "proxies.txt",  # 代理文件路径
     "proxy_type": "http",  # 代理类型：http/https/socks5
-    "check_proxy": True,  # 是否检查代理可用性
+    "check_proxy": True,  # 是否在后台并发检查代理可用性
     "proxy_timeout": 10,  # 代理超时时间（秒）
+    "check_url": "https://www.baidu.com",  # 检查代理时访问的地址
+    "check_workers": 20,  # 并发检查代理的线程数
+    "max_failures": 3,  # 代理连续失败多少次后剔除
+    "revalidate_interval": 300,  # 后台重新检查代理的间隔（秒），0 表示只检查一次
+    "rotate": "driver",  # 代理轮换方式：driver（每个浏览器/会话一个）/request（每次请求重新选择，仅 HTTP 抓取）
 }
 
 # 浏览器配置
@@ -26,6 +70,67 @@ BROWSER_CONFIG = {
     "user_agent_rotate": True,  # 是否轮换User-Agent
     "image_loading": True,  # 是否加载图片
     "window_size": {"width": 1920, "height": 1080},  # 浏览器窗口大小
+    "page_load_strategy": "eager",  # 页面加载策略：normal（等待所有资源）/eager（DOM 就绪即返回）/none
+    "blocking": {  # 通过 CDP 屏蔽不需要的资源请求，节省流量和渲染时间
+        "enabled": True,
+        # 资源类型（image/font/stylesheet/media）或 URL 模式（支持 * 通配符）
+        "block": [
+            "font",
+            "media",
+            "*google-analytics.com*",
+            "*googletagmanager.com*",
+            "*hm.baidu.com*",
+            "*doubleclick.net*",
+        ],
+        "spiders": {  # 按爬虫类名追加（block）或移除（allow）规则
+            "BossSpider": {"block": ["image"], "allow": []},
+        },
+    },
+    "driver_path": "",  # ChromeDriver 路径，留空时自动安装
+    "driver_cache_file": "data/chromedriver_path.txt",  # 缓存自动安装的 ChromeDriver 路径，避免每次启动检查版本
+    "pool": {  # 浏览器池配置
+        "enabled": False,  # 是否复用浏览器池中的浏览器
+        "size": 2,  # 预启动的浏览器数量
+        "max_pages": 200,  # 单个浏览器加载多少页后回收，0 表示不限制
+        "max_rss_mb": 1024,  # 单个浏览器内存占用超过多少 MB 后回收（需要 psutil），0 表示不限制
+    },
+}
+
+# 抓取后端配置
+FETCHER_CONFIG = {
+    "spiders": {},  # 按爬虫类名覆盖抓取后端，如 {"BossSpider": "selenium", "BiQuGeSpider": "http"}
+    "pool_connections": 10,  # HTTP 连接池数量（按主机）
+    "pool_maxsize": 10,  # 每个主机保持的最大连接数
+    "http_timeout": 15,  # HTTP 请求超时时间（秒）
+    "cache": {  # HTTP 响应缓存，只对 http 抓取后端生效
+        "enabled": True,  # 是否缓存页面，过期后带上 ETag/Last-Modified 发送条件请求
+        "dir": "http_cache",  # 缓存目录，位于 data 目录下
+        "max_size_mb": 512,  # 缓存总大小上限（MB），超出后淘汰最久未使用的页面
+        "ttl": 0,  # 缓存有效期（秒），有效期内不发送请求，0 表示每次都向服务端验证
+        "spiders": {  # 按爬虫类名覆盖有效期
+            "BiQuGeSpider": {"ttl": 30 * 24 * 3600},  # 章节发布后很少修改
+        },
+    },
+}
+
+# 分布式爬取配置，通过 python main.py --role coordinator/worker 启动
+DISTRIBUTED_CONFIG = {
+    "backend": "sqlite",  # 任务队列：sqlite（同一台机器上的多个进程）/redis（多台机器，需要安装 redis）
+    "sqlite_file": "data/boss_queue.db",  # SQLite 任务队列文件
+    "redis_url": "redis://localhost:6379/0",  # Redis 地址
+    "queue_name": "boss",  # 队列名称，Redis 中所有键的前缀
+    "visibility_timeout": 600,  # 任务租约时长（秒），超时未完成的任务由其他节点接手
+    "max_attempts": 3,  # 每个任务最多尝试次数
+    "poll_interval": 2,  # 队列为空时的轮询间隔（秒）
+    "idle_timeout": 60,  # 工作节点空闲多久后退出（秒）
+    "result_batch": 100,  # 协调节点每次取出的结果数
+}
+
+# 运行指标配置
+METRICS_CONFIG = {
+    "enabled": True,  # 运行结束时是否输出各阶段耗时汇总并保存指标文件
+    "json_file": "data/metrics_{spider}.json",  # JSON 汇总文件，{spider} 替换为爬虫类名，留空不保存
+    "prometheus_file": "data/metrics_{spider}.prom",  # Prometheus 文本文件，留空不保存
 }
 
 # 日志配置
@@ -1,11 +1,11 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import argparse
 import os
 import sys
 from typing import Dict, Any
-from spiders.boss import BossSpider
-from spiders.biquge import BiQuGeSpider
+from spiders.browser_pool import BrowserPool
 
 def load_config() -> Dict[str, Any]:
     """加载配置文件"""
@@ -19,15 +19,25 @@ def load_config() -> Dict[str, Any]:
         print("错误：BOSS直聘项目配置文件 boss_config.py 不存在！")
         sys.exit(1)
 
+    if not os.path.exists("biquge_config.py"):
+        print("错误：笔趣阁项目配置文件 biquge_config.py 不存在！")
+        sys.exit(1)
+
     try:
         import config
         import boss_config
+        import biquge_config
 
         # 检查通用配置
         common_configs = [
             "SPIDER_CONFIG",
+            "FRONTIER_CONFIG",
+            "PARALLEL_CONFIG",
             "PROXY_CONFIG",
             "BROWSER_CONFIG",
+            "FETCHER_CONFIG",
+            "DISTRIBUTED_CONFIG",
+            "METRICS_CONFIG",
             "LOG_CONFIG",
         ]
 
@@ -46,29 +56,80 @@ def load_config() -> Dict[str, Any]:
         for config_name in project_configs:
             if not hasattr(boss_config, config_name):
                 raise ImportError(f"项目配置文件缺少必要的配置项：{config_name}")
+        if not hasattr(biquge_config, "BOOK_CONFIG"):
+            raise ImportError("笔趣阁配置文件缺少必要的配置项：BOOK_CONFIG")
 
         # 合并配置
         return {
             # 通用配置
             "SPIDER_CONFIG": config.SPIDER_CONFIG,
+            "FRONTIER_CONFIG": config.FRONTIER_CONFIG,
+            "PARALLEL_CONFIG": config.PARALLEL_CONFIG,
             "PROXY_CONFIG": config.PROXY_CONFIG,
             "BROWSER_CONFIG": config.BROWSER_CONFIG,
+            "FETCHER_CONFIG": config.FETCHER_CONFIG,
+            "DISTRIBUTED_CONFIG": config.DISTRIBUTED_CONFIG,
+            "METRICS_CONFIG": config.METRICS_CONFIG,
             "LOG_CONFIG": config.LOG_CONFIG,
             # 项目特定配置
             "SEARCH_CONFIG": boss_config.SEARCH_CONFIG,
             "STORAGE_CONFIG": boss_config.STORAGE_CONFIG,
+            "BOOK_CONFIG": biquge_config.BOOK_CONFIG,
         }
     except ImportError as e:
         print(f"错误：配置文件格式错误！\n{str(e)}")
         sys.exit(1)
 
 
+def parse_args() -> argparse.Namespace:
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Python 爬虫框架")
+    parser.add_argument(
+        "--resume", action="store_true", help="从上次中断的进度继续，跳过已完成的工作"
+    )
+    parser.add_argument(
+        "--role",
+        choices=["coordinator", "worker"],
+        help="分布式爬取 BOSS直聘：coordinator 放入任务并保存结果，worker 从共享队列中领取任务",
+    )
+    return parser.parse_args()
+
+
+def run_distributed(config: Dict[str, Any], role: str, browser_pool, resume: bool) -> None:
+    """以协调节点或工作节点身份运行分布式爬取"""
+    from spiders.boss import BossSpider
+    from spiders.distributed import run_coordinator, run_worker
+    from spiders.work_queue import create_work_queue
+
+    queue = create_work_queue(config)
+    if role == "coordinator":
+        run_coordinator(BossSpider(config, resume=resume), queue, resume=resume)
+    else:
+        # 任务进度由共享队列记录，工作节点使用内存中的进度，不读取也不清除本机的进度文件
+        worker_config = {
+            **config,
+            "SPIDER_CONFIG": {**config["SPIDER_CONFIG"], "checkpoint_file": ":memory:"},
+        }
+        run_worker(BossSpider(worker_config, browser_pool=browser_pool), queue)
+
+
 def main():
     """主函数"""
+    args = parse_args()
+    browser_pool = None
     try:
         config = load_config()
-        # spider = BossSpider(config)
-        spider = BiQuGeSpider(config)
+        if config["BROWSER_CONFIG"]["pool"]["enabled"]:
+            browser_pool = BrowserPool.from_config(config)
+        if args.role:
+            run_distributed(config, args.role, browser_pool, args.resume)
+            return
+        # 只导入要运行的爬虫，BiQuGeSpider 不需要加载 Selenium
+        # from spiders.boss import BossSpider
+        # spider = BossSpider(config, browser_pool=browser_pool, resume=args.resume)
+        from spiders.biquge import BiQuGeSpider
+
+        spider = BiQuGeSpider(config, browser_pool=browser_pool, resume=args.resume)
         spider.run()
     except KeyboardInterrupt:
         print("\n程序被用户中断")
@@ -76,6 +137,9 @@ def main():
     except Exception as e:
         print(f"程序运行出错：{str(e)}")
         sys.exit(1)
+    finally:
+        if browser_pool is not None:
+            browser_pool.close()
 
 
 if __name__ == "__main__":
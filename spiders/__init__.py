@@ -2,6 +2,14 @@
 # -*- coding: utf-8 -*-
 
 from .base import BaseSpider
-from .boss import BossSpider
 
-__all__ = ['BaseSpider', 'BossSpider'] 
\ No newline at end of file
+__all__ = ['BaseSpider', 'BossSpider']
+
+
+def __getattr__(name):
+    # BossSpider 依赖完整的 Selenium，首次使用时才导入，只用 HTTP 抓取的爬虫启动更快
+    if name == "BossSpider":
+        from .boss import BossSpider
+
+        return BossSpider
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
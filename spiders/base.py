@@ -1,44 +1,125 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import importlib.util
 import os
-import sys
 import logging
-from typing import Dict, Any, List
-import json
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional, Tuple
 import time
 import random
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException,
     NoSuchElementException,
-    ElementClickInterceptedException,
+    SessionNotCreatedException,
 )
-from fake_useragent import UserAgent
-import pandas as pd
-import requests
+from .blocking import get_blocked_urls
+from .browser_pool import BrowserPool
+from .checkpoint import CheckpointStore
+from .fetchers import BaseFetcher, create_fetcher
+from .frontier import URLFrontier
+from .http_cache import ResponseCache
+from .metrics import Metrics
+from .proxy_pool import ProxyPool, check_proxy
+from .rate_limiter import HostRateLimiter
+from .readiness import any_of, element_present, wait_until_ready
+from .retry import RetryEngine
+from .storage import (
+    EXCEL_MAX_ROWS,
+    JsonLinesWriter,
+    PartitionedParquetWriter,
+    export_csv,
+    export_excel,
+    export_json,
+    scan_columns,
+)
+
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+# 默认桌面端 User-Agent，fake_useragent 不可用或返回移动端 UA 时使用
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+
+@lru_cache(maxsize=1)
+def load_user_agents():
+    """加载 fake_useragent 数据集，每个进程只加载一次"""
+    from fake_useragent import UserAgent
+
+    return UserAgent()
+
+
+# 批量提取字段的脚本：arguments[0] 为容器选择器，arguments[1] 为 {字段名: [选择器, 属性名]}
+EXTRACT_FIELDS_SCRIPT = """
+const [containerSelector, fields] = arguments;
+return Array.from(document.querySelectorAll(containerSelector)).map((container) => {
+    const item = {};
+    for (const [name, [selector, attribute]] of Object.entries(fields)) {
+        const element = selector ? container.querySelector(selector) : container;
+        if (!element) {
+            item[name] = null;
+        } else if (attribute === "href" || attribute === "src") {
+            item[name] = element[attribute] || null;
+        } else if (attribute) {
+            item[name] = element.getAttribute(attribute);
+        } else {
+            item[name] = element.innerText.trim();
+        }
+    }
+    return item;
+});
+"""
 
 
 class BaseSpider:
     """爬虫基类，提供所有爬虫共享的基础功能"""
 
-    def __init__(self, config: Dict[str, Any]):
+    # 默认抓取后端：selenium 或 http，可在子类或 FETCHER_CONFIG["spiders"] 中覆盖
+    fetcher_type = "selenium"
+    # 页面就绪时应出现的元素（CSS 选择器），任一出现即认为就绪，为空时只等待 body
+    ready_selectors = ()
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        browser_pool: "BrowserPool" = None,
+        resume: bool = False,
+    ):
         """初始化爬虫
 
         Args:
             config: 配置字典，包含所有配置项
+            browser_pool: 浏览器池，提供时从池中租借浏览器而不是新建
+            resume: 是否从上次中断的进度继续，跳过已完成的工作
         """
         self.config = config
+        self.browser_pool = browser_pool
+        self.resume = resume
+        self._checkpoint = None
+        # 等待数据同步到磁盘后再记录的进度
+        self._saved_marks: List[Tuple[str, str]] = []
+        self.pages_loaded = 0
+        self._driver = None
         self.setup_logging()
+        self.metrics = Metrics()
+        self.retry_engine = RetryEngine.from_config(
+            self.config, on_rotate=self.rotate, logger=self.logger, metrics=self.metrics
+        )
         self.logger.info("爬虫初始化开始")
-        self.setup_browser()
+        self.setup_fetcher()
+        self.response_cache = (
+            ResponseCache.from_config(self.config, self.__class__.__name__, self.get_data_file)
+            if self.fetcher.cacheable
+            else None
+        )
         self.logger.info("爬虫初始化完成")
 
         self.data = []
+        self.frontier = URLFrontier.from_config(self.config)
+        self.rate_limiter = HostRateLimiter.from_config(self.config)
+        self.storage: JsonLinesWriter = None
+        self.parquet_writer: Optional[PartitionedParquetWriter] = None
         self.current_page = 1
         self.max_pages = self.config["SPIDER_CONFIG"]["max_pages"]
 
@@ -66,20 +147,184 @@ class BaseSpider:
         Returns:
             str: 合适的 User-Agent 字符串
         """
-        ua = UserAgent()
-        desktop_ua = ua.chrome
+        try:
+            desktop_ua = load_user_agents().chrome
+        except Exception as e:
+            self.logger.warning(f"加载 User-Agent 数据失败: {str(e)}")
+            desktop_ua = None
         if not desktop_ua:
-            desktop_ua = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+            desktop_ua = DEFAULT_USER_AGENT
 
         mobile_keywords = ["Mobile", "Android", "iPhone", "iPad", "Windows Phone"]
         if any(keyword in desktop_ua for keyword in mobile_keywords):
             self.logger.warning("检测到移动端 User-Agent，使用默认桌面端 User-Agent")
-            return "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+            return DEFAULT_USER_AGENT
 
         return desktop_ua
 
+    def get_fetcher_type(self) -> str:
+        """获取当前爬虫使用的抓取后端名称"""
+        fetcher_config = self.config.get("FETCHER_CONFIG", {})
+        return fetcher_config.get("spiders", {}).get(
+            self.__class__.__name__, self.fetcher_type
+        )
+
+    def setup_fetcher(self) -> None:
+        """配置页面抓取器，使用 selenium 后端时会启动浏览器"""
+        fetcher_type = self.get_fetcher_type()
+        self.logger.info(f"使用抓取后端: {fetcher_type}")
+        self.fetcher: BaseFetcher = create_fetcher(fetcher_type, self)
+
+    def fetch(self, url: str, max_age: Optional[float] = None) -> str:
+        """通过当前抓取后端获取页面 HTML，请求前按主机限速，失败时按重试策略重试
+
+        启用响应缓存时，有效期内的页面直接从缓存返回，不发送请求也不占用限速额度。
+
+        Args:
+            url: 页面地址
+            max_age: 缓存有效期（秒），默认使用 FETCHER_CONFIG["cache"] 中的 ttl，
+                0 表示每次都向服务端验证
+        """
+        if self.response_cache is not None:
+            cached = self.response_cache.get_fresh(url, max_age)
+            if cached is not None:
+                self.metrics.inc("cache_hits")
+                return cached.text
+        return self.retry_engine.call(self._fetch_once, url, description=f"请求 {url}")
+
+    def _fetch_once(self, url: str) -> str:
+        self.throttle(url)
+        self.metrics.inc("requests")
+        with self.metrics.timer("fetch"):
+            return self.fetcher.fetch(url)
+
+    def fetch_json(self, url: str, allow_rotate: bool = True) -> Any:
+        """通过当前抓取后端请求 JSON 接口，请求前按主机限速，失败时按重试策略重试
+
+        Args:
+            url: 接口地址
+            allow_rotate: 重试时是否允许更换代理或重启浏览器；
+                在已打开的页面中调用接口时应设为 False
+        """
+        return self.retry_engine.call(
+            self._fetch_json_once,
+            url,
+            description=f"请求 {url}",
+            allow_rotate=allow_rotate,
+        )
+
+    def _fetch_json_once(self, url: str) -> Any:
+        self.throttle(url)
+        self.metrics.inc("requests")
+        with self.metrics.timer("fetch"):
+            return self.fetcher.fetch_json(url)
+
+    def rotate(self, mode: str, category: str, exc: BaseException) -> None:
+        """重试前的轮换回调：更换代理或重启浏览器
+
+        Args:
+            mode: 轮换方式，proxy 或 driver
+            category: 错误类型，captcha 表示当前代理已被封禁
+            exc: 导致重试的异常
+        """
+        banned = category == "captcha"
+        if mode == "driver":
+            self.restart_browser(banned=banned)
+        elif mode == "proxy":
+            self.fetcher.rotate_proxy(banned=banned)
+
+    def restart_browser(self, banned: bool = False) -> None:
+        """退出当前浏览器，下次访问 driver 时使用新代理重新启动
+
+        Args:
+            banned: 当前代理是否已被目标网站封禁
+        """
+        if self._driver is None:
+            return
+        self.report_proxy_failure(getattr(self._driver, "proxy", ""), banned=banned)
+        self.logger.info("重启浏览器")
+        if self.browser_pool is not None:
+            self.browser_pool.discard(self._driver)
+        else:
+            try:
+                self._driver.quit()
+            except Exception as e:
+                self.logger.warning(f"退出浏览器时出错: {str(e)}")
+        self._driver = None
+        self.pages_loaded = 0
+
+    @property
+    def driver(self) -> "webdriver.Chrome":
+        """浏览器实例，首次访问时才启动"""
+        if self._driver is None:
+            self.setup_browser()
+        return self._driver
+
     def setup_browser(self) -> None:
-        """配置浏览器"""
+        """配置浏览器，有浏览器池时从池中租借"""
+        if self.browser_pool is not None:
+            self.browser_pool.prewarm(self.create_driver)
+            self._driver = self.browser_pool.acquire(self.create_driver)
+            self.logger.info("已从浏览器池租借浏览器")
+        else:
+            self._driver = self.create_driver()
+        # 池中的浏览器可能由其他爬虫创建，按当前爬虫的规则重新设置
+        self.apply_resource_blocking()
+
+    def apply_resource_blocking(self) -> None:
+        """通过 CDP Network.setBlockedURLs 屏蔽当前窗口中不需要的资源请求
+
+        屏蔽规则只对设置时的窗口生效，切换到新打开的窗口后需要再次调用。
+        """
+        if self._driver is None:
+            return
+        blocked_urls = get_blocked_urls(self.config, self.__class__.__name__)
+        try:
+            self._driver.execute_cdp_cmd("Network.enable", {})
+            self._driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls})
+        except Exception as e:
+            self.logger.warning(f"设置资源屏蔽规则失败: {str(e)}")
+            return
+        if blocked_urls:
+            self.logger.debug(f"已屏蔽 {len(blocked_urls)} 条 URL 规则")
+
+    def get_chromedriver_path(self, refresh: bool = False) -> str:
+        """获取 ChromeDriver 路径
+
+        优先使用 BROWSER_CONFIG["driver_path"]；否则读取 driver_cache_file 中缓存的路径，
+        缓存不存在或失效时才通过 webdriver_manager 安装并写入缓存，避免每次启动都检查版本。
+
+        Args:
+            refresh: 是否忽略缓存重新安装
+        """
+        browser_config = self.config["BROWSER_CONFIG"]
+        if browser_config.get("driver_path"):
+            return browser_config["driver_path"]
+
+        cache_file = browser_config.get("driver_cache_file", "data/chromedriver_path.txt")
+        if not refresh and os.path.exists(cache_file):
+            with open(cache_file, "r", encoding="utf-8") as f:
+                cached_path = f.read().strip()
+            if cached_path and os.access(cached_path, os.X_OK):
+                return cached_path
+
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        driver_path = ChromeDriverManager().install()
+        cache_dir = os.path.dirname(cache_file)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_file, "w", encoding="utf-8") as f:
+            f.write(driver_path)
+        self.logger.info(f"已缓存 ChromeDriver 路径: {driver_path}")
+        return driver_path
+
+    def create_driver(self) -> "webdriver.Chrome":
+        """创建新的 Chrome 浏览器实例"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service as ChromeService
+
         browser_config = self.config["BROWSER_CONFIG"]
         chrome_options = Options()
 
@@ -100,64 +345,96 @@ class BaseSpider:
             f"--window-size={browser_config['window_size']['width']},{browser_config['window_size']['height']}"
         )
 
+        # eager：DOM 解析完成即返回，不等待图片、样式等子资源
+        chrome_options.page_load_strategy = browser_config.get("page_load_strategy", "normal")
+
+        proxy = ""
         if self.config["PROXY_CONFIG"]["enabled"]:
             proxy = self.get_proxy()
             if proxy:
                 chrome_options.add_argument(f"--proxy-server={proxy}")
 
         try:
-            from selenium.webdriver.chrome.service import Service as ChromeService
-            from webdriver_manager.chrome import ChromeDriverManager
-
-            service = ChromeService(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            try:
+                service = ChromeService(self.get_chromedriver_path())
+                driver = webdriver.Chrome(service=service, options=chrome_options)
+            except SessionNotCreatedException:
+                # Chrome 升级后缓存的 ChromeDriver 版本不匹配，重新安装
+                self.logger.warning("缓存的 ChromeDriver 与 Chrome 版本不匹配，重新安装")
+                service = ChromeService(self.get_chromedriver_path(refresh=True))
+                driver = webdriver.Chrome(service=service, options=chrome_options)
         except Exception as e:
             self.logger.error(f"使用webdriver_manager安装ChromeDriver失败: {str(e)}")
             try:
-                self.driver = webdriver.Chrome(options=chrome_options)
+                driver = webdriver.Chrome(options=chrome_options)
             except Exception as e:
                 self.logger.error(f"创建Chrome浏览器实例失败: {str(e)}")
                 raise
 
-    def get_proxy(self) -> str:
-        """获取代理地址"""
-        proxy_config = self.config["PROXY_CONFIG"]
-        if not os.path.exists(proxy_config["proxy_file"]):
-            self.logger.warning(f"代理文件 {proxy_config['proxy_file']} 不存在")
-            return ""
-
-        try:
-            with open(proxy_config["proxy_file"], "r") as f:
-                proxies = f.readlines()
+        # 记录浏览器使用的代理，请求失败时用于更新代理池中的健康状态
+        driver.proxy = proxy
+        return driver
 
-            if not proxies:
-                return ""
+    @property
+    def proxy_pool(self) -> ProxyPool:
+        """进程内共享的代理池，首次访问时加载代理文件并在后台开始验证"""
+        return ProxyPool.shared(self.config, self.logger)
 
-            proxy = random.choice(proxies).strip()
-
-            if proxy_config["check_proxy"]:
-                if not self.check_proxy(proxy):
-                    return ""
+    def get_proxy(self) -> str:
+        """从代理池获取代理地址，没有可用代理时返回空字符串"""
+        proxy = self.proxy_pool.get()
+        if not proxy:
+            self.logger.warning("没有可用的代理")
+        return proxy
 
-            return proxy
-        except Exception as e:
-            self.logger.error(f"获取代理出错: {str(e)}")
-            return ""
+    def report_proxy_failure(self, proxy: str, banned: bool = False) -> None:
+        """记录代理请求失败，失败过多或被封禁的代理会被剔除"""
+        if proxy:
+            self.proxy_pool.report_failure(proxy, banned=banned)
 
     def check_proxy(self, proxy: str) -> bool:
         """检查代理是否可用"""
-        try:
-            response = requests.get(
-                "https://www.baidu.com",
-                proxies={"http": proxy, "https": proxy},
-                timeout=self.config["PROXY_CONFIG"]["proxy_timeout"],
+        proxy_config = self.config["PROXY_CONFIG"]
+        alive, _ = check_proxy(
+            proxy,
+            proxy_config.get("check_url", "https://www.baidu.com"),
+            proxy_config["proxy_timeout"],
+            proxy_config.get("proxy_type", "http"),
+        )
+        return alive
+
+    def extract_fields(
+        self, container_selector: str, schema: Dict[str, Any]
+    ) -> List[Dict[str, str]]:
+        """用一次 execute_script 批量提取页面中所有容器元素的字段
+
+        Args:
+            container_selector: 容器元素（如职位卡片）的 CSS 选择器
+            schema: 字段名到 CSS 选择器的映射；值为 (选择器, 属性名) 时提取属性，
+                选择器为空字符串时表示容器元素本身
+
+        Returns:
+            List[Dict[str, str]]: 每个容器元素一个字典，顺序与页面一致；
+                未找到的文本字段为 "N/A"，未找到的属性字段为空字符串
+        """
+        fields = {
+            name: list(rule) if isinstance(rule, (tuple, list)) else [rule, None]
+            for name, rule in schema.items()
+        }
+        with self.metrics.timer("extract"):
+            items = self.driver.execute_script(
+                EXTRACT_FIELDS_SCRIPT, container_selector, fields
             )
-            return response.status_code == 200
-        except:
-            return False
+        for item in items:
+            for name, (_, attribute) in fields.items():
+                if item.get(name) is None:
+                    item[name] = "" if attribute else "N/A"
+        return items
 
     def get_element_text_safely(self, element, class_name: str) -> str:
         """安全地获取元素文本"""
+        from selenium.webdriver.common.by import By
+
         try:
             return element.find_element(By.CLASS_NAME, class_name).text.strip()
         except NoSuchElementException:
@@ -166,53 +443,185 @@ class BaseSpider:
             self.logger.error(f"获取 {class_name} 时出错: {str(e)}")
             return "N/A"
 
+    @property
+    def poll_frequency(self) -> float:
+        """等待页面元素时的轮询间隔（秒）"""
+        return self.config["SPIDER_CONFIG"].get("readiness", {}).get("poll_frequency", 0.1)
+
+    def wait(self, timeout: float = None):
+        """创建使用配置轮询间隔的 WebDriverWait，timeout 默认为 SPIDER_CONFIG["timeout"]"""
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        if timeout is None:
+            timeout = self.config["SPIDER_CONFIG"]["timeout"]
+        return WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency)
+
+    def get_readiness_conditions(self) -> List[Callable]:
+        """页面就绪条件，子类可以覆盖以声明自己的条件（见 spiders.readiness）"""
+        if self.ready_selectors:
+            return [any_of(*(element_present(selector) for selector in self.ready_selectors))]
+        return [element_present("body")]
+
     def wait_for_page_load(self, timeout: int = None) -> bool:
-        """等待页面加载完成"""
+        """等待页面满足就绪条件，条件满足后立即返回"""
         if timeout is None:
             timeout = self.config["SPIDER_CONFIG"]["timeout"]
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            with self.metrics.timer("page_load"):
+                wait_until_ready(
+                    self.driver,
+                    self.get_readiness_conditions(),
+                    timeout,
+                    self.poll_frequency,
+                )
             return True
         except TimeoutException:
             self.logger.error("页面加载超时")
             return False
 
+    def throttle(self, url: str) -> None:
+        """按主机限速，只在请求预算用完时等待"""
+        waited = self.rate_limiter.acquire(url)
+        self.metrics.observe("delay", waited)
+        if waited:
+            self.logger.debug(f"限速等待 {waited:.2f} 秒")
+
     def random_delay(self) -> None:
         """随机延时"""
         delay_config = self.config["SPIDER_CONFIG"]["delay"]
-        time.sleep(random.uniform(delay_config["min"], delay_config["max"]))
+        delay = random.uniform(delay_config["min"], delay_config["max"])
+        time.sleep(delay)
+        self.metrics.observe("delay", delay)
+
+    @property
+    def checkpoint(self) -> CheckpointStore:
+        """爬取进度存储，首次访问时打开；非续爬模式下会清除本爬虫的历史进度"""
+        if self._checkpoint is None:
+            checkpoint_file = self.config["SPIDER_CONFIG"].get(
+                "checkpoint_file", "data/checkpoint.db"
+            )
+            self._checkpoint = CheckpointStore(checkpoint_file)
+            if self.resume:
+                self.logger.info(f"从 {checkpoint_file} 恢复爬取进度")
+            else:
+                self._checkpoint.clear(f"{self.__class__.__name__}:")
+        return self._checkpoint
+
+    def is_done(self, kind: str, key: str) -> bool:
+        """判断某项工作在之前的运行中是否已完成"""
+        return self.checkpoint.is_done(f"{self.__class__.__name__}:{kind}", key)
+
+    def mark_done(self, kind: str, key: str) -> None:
+        """记录某项工作已完成"""
+        self.checkpoint.mark_done(f"{self.__class__.__name__}:{kind}", key)
+
+    def mark_saved(self, kind: str, key: str) -> None:
+        """记录数据已写入 JSON Lines 的工作已完成，进度在这些数据同步到磁盘后才写入
+
+        JSON Lines 每 fsync_interval 条记录才同步一次，直接记录进度时进程被杀死，
+        续爬会永久跳过已记录完成但未落盘的数据。
+        """
+        storage = self.storage
+        if storage is None or storage.closed or storage.synced_count == storage.count:
+            self.mark_done(kind, key)
+        else:
+            self._saved_marks.append((kind, key))
+
+    def _commit_saved_marks(self) -> None:
+        """JSON Lines 同步到磁盘后写入等待中的进度"""
+        marks, self._saved_marks = self._saved_marks, []
+        for kind, key in marks:
+            self.mark_done(kind, key)
+
+    def get_data_file(self, name: str) -> str:
+        """获取 data 目录下的文件路径，目录不存在时自动创建"""
+        data_dir = "data"
+        if not os.path.exists(data_dir):
+            os.makedirs(data_dir)
+        return os.path.join(data_dir, name)
+
+    def open_storage(self) -> JsonLinesWriter:
+        """获取 JSON Lines 写入器，首次调用时清空重写（续爬时追加），关闭后再次调用时追加"""
+        if self.storage is None or self.storage.closed:
+            storage_config = self.config["STORAGE_CONFIG"]
+            jsonl_name = storage_config.get("jsonl_file") or (
+                os.path.splitext(storage_config["json_file"])[0] + ".jsonl"
+            )
+            self.storage = JsonLinesWriter(
+                self.get_data_file(jsonl_name),
+                fsync_interval=storage_config.get("fsync_interval", 10),
+                # 续爬时保留上次运行已保存的数据
+                append=self.resume or self.storage is not None,
+                on_sync=self._commit_saved_marks,
+            )
+        return self.storage
+
+    def open_parquet_writer(self) -> Optional[PartitionedParquetWriter]:
+        """获取 Parquet 分区写入器，未启用或未安装 pyarrow 时返回 None"""
+        storage_config = self.config["STORAGE_CONFIG"]
+        if not storage_config.get("parquet_enabled"):
+            return None
+        if self.parquet_writer is None:
+            if importlib.util.find_spec("pyarrow") is None:
+                self.logger.warning("未安装 pyarrow，跳过 Parquet 输出")
+                storage_config["parquet_enabled"] = False
+                return None
+            self.parquet_writer = PartitionedParquetWriter(
+                self.get_data_file(storage_config.get("parquet_dir", "parquet")),
+                partition_by=storage_config.get("partition_by", ["crawl_date"]),
+                row_group_size=storage_config.get("row_group_size", 5000),
+            )
+        return self.parquet_writer
+
+    def write_record(self, record: Dict[str, Any]) -> None:
+        """把一条记录写入 JSON Lines 文件，启用时同时写入 Parquet 数据集"""
+        self.open_storage().write(record)
+        parquet_writer = self.open_parquet_writer()
+        if parquet_writer is not None:
+            parquet_writer.write(record)
+
+    def save_item(self, record: Dict[str, Any]) -> None:
+        """追加保存一条记录，数据直接写入磁盘而不保留在内存中"""
+        self.write_record(record)
+        self.metrics.inc("items")
 
     def save_data(self) -> None:
-        """保存数据到文件"""
+        """把已保存的记录导出为 JSON/CSV/Excel 文件"""
+        with self.metrics.timer("save"):
+            self._save_data()
+
+    def _save_data(self) -> None:
         storage_config = self.config["STORAGE_CONFIG"]
+        storage = self.open_storage()
 
-        # 确保data目录存在
-        data_dir = "data"
-        if not os.path.exists(data_dir):
-            os.makedirs(data_dir)
+        # 兼容直接放入 self.data 的记录
+        for record in self.data:
+            self.write_record(record)
+        self.data = []
+        storage.sync()
+        if self.parquet_writer is not None:
+            self.parquet_writer.flush()
 
         # 构建完整的文件路径
-        json_file = os.path.join(data_dir, storage_config["json_file"])
-        csv_file = os.path.join(data_dir, storage_config["csv_file"])
-        excel_file = os.path.join(data_dir, storage_config["excel_file"])
+        json_file = self.get_data_file(storage_config["json_file"])
+        csv_file = self.get_data_file(storage_config["csv_file"])
+        excel_file = self.get_data_file(storage_config["excel_file"])
 
         # 保存JSON
         try:
-            with open(json_file, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
-            self.logger.info(f"成功保存 {len(self.data)} 条数据到 {json_file}")
+            count = export_json(storage.path, json_file)
+            self.logger.info(f"成功保存 {count} 条数据到 {json_file}")
         except Exception as e:
             self.logger.error(f"保存JSON文件时出错: {str(e)}")
 
-        # 转换为DataFrame
-        df = pd.DataFrame(self.data)
+        if not (storage_config["csv_enabled"] or storage_config["excel_enabled"]):
+            return
+        columns, widths = scan_columns(storage.path)
 
         # 保存CSV
         if storage_config["csv_enabled"]:
             try:
-                df.to_csv(csv_file, index=False, encoding="utf-8-sig")
+                export_csv(storage.path, csv_file, columns)
                 self.logger.info(f"成功保存数据到 {csv_file}")
             except Exception as e:
                 self.logger.error(f"保存CSV文件时出错: {str(e)}")
@@ -220,24 +629,74 @@ class BaseSpider:
         # 保存Excel
         if storage_config["excel_enabled"]:
             try:
-                with pd.ExcelWriter(excel_file, engine="openpyxl") as writer:
-                    df.to_excel(writer, index=False, sheet_name="数据")
-                    worksheet = writer.sheets["数据"]
-                    for idx, col in enumerate(df.columns):
-                        max_length = max(
-                            df[col].astype(str).apply(len).max(), len(str(col))
-                        )
-                        worksheet.column_dimensions[chr(65 + idx)].width = (
-                            max_length + 2
-                        )
+                count = export_excel(storage.path, excel_file, columns, widths)
                 self.logger.info(f"成功保存数据到 {excel_file}")
+                if count > EXCEL_MAX_ROWS - 1:
+                    self.logger.warning(
+                        f"记录数 {count} 超过 Excel 行数上限，"
+                        f"{excel_file} 只包含前 {EXCEL_MAX_ROWS - 1} 条，"
+                        "完整数据请使用 JSON Lines 或 Parquet 文件"
+                    )
             except Exception as e:
                 self.logger.error(f"保存Excel文件时出错: {str(e)}")
 
+    def write_metrics(self) -> None:
+        """输出各阶段耗时汇总，并按 METRICS_CONFIG 写入 JSON 汇总和 Prometheus 文本文件"""
+        metrics_config = self.config.get("METRICS_CONFIG", {})
+        if not metrics_config.get("enabled", True):
+            return
+        summary = self.metrics.summary()
+        self.logger.info(f"运行 {summary['elapsed']:.1f} 秒，计数: {summary['counters']}")
+        for stage, stats in summary["stages"].items():
+            self.logger.info(
+                f"阶段 {stage}: {stats['count']} 次，共 {stats['sum']:.2f} 秒，"
+                f"平均 {stats['avg']:.3f} 秒，最长 {stats['max']:.3f} 秒"
+            )
+
+        name = self.__class__.__name__
+        try:
+            if metrics_config.get("json_file"):
+                self.metrics.write_json(metrics_config["json_file"].format(spider=name))
+            if metrics_config.get("prometheus_file"):
+                self.metrics.write_prometheus(
+                    metrics_config["prometheus_file"].format(spider=name),
+                    labels={"spider": name},
+                )
+        except OSError as e:
+            self.logger.error(f"保存运行指标时出错: {str(e)}")
+
     def cleanup(self) -> None:
         """清理资源"""
-        if hasattr(self, "driver"):
-            self.driver.quit()
+        if hasattr(self, "fetcher"):
+            self.fetcher.close()
+        if getattr(self, "response_cache", None) is not None:
+            self.response_cache.close()
+            self.response_cache = None
+        if self.storage is not None:
+            self.storage.close()
+        if self.parquet_writer is not None:
+            try:
+                self.parquet_writer.close()
+                self.logger.info(
+                    f"成功保存 {self.parquet_writer.count} 条数据到 {self.parquet_writer.root}"
+                )
+                if self.parquet_writer.invalid_values:
+                    self.logger.warning(
+                        f"{self.parquet_writer.invalid_values} 个值与 Parquet 列类型不符，已写为空值"
+                    )
+            except Exception as e:
+                self.logger.error(f"保存Parquet文件时出错: {str(e)}")
+            self.parquet_writer = None
+        if self._checkpoint is not None:
+            self._checkpoint.close()
+            self._checkpoint = None
+        if self._driver is not None:
+            if self.browser_pool is not None:
+                self.browser_pool.release(self._driver, self.pages_loaded)
+                self.pages_loaded = 0
+            else:
+                self._driver.quit()
+            self._driver = None
         self.logger.info("爬虫资源已清理")
 
     def run(self) -> None:
@@ -1,52 +1,302 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from typing import Dict, Any
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import (
-    TimeoutException,
-    ElementClickInterceptedException,
-)
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
 from .base import BaseSpider
+from .book_sync import BookSyncStore
+from .chapter_store import ChapterStore, zstandard
+from utils.html_parser import parse_html
 import time
 
 
 class BiQuGeSpider(BaseSpider):
     """笔趣阁爬虫"""
-    
-    def run(self) -> None:
-        """运行爬虫"""
-        self.logger.info("开始爬取笔趣阁")
-        # https://b3b.zibq.cc/html/225172/list.html
-        self.search_url = "https://b3b.zibq.cc/html/225172/list.html"
-        self.driver.get(self.search_url)
-        self.random_delay()
-        
-        try:
-            zj_list = WebDriverWait(self.driver, self.config["SPIDER_CONFIG"]["timeout"]).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".book_last dl dd a"))
+
+    # 章节页是服务端渲染的静态 HTML，无需启动浏览器
+    fetcher_type = "http"
+    # 使用浏览器抓取时，目录或正文出现即认为页面就绪
+    ready_selectors = (".book_last", "#chaptercontent")
+
+    _sync_store: Optional[BookSyncStore] = None
+    _chapter_store: Optional[ChapterStore] = None
+    # 正在下载的书籍目录页地址
+    book_url: Optional[str] = None
+    # 同步模式下正在下载的书籍目录页地址，以及连续下载成功的最后一个章节 (序号, 地址, 标题)；
+    # 前面的章节下载失败后不再推进
+    current_book: Optional[str] = None
+    sync_position: Optional[Tuple[int, str, str]] = None
+    sync_blocked = False
+
+    @property
+    def sync_store(self) -> BookSyncStore:
+        """书籍同步进度存储，首次访问时打开"""
+        if self._sync_store is None:
+            self._sync_store = BookSyncStore(
+                self.config["BOOK_CONFIG"].get("sync_file", "data/book_sync.db")
             )
-        except TimeoutException:
-            self.logger.error("获取章节列表超时")
+        return self._sync_store
+
+    @property
+    def chapter_store(self) -> Optional[ChapterStore]:
+        """章节压缩存储，首次访问时打开，BOOK_CONFIG["storage_enabled"] 为 False 时为 None"""
+        book_config = self.config["BOOK_CONFIG"]
+        if not book_config.get("storage_enabled"):
+            return None
+        if self._chapter_store is None:
+            compression = book_config.get("compression", "zlib")
+            if compression == "zstd" and zstandard is None:
+                self.logger.warning("未安装 zstandard，章节改用 zlib 压缩")
+            self._chapter_store = ChapterStore(
+                book_config.get("storage_dir", "data/books"),
+                chunk_bytes=book_config.get("chunk_kb", 256) * 1024,
+                compression=compression,
+            )
+        return self._chapter_store
+
+    def get_chapter_list(self, book_url: str) -> List[Tuple[str, str]]:
+        """获取章节列表
+
+        Args:
+            book_url: 书籍目录页地址
+
+        Returns:
+            List[Tuple[str, str]]: (章节标题, 章节地址) 列表
+        """
+        # 目录页会随新章节更新，每次都向服务端验证缓存
+        document = parse_html(self.fetch(book_url, max_age=0))
+        links = document.select(".book_last dl dd a")
+        return [(link.text, urljoin(book_url, link.get("href"))) for link in links]
+
+    def get_chapter_content(self, chapter_url: str) -> str:
+        """获取章节正文"""
+        html = self.fetch(chapter_url)
+        with self.metrics.timer("extract"):
+            content = parse_html(html).select_one("#chaptercontent")
+        if content is None:
+            self.logger.warning(f"章节 {chapter_url} 未找到正文")
+            return ""
+        return content.text
+
+    def timed_chapter_content(self, chapter_url: str) -> str:
+        """获取章节正文并记录单章耗时"""
+        with self.metrics.timer("chapter"):
+            return self.get_chapter_content(chapter_url)
+
+    def handle_chapter(
+        self, index: int, title: str, content: Optional[str], url: str = ""
+    ) -> None:
+        """处理按顺序到达的章节
+
+        未启用章节存储时把标题和正文输出到控制台，启用时保存正文并记录日志。
+
+        Args:
+            index: 章节序号（从 0 开始）
+            title: 章节标题
+            content: 章节正文，下载失败时为 None
+            url: 章节地址
+        """
+        if content is None:
+            self.logger.error(f"章节 {title} 下载失败")
             return
-        
-        zj_list = zj_list[1:]
-        for zj in zj_list:
-            print(zj.text)
-            start_time = time.time()
-            # 点击zj在另一个窗口打开
-            zj_url = zj.get_attribute("href")
-            self.driver.execute_script("window.open('{}');".format(zj_url))
-            self.driver.switch_to.window(self.driver.window_handles[1])
-            self.random_delay()
-            # 获取章节内容
-            content = self.driver.find_element(By.ID, "chaptercontent").text
+        if self.chapter_store is None:
+            print(title)
             print(content)
-            self.driver.close()
-            self.driver.switch_to.window(self.driver.window_handles[0])
-            self.random_delay()
-            # 计算花了多少时间
-            end_time = time.time()
-            print(f"花了{end_time - start_time}秒")
+            return
+        if self.chapter_store.write(self.book_url, index, title, content, url=url):
+            self.logger.info(f"已保存章节 {title}")
+        else:
+            self.logger.debug(f"章节 {title} 未变化，跳过保存")
+
+    def complete_chapter(
+        self, index: int, title: str, url: str, content: Optional[str]
+    ) -> None:
+        """处理章节并在成功时记录进度
+
+        同步模式下章节按顺序到达，记录连续成功的最后一个章节，
+        某章失败后本次不再推进，下次同步时从失败的章节重新下载。
+        """
+        self.handle_chapter(index, title, content, url=url)
+        if content is None:
+            self.sync_blocked = True
+            return
+        self.mark_done("chapter", url)
+        if self.current_book and not self.sync_blocked:
+            self.sync_position = (index, url, title)
+
+    def download_chapters(self, chapters: List[Tuple[str, str]], start: int = 0) -> None:
+        """逐章串行下载，续爬模式下跳过已完成的章节
+
+        Args:
+            chapters: (章节标题, 章节地址) 列表
+            start: 第一个章节在目录中的位置
+        """
+        for index, (title, zj_url) in enumerate(chapters, start):
+            if self.is_done("chapter", zj_url) or not self.frontier.mark_seen(zj_url):
+                continue
+            # 获取章节内容
+            try:
+                content = self.timed_chapter_content(zj_url)
+            except Exception as e:
+                self.logger.error(f"获取章节 {title} 失败: {str(e)}")
+                content = None
+            self.complete_chapter(index, title, zj_url, content)
+
+    async def download_chapters_async(
+        self, chapters: List[Tuple[str, str]], start: int = 0
+    ) -> None:
+        """并发下载章节，按章节顺序交给 handle_chapter 处理
+
+        章节按序号作为优先级推入爬取队列，BOOK_CONFIG["concurrency"] 个协程从队列中取出下载，
+        请求速率由共享的按主机限速器控制。先完成的章节会暂存，
+        直到前面的章节全部到达。重复的章节和续爬模式下已完成的章节会被跳过。
+
+        Args:
+            chapters: (章节标题, 章节地址) 列表
+            start: 第一个章节在目录中的位置
+        """
+        book_config = self.config["BOOK_CONFIG"]
+        concurrency = max(1, book_config["concurrency"])
+        loop = asyncio.get_running_loop()
+
+        order = []
+        for index, (title, url) in enumerate(chapters, start):
+            if self.is_done("chapter", url):
+                continue
+            if self.frontier.push(url, priority=index, data=(index, title)):
+                order.append(index)
+        if len(order) < len(chapters):
+            self.logger.info(f"跳过 {len(chapters) - len(order)} 个重复或已完成的章节")
+
+        pending: Dict[int, Tuple[str, str, Optional[str]]] = {}
+        position = 0
+
+        def flush() -> None:
+            nonlocal position
+            while position < len(order) and order[position] in pending:
+                next_index = order[position]
+                self.complete_chapter(next_index, *pending.pop(next_index))
+                position += 1
+
+        async def worker() -> None:
+            while True:
+                item = self.frontier.pop()
+                if item is None:
+                    return
+                url, (index, title) = item
+                try:
+                    content = await loop.run_in_executor(
+                        executor, self.timed_chapter_content, url
+                    )
+                except Exception as e:
+                    self.logger.error(f"获取章节 {title} 失败: {str(e)}")
+                    content = None
+                pending[index] = (title, url, content)
+                flush()
+
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+        self.logger.info(
+            f"共下载 {len(order)} 个章节，花了{time.time() - start_time:.2f}秒"
+        )
+
+    def download(self, chapters: List[Tuple[str, str]], start: int = 0) -> None:
+        """按 BOOK_CONFIG["async_enabled"] 并发或串行下载章节"""
+        if self.config["BOOK_CONFIG"]["async_enabled"]:
+            asyncio.run(self.download_chapters_async(chapters, start))
+        else:
+            self.download_chapters(chapters, start)
+
+    def get_book_chapters(self, book_url: str) -> List[Tuple[str, str]]:
+        """获取书籍目录中的章节列表，第一个链接是最新章节，跳过"""
+        return self.get_chapter_list(book_url)[1:]
+
+    def sync_books(self, book_urls: List[str]) -> None:
+        """同步多本书，每本书只下载上次同步之后新增的章节
+
+        目录页并发获取（配合响应缓存，未更新的目录只需一次条件请求），
+        之后逐本下载新增章节并推进同步进度。
+        """
+        concurrency = max(1, self.config["BOOK_CONFIG"].get("concurrency", 1))
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {url: executor.submit(self.get_book_chapters, url) for url in book_urls}
+
+        total = 0
+        for book_url, future in futures.items():
+            try:
+                chapters = future.result()
+            except Exception as e:
+                self.logger.error(f"获取 {book_url} 的章节列表失败: {str(e)}")
+                continue
+            start, new_chapters = self.sync_store.new_chapters(book_url, chapters)
+            if not new_chapters:
+                self.logger.info(f"{book_url} 没有新章节")
+                continue
+            self.logger.info(f"{book_url} 共 {len(chapters)} 个章节，新增 {len(new_chapters)} 个")
+            total += len(new_chapters)
+            self.book_url = self.current_book = book_url
+            self.sync_position, self.sync_blocked = None, False
+            try:
+                self.download(new_chapters, start)
+            finally:
+                self.current_book = None
+                # 章节写入磁盘后再推进同步进度，中途退出时下次会重新下载这些章节
+                if self.chapter_store is not None:
+                    self.chapter_store.flush()
+                if self.sync_position is not None:
+                    self.sync_store.advance(book_url, *self.sync_position)
+            self.export_book(book_url)
+        self.logger.info(f"同步完成，{len(book_urls)} 本书共新增 {total} 个章节")
+
+    def export_book(self, book_url: str) -> None:
+        """按 BOOK_CONFIG["export_txt"] 把已保存的章节导出为 txt 文件"""
+        if self.chapter_store is None or not self.config["BOOK_CONFIG"].get("export_txt"):
+            return
+        path = os.path.splitext(self.chapter_store.data_file(book_url))[0] + ".txt"
+        try:
+            count = self.chapter_store.export_txt(book_url, path)
+            self.logger.info(f"成功导出 {book_url} 的 {count} 个章节到 {path}")
+        except Exception as e:
+            self.logger.error(f"导出 {book_url} 时出错: {str(e)}")
+
+    def cleanup(self) -> None:
+        """清理资源，关闭同步进度存储和章节存储"""
+        if self._sync_store is not None:
+            self._sync_store.close()
+            self._sync_store = None
+        if self._chapter_store is not None:
+            self._chapter_store.close()
+            self._chapter_store = None
+        super().cleanup()
+
+    def run(self) -> None:
+        """运行爬虫
+
+        BOOK_CONFIG["book_urls"] 非空时进入同步模式，只下载各书新增的章节；
+        否则下载 book_url 的全部章节。
+        """
+        self.logger.info("开始爬取笔趣阁")
+        book_config = self.config["BOOK_CONFIG"]
+
+        try:
+            if book_config.get("book_urls"):
+                self.sync_books(book_config["book_urls"])
+                return
+
+            self.search_url = self.book_url = book_config["book_url"]
+            try:
+                zj_list = self.get_book_chapters(self.search_url)
+            except Exception as e:
+                self.logger.error(f"获取章节列表失败: {str(e)}")
+                return
+            self.logger.info(f"共找到 {len(zj_list)} 个章节")
+            self.download(zj_list)
+            self.export_book(self.book_url)
+        finally:
+            self.write_metrics()
+            self.cleanup()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from typing import Any, Dict, List
+
+# 资源类型对应的 URL 模式。Network.setBlockedURLs 只能按 URL 匹配，资源类型按扩展名近似
+RESOURCE_TYPE_PATTERNS: Dict[str, List[str]] = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.bmp*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "stylesheet": ["*.css*"],
+    "media": ["*.mp4*", "*.webm*", "*.mp3*", "*.m3u8*", "*.ogg*", "*.wav*", "*.flv*"],
+}
+
+
+def expand_rules(rules: List[str]) -> List[str]:
+    """把资源类型展开为 URL 模式，其他规则视为 URL 模式原样保留"""
+    patterns = []
+    for rule in rules:
+        patterns.extend(RESOURCE_TYPE_PATTERNS.get(rule, [rule]))
+    return patterns
+
+
+def get_blocked_urls(config: Dict[str, Any], spider_name: str) -> List[str]:
+    """根据 BROWSER_CONFIG["blocking"] 计算某个爬虫要屏蔽的 URL 模式
+
+    全局 block 规则对所有爬虫生效；spiders 中按爬虫类名追加 block 规则，
+    allow 规则从继承的规则中移除对应的资源类型或 URL 模式。
+
+    Args:
+        config: 配置字典
+        spider_name: 爬虫类名
+
+    Returns:
+        List[str]: 去重后的 URL 模式，未启用时返回空列表
+    """
+    blocking = config["BROWSER_CONFIG"].get("blocking", {})
+    if not blocking.get("enabled"):
+        return []
+    spider_rules = blocking.get("spiders", {}).get(spider_name, {})
+    allowed = set(expand_rules(spider_rules.get("allow", [])))
+    patterns = expand_rules(blocking.get("block", []) + spider_rules.get("block", []))
+    return [pattern for pattern in dict.fromkeys(patterns) if pattern not in allowed]
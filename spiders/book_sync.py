@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class BookSyncStore:
+    """基于 SQLite 的书籍同步进度
+
+    每本书记录最后一个已下载的章节（目录中的位置、地址和标题），
+    与当前目录比较即可得到新增的章节。与 CheckpointStore 不同，同步进度不会在非续爬模式下清除。
+    """
+
+    def __init__(self, path: str):
+        """初始化同步进度存储
+
+        Args:
+            path: SQLite 数据库文件路径
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS books (
+                book_url TEXT PRIMARY KEY,
+                last_index INTEGER NOT NULL,
+                last_url TEXT NOT NULL,
+                last_title TEXT NOT NULL,
+                synced_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, book_url: str) -> Optional[Dict[str, Any]]:
+        """读取一本书的同步进度，从未同步过时返回 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_index, last_url, last_title, synced_at FROM books WHERE book_url = ?",
+                (book_url,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"last_index": row[0], "last_url": row[1], "last_title": row[2], "synced_at": row[3]}
+
+    def advance(self, book_url: str, index: int, url: str, title: str) -> None:
+        """记录一本书已下载到目录中的第 index 个章节"""
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO books (book_url, last_index, last_url, last_title, synced_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (book_url, index, url, title, time.time()),
+            )
+            self._conn.commit()
+
+    def new_chapters(
+        self, book_url: str, chapters: List[Tuple[str, str]]
+    ) -> Tuple[int, List[Tuple[str, str]]]:
+        """比较当前目录和同步进度，返回 (第一个新章节在目录中的位置, 新章节列表)
+
+        优先按最后一个章节的地址定位，目录中找不到该地址时（如站点调整了目录）按位置定位。
+        """
+        state = self.get(book_url)
+        if state is None:
+            return 0, chapters
+        start = state["last_index"] + 1
+        for index in range(len(chapters) - 1, -1, -1):
+            if chapters[index][1] == state["last_url"]:
+                start = index + 1
+                break
+        return start, chapters[start:]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,222 +1,678 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from typing import Dict, Any
+import atexit
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from urllib.parse import urlencode
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException,
-    ElementClickInterceptedException,
 )
 from .base import BaseSpider
+from .browser_pool import BrowserPool
+from .job_store import JobStore
+from .metrics import Metrics
+from .rate_limiter import scale_rate_limit
+from .readiness import (
+    all_of,
+    any_of,
+    element_absent,
+    element_count_stable,
+    element_present,
+    network_idle,
+    xhr_completed,
+)
+from .retry import CaptchaError, retryable
 from utils.city_mapping import get_city_id
 
+# BOSS直聘站点地址，可通过 SEARCH_CONFIG["base_url"] 覆盖（如本地基准测试站点）
+BASE_URL = "https://www.zhipin.com"
+# JSON 接口和职位详情页路径
+API_PATH = "/wapi/zpgeek"
+API_PAGE_SIZE = 30
+JOB_DETAIL_PATH = "/job_detail"
+# 触发验证码时跳转的页面地址片段
+CAPTCHA_URL_MARKERS = ("security-check", "verify-slider", "/safe/verify")
+# 接口返回的"访问行为异常"错误码
+API_CAPTCHA_CODES = (35, 36, 37)
+
+# 工作进程内复用的浏览器池，由 _init_worker 创建
+_worker_browser_pool: Optional[BrowserPool] = None
+
 
 class BossSpider(BaseSpider):
     """Boss直聘爬虫"""
 
-    def build_search_url(self, keyword: str = "") -> str:
+    # 职位卡片字段：字段名 -> CSS 选择器，或 (CSS 选择器, 属性名)
+    job_card_schema = {
+        "职位": ".job-name",
+        "薪资": ".salary",
+        "公司": ".company-name",
+        "地点": ".job-area",
+        "要求": ".job-info-tags",
+        "公司类型": ".company-tag-list",
+        "链接": (".job-card-left", "href"),
+    }
+
+    # 是否把每条数据直接追加写入磁盘，并行模式下工作进程把数据交给主进程统一保存
+    autosave = True
+
+    _job_store: Optional[JobStore] = None
+
+    @property
+    def site_url(self) -> str:
+        """站点地址"""
+        return self.config["SEARCH_CONFIG"].get("base_url", BASE_URL).rstrip("/")
+
+    def build_search_url(self, keyword: str = "", city: str = "", page: int = 1) -> str:
         """根据搜索配置构建URL
 
         Args:
             keyword: 搜索关键词，默认为空字符串
+            city: 城市名称，默认使用 SEARCH_CONFIG["city"]
+            page: 页码，大于 1 时在地址中加上 page 参数
         """
         search_config = self.config["SEARCH_CONFIG"]
         if not keyword and search_config["keywords"]:
             keyword = search_config["keywords"][0]
+        if not city:
+            city = search_config["city"]
 
-        city_id = get_city_id(search_config["city"])
+        city_id = get_city_id(city)
         if not city_id:
-            self.logger.error(f"未找到城市 {search_config['city']} 的ID映射")
-            raise ValueError(f"未找到城市 {search_config['city']} 的ID映射")
+            self.logger.error(f"未找到城市 {city} 的ID映射")
+            raise ValueError(f"未找到城市 {city} 的ID映射")
 
-        return f"https://www.zhipin.com/web/geek/job?query={keyword}&city={city_id}"
+        url = f"{self.site_url}/web/geek/job?query={keyword}&city={city_id}"
+        if page > 1:
+            url += f"&page={page}"
+        return url
 
-    def wait_for_page_load(self) -> bool:
-        """等待页面加载完成"""
-        try:
-            timeout = self.config["SPIDER_CONFIG"]["timeout"]
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "job-list-box"))
-            )
-            WebDriverWait(self.driver, timeout).until_not(
-                EC.presence_of_element_located((By.CLASS_NAME, "loading"))
-            )
+    def get_readiness_conditions(self) -> List[Callable]:
+        """搜索页就绪条件：加载动画消失，且职位卡片数量稳定或搜索接口已返回（无结果时）
+
+        每次轮询都会检查是否跳转到验证码页，触发验证码时立即抛出 CaptchaError 而不是等到超时。
+        """
+        readiness_config = self.config["SPIDER_CONFIG"].get("readiness", {})
+
+        def not_captcha(driver):
+            self.check_captcha()
             return True
-        except TimeoutException:
-            self.logger.error("页面加载超时")
+
+        return [
+            not_captcha,
+            element_present(".job-list-box"),
+            element_absent(".loading"),
+            any_of(
+                element_count_stable(
+                    ".job-card-wrapper",
+                    min_count=1,
+                    stable_for=readiness_config.get("stable_for", 0.3),
+                ),
+                all_of(
+                    xhr_completed("search/joblist.json"),
+                    network_idle(readiness_config.get("idle_time", 0.5)),
+                ),
+            ),
+        ]
+
+    def check_captcha(self) -> None:
+        """检查当前页面是否跳转到了验证码页
+
+        Raises:
+            CaptchaError: 当前页面是验证码页
+        """
+        current_url = self.driver.current_url
+        if any(marker in current_url for marker in CAPTCHA_URL_MARKERS):
+            raise CaptchaError(f"触发验证码: {current_url}")
+
+    @retryable("打开搜索页")
+    def open_search_page(self, url: str) -> None:
+        """打开搜索页并等待职位列表加载，超时或触发验证码时按重试策略重试
+
+        触发验证码时按策略重启浏览器并更换代理后重新打开。
+        """
+        self.throttle(url)
+        self.metrics.inc("requests")
+        with self.metrics.timer("fetch"):
+            self.driver.get(url)
+        self.pages_loaded += 1
+        self.check_captcha()
+        if not self.wait_for_page_load():
+            self.check_captcha()
+            raise TimeoutException(f"搜索页 {url} 加载超时")
+
+    def has_next_page(self) -> bool:
+        """根据当前页的分页栏判断是否还有下一页"""
+        next_buttons = self.driver.find_elements(By.CSS_SELECTOR, ".options-pages a")
+        if not next_buttons:
             return False
+        return "disabled" not in (next_buttons[-1].get_attribute("class") or "")
+
+    def get_job_details(self, job_card) -> str:
+        """获取职位详情页信息，超时时关闭详情窗口后按重试策略重新打开"""
+        main_window = self.driver.current_window_handle
+
+        def close_detail_windows():
+            for window_handle in self.driver.window_handles:
+                if window_handle != main_window:
+                    self.driver.switch_to.window(window_handle)
+                    self.driver.close()
+            self.driver.switch_to.window(main_window)
+
+        try:
+            # 详情页在新窗口中打开，依赖当前列表页，重试时不能重启浏览器
+            with self.metrics.timer("detail"):
+                return self.retry_engine.call(
+                    self.open_job_details,
+                    job_card,
+                    main_window,
+                    description="获取职位详情",
+                    before_retry=close_detail_windows,
+                    allow_rotate=False,
+                )
+        except Exception as e:
+            self.logger.error(f"获取职位详情时出错: {str(e)}")
+            try:
+                close_detail_windows()
+            except Exception:
+                pass
+            return "获取详情失败"
+
+    def open_job_details(self, job_card, main_window: str) -> str:
+        """在新标签页中打开职位详情，读取职位描述后关闭标签页
+
+        先打开空白标签页并设置资源屏蔽规则，再导航到详情页，
+        保证详情页的资源请求从一开始就受屏蔽规则约束。
+        """
+        job_link = job_card.find_element(By.CLASS_NAME, "job-card-left")
+        href = job_link.get_attribute("href")
+        self.throttle(href or self.base_url)
+        self.metrics.inc("requests")
+        if href:
+            self.driver.switch_to.new_window("tab")
+            self.apply_resource_blocking()
+            with self.metrics.timer("fetch"):
+                self.driver.get(href)
+        else:
+            # 没有链接地址时只能点击卡片，屏蔽规则在新窗口打开后才生效
+            window_count = len(self.driver.window_handles)
+            with self.metrics.timer("fetch"):
+                self.driver.execute_script("arguments[0].click();", job_link)
+                self.wait().until(EC.number_of_windows_to_be(window_count + 1))
+            for window_handle in self.driver.window_handles:
+                if window_handle != main_window:
+                    self.driver.switch_to.window(window_handle)
+                    break
+            self.apply_resource_blocking()
+        self.pages_loaded += 1
+
+        self.check_captcha()
+        self.wait().until(
+            EC.presence_of_element_located((By.CLASS_NAME, "job-sec-text"))
+        )
 
-    def click_next_page(self) -> bool:
-        """点击下一页按钮"""
         try:
-            pagination = WebDriverWait(
-                self.driver, self.config["SPIDER_CONFIG"]["timeout"]
-            ).until(EC.presence_of_element_located((By.CLASS_NAME, "options-pages")))
+            job_description = self.driver.find_element(
+                By.CLASS_NAME, "job-sec-text"
+            ).text
+        except Exception as e:
+            self.logger.error(f"获取详细要求时出错: {str(e)}")
+            job_description = "获取详细要求出错"
+
+        self.driver.close()
+        self.driver.switch_to.window(main_window)
+        return job_description
+
+    def get_tasks(self) -> List[Tuple[str, str]]:
+        """获取待爬取的 (关键词, 城市) 任务列表
 
-            next_buttons = self.driver.find_elements(
-                By.CSS_SELECTOR, ".options-pages a"
+        SEARCH_CONFIG["cities"] 非空时按关键词 × 城市拆分，否则只使用 SEARCH_CONFIG["city"]。
+        """
+        search_config = self.config["SEARCH_CONFIG"]
+        cities = search_config.get("cities") or [search_config["city"]]
+        return [
+            (keyword, city) for keyword in search_config["keywords"] for city in cities
+        ]
+
+    @property
+    def job_store(self) -> Optional[JobStore]:
+        """跨运行保存职位的职位库，首次访问时打开，STORAGE_CONFIG["db_enabled"] 为 False 时为 None"""
+        storage_config = self.config["STORAGE_CONFIG"]
+        if not storage_config.get("db_enabled"):
+            return None
+        if self._job_store is None:
+            self._job_store = JobStore(
+                self.get_data_file(storage_config.get("db_file", "jobs.db")),
+                batch_size=storage_config.get("db_batch_size", 100),
             )
-            next_button = next_buttons[-1] if next_buttons else None
+        return self._job_store
+
+    def get_stored_details(self, job_info: Dict[str, Any]) -> Optional[str]:
+        """职位已在职位库中且列表字段未变化时返回保存的详细要求，否则返回 None"""
+        storage_config = self.config["STORAGE_CONFIG"]
+        if self.job_store is None or not storage_config.get("skip_unchanged_details", True):
+            return None
+        stored = self.job_store.find_unchanged(job_info)
+        details = (stored or {}).get("详细要求")
+        if not details or details == "获取详情失败":
+            return None
+        self.metrics.inc("details_skipped")
+        return details
+
+    def save_job(self, job_info: Dict[str, Any]) -> None:
+        """保存职位数据并记录进度，并行模式下交给主进程保存"""
+        if not self.autosave:
+            self.data.append(job_info)
+            return
+        self.save_item(job_info)
+        if self.job_store is not None:
+            self.metrics.inc(f"jobs_{self.job_store.upsert(job_info)}")
+        if job_info.get("链接"):
+            self.mark_saved("job", job_info["链接"])
+
+    def get_pages(self) -> List[int]:
+        """获取每个关键词要爬取的页码"""
+        return list(range(1, self.max_pages + 1))
+
+    def crawl_keyword(
+        self, keyword: str, city: str = "", pages: List[int] = None
+    ) -> bool:
+        """爬取单个关键词在单个城市下的所有页
+
+        续爬模式下会跳过已完成的关键词、页和职位。
 
-            if not next_button:
-                self.logger.warning("未找到下一页按钮")
-                return False
+        Args:
+            keyword: 搜索关键词
+            city: 城市名称，默认使用 SEARCH_CONFIG["city"]
+            pages: 要爬取的页码，默认为 1 到 max_pages
 
-            if "disabled" in next_button.get_attribute("class"):
-                self.logger.info("已经是最后一页")
-                return False
+        Returns:
+            bool: 是否正常爬完所有页
+        """
+        city = city or self.config["SEARCH_CONFIG"]["city"]
+        task_key = f"{keyword}|{city}"
+        if self.is_done("keyword", task_key):
+            self.logger.info(f"关键词 {keyword}（{city}）已完成，跳过")
+            return True
 
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center'});", pagination
-            )
-            self.random_delay()
+        self.logger.info(f"开始爬取关键词：{keyword}（{city}）")
+        pages = pages or self.get_pages()
+        self.base_url = self.build_search_url(keyword, city)
 
+        if self.config["SEARCH_CONFIG"].get("mode", "dom") == "api":
             try:
-                next_button.click()
-                self.logger.info("已点击下一页按钮")
-
-                if self.wait_for_page_load():
-                    self.current_page += 1
-                    self.logger.info(f"成功翻到第 {self.current_page} 页")
-                    return True
+                # 接口依赖搜索页中的 Cookie 和令牌，先打开一次搜索页
+                self.open_search_page(self.base_url)
+            except Exception as e:
+                self.logger.error(f"打开搜索页失败: {str(e)}")
                 return False
+            finished = self.crawl_pages_api(keyword, city, pages)
+        else:
+            finished = self.crawl_pages_dom(keyword, city, pages)
+
+        if finished and self.autosave and pages == self.get_pages():
+            self.mark_saved("keyword", task_key)
+        return finished
+
+    def crawl_pages_dom(self, keyword: str, city: str, pages: List[int]) -> bool:
+        """按页码直接打开各页搜索结果并解析职位卡片
+
+        每页的地址由 build_search_url 计算，不依赖翻页按钮，
+        各页互不依赖，可以拆分给不同进程并行爬取。
 
-            except ElementClickInterceptedException:
-                self.driver.execute_script("arguments[0].click();", next_button)
-                if self.wait_for_page_load():
-                    self.current_page += 1
-                    self.logger.info(f"成功翻到第 {self.current_page} 页")
+        Args:
+            keyword: 搜索关键词
+            city: 城市名称
+            pages: 要爬取的页码
+
+        Returns:
+            bool: 是否正常爬完所有页，有页面未打开时返回 False
+        """
+        task_key = f"{keyword}|{city}"
+        for page in sorted(pages):
+            if self.is_done("page", f"{task_key}|{page}"):
+                self.logger.info(f"第 {page} 页已完成，跳过")
+                continue
+            self.current_page = page
+            self.logger.info(f"正在爬取第 {page} 页...")
+
+            try:
+                self.open_search_page(self.build_search_url(keyword, city, page))
+                count = self.crawl_job_list(keyword, city)
+                if self.autosave:
+                    self.mark_saved("page", f"{task_key}|{page}")
+                if not count or not self.has_next_page():
+                    self.logger.info("已到达最后一页")
                     return True
+            except TimeoutException:
+                self.logger.error("等待职位列表加载超时")
+                return False
+            except CaptchaError as e:
+                self.logger.error(str(e))
+                return False
+            except Exception as e:
+                self.logger.error(f"获取职位列表时出错: {str(e)}")
                 return False
+        return True
 
-        except Exception as e:
-            self.logger.error(f"点击下一页按钮时出错: {str(e)}")
-            return False
+    def build_api_url(self, path: str, **params: Any) -> str:
+        """构建 BOSS直聘 JSON 接口地址"""
+        return f"{self.site_url}{API_PATH}/{path}?{urlencode(params)}"
 
-    def get_job_details(self, job_card) -> str:
-        """获取职位详情页信息"""
-        main_window = self.driver.current_window_handle
-        try:
-            job_link = job_card.find_element(By.CLASS_NAME, "job-card-left")
-            self.driver.execute_script("arguments[0].click();", job_link)
-            self.random_delay()
+    @retryable("调用接口", allow_rotate=False)
+    def request_api(self, path: str, **params: Any) -> Dict[str, Any]:
+        """在已打开的搜索页中调用 JSON 接口，返回 zpData
 
-            for window_handle in self.driver.window_handles:
-                if window_handle != main_window:
-                    self.driver.switch_to.window(window_handle)
-                    break
+        接口依赖当前页面的 Cookie，重试时不重启浏览器。
 
-            WebDriverWait(self.driver, self.config["SPIDER_CONFIG"]["timeout"]).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "job-sec-text"))
+        Raises:
+            CaptchaError: 接口判定访问行为异常
+            RuntimeError: 接口返回其他错误码
+        """
+        response = self._fetch_json_once(self.build_api_url(path, **params))
+        code = response.get("code")
+        if code in API_CAPTCHA_CODES:
+            raise CaptchaError(f"接口 {path} 返回错误: {code} {response.get('message', '')}")
+        if code != 0:
+            raise RuntimeError(
+                f"接口 {path} 返回错误: {response.get('code')} {response.get('message', '')}"
             )
+        return response.get("zpData") or {}
+
+    def parse_api_job(
+        self, job: Dict[str, Any], keyword: str, city: str
+    ) -> Dict[str, Any]:
+        """把接口返回的职位数据转换为与页面解析一致的字段"""
+
+        def join(values, separator):
+            return separator.join(str(value) for value in values if value) or "N/A"
+
+        encrypt_job_id = job.get("encryptJobId", "")
+        return {
+            "职位": job.get("jobName") or "N/A",
+            "薪资": job.get("salaryDesc") or "N/A",
+            "公司": job.get("brandName") or "N/A",
+            "地点": join(
+                [job.get("cityName"), job.get("areaDistrict"), job.get("businessDistrict")],
+                "·",
+            ),
+            "要求": join(job.get("jobLabels") or [], "\n"),
+            "公司类型": join(
+                [job.get("brandIndustry"), job.get("brandStageName"), job.get("brandScaleName")],
+                "\n",
+            ),
+            "页码": self.current_page,
+            "搜索关键词": keyword,
+            "城市": city,
+            "链接": (
+                f"{self.site_url}{JOB_DETAIL_PATH}/{encrypt_job_id}.html"
+                if encrypt_job_id
+                else ""
+            ),
+        }
+
+    def get_job_details_api(self, job: Dict[str, Any]) -> str:
+        """通过详情接口获取职位描述"""
+        try:
+            with self.metrics.timer("detail"):
+                data = self.request_api(
+                    "job/detail.json",
+                    securityId=job.get("securityId", ""),
+                    lid=job.get("lid", ""),
+                )
+            return (data.get("jobInfo") or {}).get("postDescription") or "N/A"
+        except Exception as e:
+            self.logger.error(f"获取职位详情时出错: {str(e)}")
+            return "获取详情失败"
 
+    def crawl_pages_api(self, keyword: str, city: str, pages: List[int]) -> bool:
+        """通过搜索和详情 JSON 接口爬取，每个关键词只加载一次页面
+
+        接口请求在浏览器页面中发出，使用浏览器已获得的 Cookie 和令牌。
+
+        Args:
+            keyword: 搜索关键词
+            city: 城市名称
+            pages: 要爬取的页码
+
+        Returns:
+            bool: 是否正常爬完所有页
+        """
+        task_key = f"{keyword}|{city}"
+        city_id = get_city_id(city)
+        for page in pages:
+            self.current_page = page
+            page_key = f"{task_key}|{page}"
+            if self.is_done("page", page_key):
+                self.logger.info(f"第 {page} 页已完成，跳过")
+                continue
+
+            self.logger.info(f"正在通过接口爬取第 {self.current_page} 页...")
             try:
-                job_description = self.driver.find_element(
-                    By.CLASS_NAME, "job-sec-text"
-                ).text
+                data = self.request_api(
+                    "search/joblist.json",
+                    scene=1,
+                    query=keyword,
+                    city=city_id,
+                    page=self.current_page,
+                    pageSize=API_PAGE_SIZE,
+                )
             except Exception as e:
-                self.logger.error(f"获取详细要求时出错: {str(e)}")
-                job_description = "获取详细要求出错"
+                self.logger.error(f"获取职位列表接口时出错: {str(e)}")
+                return False
 
-            self.driver.close()
-            self.driver.switch_to.window(main_window)
-            return job_description
+            job_list = data.get("jobList") or []
+            self.logger.info(f"找到 {len(job_list)} 个职位信息")
+            for job in job_list:
+                job_info = self.parse_api_job(job, keyword, city)
+                job_url = job_info["链接"]
+                if job_url and not self.frontier.mark_seen(job_url):
+                    self.logger.info(f"职位 {job_url} 重复出现，跳过")
+                    continue
+                if job_url and self.is_done("job", job_url):
+                    self.logger.info(f"职位 {job_url} 已爬取，跳过")
+                    continue
 
-        except Exception as e:
-            self.logger.error(f"获取职位详情时出错: {str(e)}")
+                job_info["详细要求"] = (
+                    self.get_stored_details(job_info) or self.get_job_details_api(job)
+                )
+                self.save_job(job_info)
+                self.logger.info(f"成功解析职位: {job_info['职位']}")
+
+            if self.autosave:
+                self.mark_saved("page", page_key)
+            if not data.get("hasMore") or not job_list:
+                self.logger.info("已到达最后一页")
+                return True
+        return True
+
+    def crawl_job_list(self, keyword: str, city: str) -> int:
+        """解析当前页的所有职位卡片，页面需已由 open_search_page 加载完成
+
+        Returns:
+            int: 当前页的职位卡片数
+        """
+        job_list = self.driver.find_elements(By.CLASS_NAME, "job-card-wrapper")
+
+        # 一次脚本调用提取所有卡片的字段，顺序与 job_list 一致
+        cards = self.extract_fields(".job-card-wrapper", self.job_card_schema)
+        self.logger.info(f"找到 {len(job_list)} 个职位信息")
+
+        for job, card in zip(job_list, cards):
             try:
-                self.driver.switch_to.window(main_window)
-            except:
-                pass
-            return "获取详情失败"
+                job_url = card["链接"]
+                # 同一职位可能出现在多个关键词的搜索结果中
+                if job_url and not self.frontier.mark_seen(job_url):
+                    self.logger.info(f"职位 {job_url} 重复出现，跳过")
+                    continue
+                if job_url and self.is_done("job", job_url):
+                    self.logger.info(f"职位 {job_url} 已爬取，跳过")
+                    continue
+
+                job_info = {
+                    **card,
+                    "页码": self.current_page,
+                    "搜索关键词": keyword,
+                    "城市": city,
+                }
+
+                # 职位库中未变化的职位沿用已保存的详情，不再打开详情页
+                details = self.get_stored_details(job_info)
+                if details is None:
+                    self.logger.info(f"正在获取 {job_info['职位']} 的详细要求...")
+                    details = self.get_job_details(job)
+                job_info["详细要求"] = details
+
+                self.save_job(job_info)
+                self.logger.info(f"成功解析职位: {job_info['职位']}")
+
+            except Exception as e:
+                self.logger.error(f"解析单个职位信息时出错: {str(e)}")
+                continue
+        return len(job_list)
+
+    def run_parallel(self) -> None:
+        """多进程并行爬取，每个任务在独立进程中使用独立浏览器和代理
+
+        默认每个 (关键词, 城市) 一个任务；PARALLEL_CONFIG["split_pages"] 为 True 时
+        进一步按页拆分，同一关键词的多页可以同时爬取。
+        """
+        split_pages = self.config["PARALLEL_CONFIG"].get("split_pages", False)
+        tasks = []
+        for keyword, city in self.get_tasks():
+            task_key = f"{keyword}|{city}"
+            if self.is_done("keyword", task_key):
+                continue
+            if not split_pages:
+                tasks.append((keyword, city, None))
+                continue
+            tasks.extend(
+                (keyword, city, [page])
+                for page in self.get_pages()
+                if not self.is_done("page", f"{task_key}|{page}")
+            )
+        if not tasks:
+            self.logger.info("所有任务均已完成")
+            return
+        workers = min(self.config["PARALLEL_CONFIG"]["workers"], len(tasks))
+        self.logger.info(f"使用 {workers} 个进程并行爬取 {len(tasks)} 个任务")
+
+        # 每个进程持有独立的限速器，把总请求速率平均分给各进程
+        worker_config = scale_rate_limit(self.config, 1 / workers)
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(worker_config,)
+        ) as executor:
+            futures = {
+                executor.submit(
+                    crawl_task, type(self), worker_config, keyword, city, pages
+                ): (keyword, city, pages)
+                for keyword, city, pages in tasks
+            }
+            # 每个 (关键词, 城市) 未完成的任务数，全部完成后才记录关键词完成
+            pending = {}
+            for keyword, city, _ in tasks:
+                pending[(keyword, city)] = pending.get((keyword, city), 0) + 1
+
+            for future in as_completed(futures):
+                keyword, city, pages = futures[future]
+                name = f"{keyword}（{city}）" + (f"第 {pages[0]} 页" if pages else "")
+                try:
+                    records, finished, metrics = future.result()
+                except Exception as e:
+                    self.logger.error(f"任务 {name} 执行失败: {str(e)}")
+                    continue
+                self.metrics.merge(metrics)
+                for record in records:
+                    # 不同进程之间无法共享去重集合，合并时再去重一次
+                    if record.get("链接") and not self.frontier.mark_seen(record["链接"]):
+                        continue
+                    self.save_job(record)
+                if not finished:
+                    self.logger.warning(f"任务 {name} 未完成，获得 {len(records)} 条数据")
+                    continue
+                if pages:
+                    for page in pages:
+                        self.mark_saved("page", f"{keyword}|{city}|{page}")
+                pending[(keyword, city)] -= 1
+                if not pending[(keyword, city)]:
+                    self.mark_saved("keyword", f"{keyword}|{city}")
+                self.logger.info(f"任务 {name} 完成，获得 {len(records)} 条数据")
 
     def run(self) -> None:
         """运行爬虫"""
         try:
             self.logger.info("开始爬取数据")
 
-            for keyword in self.config["SEARCH_CONFIG"]["keywords"]:
-                self.logger.info(f"开始爬取关键词：{keyword}")
-                self.current_page = 1
-
-                self.base_url = self.build_search_url(keyword)
-                self.driver.get(self.base_url)
-                if not self.wait_for_page_load():
-                    continue
-
-                while self.current_page <= self.max_pages:
-                    self.logger.info(f"正在爬取第 {self.current_page} 页...")
-                    self.random_delay()
-
-                    try:
-                        job_list = WebDriverWait(
-                            self.driver, self.config["SPIDER_CONFIG"]["timeout"]
-                        ).until(
-                            EC.presence_of_all_elements_located(
-                                (By.CLASS_NAME, "job-card-wrapper")
-                            )
-                        )
-
-                        self.logger.info(f"找到 {len(job_list)} 个职位信息")
-
-                        for job in job_list:
-                            try:
-                                self.random_delay()
-
-                                job_info = {
-                                    "职位": self.get_element_text_safely(
-                                        job, "job-name"
-                                    ),
-                                    "薪资": self.get_element_text_safely(job, "salary"),
-                                    "公司": self.get_element_text_safely(
-                                        job, "company-name"
-                                    ),
-                                    "地点": self.get_element_text_safely(
-                                        job, "job-area"
-                                    ),
-                                    "要求": self.get_element_text_safely(
-                                        job, "job-info-tags"
-                                    ),
-                                    "公司类型": self.get_element_text_safely(
-                                        job, "company-tag-list"
-                                    ),
-                                    "页码": self.current_page,
-                                    "搜索关键词": keyword,
-                                }
-
-                                self.logger.info(
-                                    f"正在获取 {job_info['职位']} 的详细要求..."
-                                )
-                                job_info["详细要求"] = self.get_job_details(job)
-
-                                self.data.append(job_info)
-                                self.logger.info(f"成功解析职位: {job_info['职位']}")
-
-                                if len(self.data) % 10 == 0:
-                                    self.save_data()
-
-                            except Exception as e:
-                                self.logger.error(f"解析单个职位信息时出错: {str(e)}")
-                                continue
-
-                        if not self.click_next_page():
-                            self.logger.info("已到达最后一页或无法继续翻页")
-                            break
-
-                    except TimeoutException:
-                        self.logger.error("等待职位列表加载超时")
-                        break
-                    except Exception as e:
-                        self.logger.error(f"获取职位列表时出错: {str(e)}")
-                        break
+            if self.config.get("PARALLEL_CONFIG", {}).get("enabled"):
+                self.run_parallel()
+            else:
+                for keyword, city in self.get_tasks():
+                    self.crawl_keyword(keyword, city)
 
             self.save_data()
+            if self.job_store is not None:
+                counters = self.metrics.counters
+                self.logger.info(
+                    f"新职位 {int(counters.get('jobs_new', 0))} 个，"
+                    f"变化 {int(counters.get('jobs_changed', 0))} 个，"
+                    f"未变化 {int(counters.get('jobs_unchanged', 0))} 个"
+                    f"（跳过详情 {int(counters.get('details_skipped', 0))} 个）"
+                )
             self.logger.info("数据爬取完成")
 
         except Exception as e:
             self.logger.error(f"爬虫运行出错: {str(e)}")
             raise
         finally:
+            self.write_metrics()
             self.cleanup()
+
+    def cleanup(self) -> None:
+        """清理资源，写入职位库中缓冲的记录"""
+        if self._job_store is not None:
+            self._job_store.close()
+            self._job_store = None
+        super().cleanup()
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """工作进程初始化：启用浏览器池时在进程内复用一个浏览器"""
+    global _worker_browser_pool
+    if config["BROWSER_CONFIG"].get("pool", {}).get("enabled"):
+        _worker_browser_pool = BrowserPool.from_config(config)
+        _worker_browser_pool.size = 1
+        atexit.register(_worker_browser_pool.close)
+
+
+def crawl_task(
+    spider_class: type,
+    config: Dict[str, Any],
+    keyword: str,
+    city: str,
+    pages: List[int] = None,
+) -> Tuple[List[Dict[str, Any]], bool, Metrics]:
+    """在工作进程中爬取单个 (关键词, 城市) 任务并返回数据
+
+    Args:
+        spider_class: 爬虫类
+        config: 配置字典
+        keyword: 搜索关键词
+        city: 城市名称
+        pages: 要爬取的页码，默认为所有页
+
+    Returns:
+        Tuple[List[Dict[str, Any]], bool, Metrics]: (爬取到的职位数据, 是否正常爬完, 运行指标)
+    """
+    # 进度由主进程清理和记录，工作进程只读取
+    spider = spider_class(config, browser_pool=_worker_browser_pool, resume=True)
+    # 数据由主进程统一保存，避免多个进程同时写同一个文件
+    spider.autosave = False
+    try:
+        finished = spider.crawl_keyword(keyword, city, pages)
+    finally:
+        spider.cleanup()
+    # 指标在清理后返回，包含写入等收尾阶段的耗时
+    return spider.data, finished, spider.metrics
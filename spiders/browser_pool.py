@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:  # psutil 为可选依赖，缺失时不按内存回收浏览器
+    psutil = None
+
+
+class BrowserPool:
+    """WebDriver 浏览器池
+
+    预先启动固定数量的浏览器并租借给爬虫使用，归还时清理 Cookie 和多余窗口，
+    浏览器加载页数或内存占用超过阈值后自动回收重建，避免每个任务都重新启动 Chrome。
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_pages: int = 0,
+        max_rss_mb: int = 0,
+        logger: logging.Logger = None,
+    ):
+        """初始化浏览器池
+
+        Args:
+            size: 浏览器数量上限
+            max_pages: 单个浏览器最多加载的页数，超过后回收，0 表示不限制
+            max_rss_mb: 单个浏览器（含子进程）最大内存占用，超过后回收，0 表示不限制
+            logger: 日志记录器
+        """
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+        self._idle: List = []
+        self._pages: Dict[int, int] = {}
+        self._created = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        if self.max_rss_mb and psutil is None:
+            self.logger.warning("未安装 psutil，无法按内存占用回收浏览器")
+
+    @classmethod
+    def from_config(cls, config: Dict, logger: logging.Logger = None) -> "BrowserPool":
+        """根据 BROWSER_CONFIG["pool"] 创建浏览器池"""
+        pool_config = config["BROWSER_CONFIG"].get("pool", {})
+        return cls(
+            size=pool_config.get("size", 1),
+            max_pages=pool_config.get("max_pages", 0),
+            max_rss_mb=pool_config.get("max_rss_mb", 0),
+            logger=logger,
+        )
+
+    def prewarm(self, factory: Callable) -> None:
+        """并行启动浏览器直到达到池容量
+
+        Args:
+            factory: 创建 WebDriver 的无参函数
+        """
+        with self._condition:
+            missing = self.size - self._created
+            self._created += missing
+        if missing <= 0:
+            return
+
+        self.logger.info(f"预启动 {missing} 个浏览器")
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            futures = [executor.submit(factory) for _ in range(missing)]
+
+        with self._condition:
+            for future in futures:
+                try:
+                    driver = future.result()
+                except Exception as e:
+                    self.logger.error(f"预启动浏览器失败: {str(e)}")
+                    self._created -= 1
+                    continue
+                self._pages[id(driver)] = 0
+                self._idle.append(driver)
+            self._condition.notify_all()
+
+    def acquire(self, factory: Callable, timeout: Optional[float] = None):
+        """租借一个浏览器，池中无空闲且已满时阻塞等待
+
+        Args:
+            factory: 池未满时用于创建 WebDriver 的无参函数
+            timeout: 最长等待时间（秒），None 表示一直等待
+
+        Returns:
+            WebDriver: 浏览器实例
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("浏览器池已关闭")
+            if not self._condition.wait_for(
+                lambda: self._idle or self._created < self.size, timeout
+            ):
+                raise TimeoutError("等待空闲浏览器超时")
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+
+        try:
+            driver = factory()
+        except Exception:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._pages[id(driver)] = 0
+        return driver
+
+    def release(self, driver, pages: int = 0) -> None:
+        """归还浏览器
+
+        Args:
+            driver: 租借的浏览器实例
+            pages: 本次租借期间加载的页数
+        """
+        with self._condition:
+            self._pages[id(driver)] = self._pages.get(id(driver), 0) + pages
+            total_pages = self._pages[id(driver)]
+
+        reason = self._recycle_reason(driver, total_pages)
+        if reason is None and not self._reset(driver):
+            reason = "重置状态失败"
+
+        if reason is not None or self._closed:
+            if reason:
+                self.logger.info(f"回收浏览器：{reason}")
+            self._discard(driver)
+            return
+
+        with self._condition:
+            self._idle.append(driver)
+            self._condition.notify()
+
+    def discard(self, driver) -> None:
+        """退出租借的浏览器而不归还（如代理被封或浏览器已失效），释放名额"""
+        self.logger.info("丢弃浏览器")
+        self._discard(driver)
+
+    def _recycle_reason(self, driver, total_pages: int) -> Optional[str]:
+        """判断浏览器是否需要回收，返回回收原因"""
+        if self.max_pages and total_pages >= self.max_pages:
+            return f"已加载 {total_pages} 页"
+        if self.max_rss_mb:
+            rss_mb = self.get_rss_mb(driver)
+            if rss_mb is not None and rss_mb >= self.max_rss_mb:
+                return f"内存占用 {rss_mb:.0f}MB"
+        return None
+
+    @staticmethod
+    def get_rss_mb(driver) -> Optional[float]:
+        """统计 chromedriver 及其所有子进程的内存占用（MB），无法统计时返回 None"""
+        if psutil is None:
+            return None
+        try:
+            process = psutil.Process(driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            total = 0
+            for item in processes:
+                try:
+                    total += item.memory_info().rss
+                except psutil.Error:
+                    continue
+            return total / 1024 / 1024
+        except Exception:
+            return None
+
+    def _reset(self, driver) -> bool:
+        """清理浏览器状态：关闭多余窗口、清空 Cookie、回到空白页"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            self.logger.warning(f"重置浏览器状态失败: {str(e)}")
+            return False
+
+    def _discard(self, driver) -> None:
+        """退出浏览器并释放名额"""
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.warning(f"退出浏览器时出错: {str(e)}")
+        with self._condition:
+            self._pages.pop(id(driver), None)
+            self._created -= 1
+            self._condition.notify()
+
+    def close(self) -> None:
+        """退出池中所有空闲浏览器，之后归还的浏览器也会直接退出"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
+        self.logger.info("浏览器池已关闭")
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # zstandard 为可选依赖，缺失时使用 zlib 压缩
+    zstandard = None
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return zlib.compress(data, 6)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class ChapterStore:
+    """按书保存章节正文的压缩存储
+
+    每本书一个只追加的数据文件，章节按到达顺序攒成约 chunk_bytes 大小的分块后整块压缩写入；
+    SQLite 索引记录每个章节所在分块的偏移、长度、在分块内的位置以及正文哈希，可以按章节序号随机读取。
+    重复保存标题和正文都未变化的章节时直接跳过，数据文件只在章节内容变化时增长。
+    内存中最多保留每本书一个未写入的分块，导出时逐块解压，内存占用与书的大小无关。
+    """
+
+    def __init__(self, directory: str, chunk_bytes: int = 256 * 1024, compression: str = "zlib"):
+        """初始化章节存储
+
+        Args:
+            directory: 存储目录，包含索引 index.db 和每本书的数据文件
+            chunk_bytes: 每个分块压缩前的大小
+            compression: 压缩算法，zlib 或 zstd（需要安装 zstandard）
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_bytes = chunk_bytes
+        self.codec = compression if compression == "zstd" and zstandard is not None else "zlib"
+        self._pending: Dict[str, List[Tuple[int, str, str, bytes, str]]] = {}
+        self._pending_bytes: Dict[str, int] = {}
+        self._chunk_cache: Tuple[Optional[tuple], bytes] = (None, b"")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "index.db"), timeout=30, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS chapters (
+                book_url TEXT NOT NULL,
+                chapter_index INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                url TEXT NOT NULL,
+                codec TEXT NOT NULL,
+                chunk_offset INTEGER NOT NULL,
+                chunk_size INTEGER NOT NULL,
+                start INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                saved_at REAL NOT NULL,
+                digest TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (book_url, chapter_index)
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(chapters)")}
+        if "digest" not in columns:
+            # 旧版本创建的索引没有正文哈希，这些章节下次保存时照常写入
+            self._conn.execute("ALTER TABLE chapters ADD COLUMN digest TEXT NOT NULL DEFAULT ''")
+        self._conn.commit()
+
+    def data_file(self, book_url: str) -> str:
+        """书籍数据文件路径，按目录页地址的哈希命名"""
+        key = hashlib.sha1(book_url.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{key}.dat")
+
+    def write(self, book_url: str, index: int, title: str, content: str, url: str = "") -> bool:
+        """保存一个章节，同一章节重复保存时以最后一次为准
+
+        Returns:
+            bool: 是否写入，标题和正文与已保存的相同时返回 False
+        """
+        data = content.encode("utf-8")
+        digest = hashlib.sha1(data).hexdigest()
+        with self._lock:
+            pending = [
+                chapter for chapter in self._pending.get(book_url, []) if chapter[0] == index
+            ]
+            if pending:
+                saved = pending[-1][1], pending[-1][4]
+            else:
+                saved = self._conn.execute(
+                    "SELECT title, digest FROM chapters WHERE book_url = ? AND chapter_index = ?",
+                    (book_url, index),
+                ).fetchone()
+            if saved is not None and tuple(saved) == (title, digest):
+                return False
+            self._pending.setdefault(book_url, []).append((index, title, url, data, digest))
+            self._pending_bytes[book_url] = self._pending_bytes.get(book_url, 0) + len(data)
+            if self._pending_bytes[book_url] >= self.chunk_bytes:
+                self._flush(book_url)
+        return True
+
+    def _flush(self, book_url: str) -> None:
+        chapters = self._pending.pop(book_url, None)
+        self._pending_bytes.pop(book_url, None)
+        if not chapters:
+            return
+        rows = []
+        position = 0
+        now = time.time()
+        for index, title, url, data, digest in chapters:
+            # 分块偏移和大小在写入数据文件后填入
+            rows.append(
+                [book_url, index, title, url, self.codec, 0, 0, position, len(data), now, digest]
+            )
+            position += len(data)
+        chunk = compress(b"".join(chapter[3] for chapter in chapters), self.codec)
+        with open(self.data_file(book_url), "ab") as f:
+            offset = f.tell()
+            f.write(chunk)
+        for row in rows:
+            row[5], row[6] = offset, len(chunk)
+        with self._conn:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO chapters
+                    (book_url, chapter_index, title, url, codec, chunk_offset, chunk_size,
+                     start, length, saved_at, digest)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+
+    def flush(self) -> None:
+        """把所有书缓冲的章节写入磁盘"""
+        with self._lock:
+            for book_url in list(self._pending):
+                self._flush(book_url)
+
+    def _read_chunk(self, book_url: str, codec: str, offset: int, size: int) -> bytes:
+        # 顺序读取时相邻章节在同一分块中，缓存最近解压的分块
+        key = (book_url, offset)
+        if self._chunk_cache[0] != key:
+            with open(self.data_file(book_url), "rb") as f:
+                f.seek(offset)
+                self._chunk_cache = (key, decompress(f.read(size), codec))
+        return self._chunk_cache[1]
+
+    def read(self, book_url: str, index: int) -> Optional[Tuple[str, str]]:
+        """按章节序号读取 (标题, 正文)，不存在时返回 None"""
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT title, codec, chunk_offset, chunk_size, start, length FROM chapters
+                WHERE book_url = ? AND chapter_index = ?
+                """,
+                (book_url, index),
+            ).fetchone()
+            if row is None:
+                return None
+            title, codec, offset, size, start, length = row
+            chunk = self._read_chunk(book_url, codec, offset, size)
+        return title, chunk[start:start + length].decode("utf-8")
+
+    def chapter_indexes(self, book_url: str) -> List[int]:
+        """已保存的章节序号，按顺序排列"""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chapter_index FROM chapters WHERE book_url = ? ORDER BY chapter_index",
+                (book_url,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def iter_chapters(self, book_url: str) -> Iterator[Tuple[int, str, str]]:
+        """按章节顺序逐章读取 (序号, 标题, 正文)"""
+        for index in self.chapter_indexes(book_url):
+            chapter = self.read(book_url, index)
+            if chapter is not None:
+                yield (index, *chapter)
+
+    def export_txt(self, book_url: str, path: str) -> int:
+        """把一本书按章节顺序流式导出为 txt 文件
+
+        Returns:
+            int: 导出的章节数
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        count = 0
+        with open(path, "w", encoding="utf-8") as f:
+            for _, title, content in self.iter_chapters(book_url):
+                f.write(f"{title}\n\n{content}\n\n")
+                count += 1
+        return count
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Set
+
+
+class CheckpointStore:
+    """基于 SQLite 的爬取进度存储
+
+    以 (scope, key) 记录已完成的工作，如关键词、页码、职位链接、章节链接，
+    进程崩溃后可以通过 --resume 跳过已完成的部分。
+    """
+
+    def __init__(self, path: str):
+        """初始化进度存储
+
+        Args:
+            path: SQLite 数据库文件路径
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self._lock = threading.Lock()
+        # 多个工作进程可能同时写入，使用 WAL 模式并设置较长的锁等待时间
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                scope TEXT NOT NULL,
+                key TEXT NOT NULL,
+                done_at REAL NOT NULL,
+                PRIMARY KEY (scope, key)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def is_done(self, scope: str, key: str) -> bool:
+        """判断某项工作是否已完成"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM checkpoints WHERE scope = ? AND key = ?", (scope, key)
+            ).fetchone()
+        return row is not None
+
+    def mark_done(self, scope: str, key: str) -> None:
+        """记录某项工作已完成"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (scope, key, done_at) VALUES (?, ?, ?)",
+                (scope, key, time.time()),
+            )
+            self._conn.commit()
+
+    def done_keys(self, scope: str) -> Set[str]:
+        """获取某个范围内所有已完成的 key"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM checkpoints WHERE scope = ?", (scope,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def clear(self, prefix: str = "") -> None:
+        """清除 scope 以 prefix 开头的所有进度，prefix 为空时清除全部"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM checkpoints WHERE substr(scope, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
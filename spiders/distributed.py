@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""分布式爬取：协调节点把 关键词 × 城市 × 页码 任务放入共享队列并保存结果，
+工作节点从队列中租借任务爬取，结果写回队列。
+
+    python main.py --role coordinator
+    python main.py --role worker   # 在每台机器上启动任意多个
+"""
+
+import os
+import socket
+import time
+from typing import Any, Dict, List, Tuple
+
+from .frontier import URLFrontier
+from .rate_limiter import SharedRateLimiter
+from .work_queue import WorkQueue
+
+
+def build_tasks(spider) -> List[Tuple[str, Dict[str, Any]]]:
+    """按 关键词 × 城市 × 页码 拆分任务，每页一个任务"""
+    return [
+        (f"{keyword}|{city}|{page}", {"keyword": keyword, "city": city, "page": page})
+        for keyword, city in spider.get_tasks()
+        for page in spider.get_pages()
+    ]
+
+
+def drain_results(spider, queue: WorkQueue, batch: int) -> int:
+    """取出工作节点写回的结果并保存，返回保存的条数"""
+    count = 0
+    while True:
+        records = queue.pop_results(batch)
+        if not records:
+            return count
+        for record in records:
+            # 租约过期后同一页可能被两个节点爬取，保存前再去重一次
+            if record.get("链接") and not spider.frontier.mark_seen(record["链接"]):
+                continue
+            spider.save_job(record)
+            count += 1
+
+
+def reset_task_state(spider) -> None:
+    """清空上一个任务留下的数据和去重记录
+
+    失败的任务可能已把部分职位标记为已见，不清空时重新租借后这些职位会被跳过；
+    节点之间的重复由协调节点保存前统一去重。
+    """
+    spider.data = []
+    spider.frontier = URLFrontier.from_config(spider.config)
+
+
+def run_coordinator(spider, queue: WorkQueue, resume: bool = False) -> None:
+    """放入任务并持续保存结果，直到所有任务完成或被放弃
+
+    Args:
+        spider: 用于拆分任务和保存结果的爬虫，不会启动浏览器
+        queue: 共享任务队列
+        resume: 是否保留队列中上次运行的任务状态，只放入尚不存在的任务
+    """
+    distributed_config = spider.config["DISTRIBUTED_CONFIG"]
+    poll_interval = distributed_config.get("poll_interval", 2)
+    batch = distributed_config.get("result_batch", 100)
+    max_attempts = distributed_config.get("max_attempts", 3)
+    try:
+        if not resume:
+            queue.clear()
+        added = queue.put_tasks(build_tasks(spider))
+        spider.logger.info(f"放入 {added} 个任务，等待工作节点处理")
+
+        last_counts = None
+        while True:
+            saved = drain_results(spider, queue, batch)
+            # 持有最后一次租约的节点崩溃后可能不再有节点租借该任务，由协调节点放弃
+            queue.reap(max_attempts)
+            counts = queue.counts()
+            if counts != last_counts:
+                spider.logger.info(
+                    f"任务进度：等待 {counts['pending']}，进行中 {counts['leased']}，"
+                    f"完成 {counts['done']}，放弃 {counts['dead']}"
+                )
+                last_counts = counts
+            if not counts["pending"] and not counts["leased"]:
+                drain_results(spider, queue, batch)
+                break
+            if not saved:
+                time.sleep(poll_interval)
+
+        if counts["dead"]:
+            spider.logger.warning(f"{counts['dead']} 个任务多次失败后被放弃")
+        spider.save_data()
+        spider.logger.info("分布式爬取完成")
+    finally:
+        spider.write_metrics()
+        spider.cleanup()
+        queue.close()
+
+
+def run_worker(spider, queue: WorkQueue) -> None:
+    """租借并执行任务，空闲超过 DISTRIBUTED_CONFIG["idle_timeout"] 秒后退出
+
+    请求速率由所有节点共享的限速器控制，结果连同任务确认一起写回队列。
+
+    Args:
+        spider: 执行任务的爬虫
+        queue: 共享任务队列
+    """
+    distributed_config = spider.config["DISTRIBUTED_CONFIG"]
+    visibility_timeout = distributed_config.get("visibility_timeout", 600)
+    max_attempts = distributed_config.get("max_attempts", 3)
+    poll_interval = distributed_config.get("poll_interval", 2)
+    idle_timeout = distributed_config.get("idle_timeout", 60)
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+
+    # 数据由协调节点统一保存
+    spider.autosave = False
+    spider.rate_limiter = SharedRateLimiter.from_config(spider.config, queue)
+    idle_since = time.monotonic()
+    try:
+        while True:
+            lease = queue.lease(visibility_timeout, max_attempts)
+            if lease is None:
+                if time.monotonic() - idle_since >= idle_timeout:
+                    spider.logger.info(f"工作节点 {worker_id} 空闲超过 {idle_timeout} 秒，退出")
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            task = lease.payload
+            spider.logger.info(f"工作节点 {worker_id} 开始任务 {lease.task_id}（第 {lease.attempts} 次）")
+            reset_task_state(spider)
+            try:
+                finished = spider.crawl_keyword(task["keyword"], task["city"], [task["page"]])
+                error = "" if finished else "任务未正常爬完"
+            except Exception as e:
+                finished, error = False, str(e)
+            records, spider.data = spider.data, []
+
+            if finished:
+                if queue.ack(lease, records):
+                    spider.metrics.inc("tasks_done")
+                    spider.logger.info(f"任务 {lease.task_id} 完成，获得 {len(records)} 条数据")
+                else:
+                    spider.logger.warning(f"任务 {lease.task_id} 已被其他节点重新租借，结果被丢弃")
+            else:
+                spider.metrics.inc("tasks_failed")
+                retried = queue.fail(lease, error, max_attempts)
+                spider.logger.error(
+                    f"任务 {lease.task_id} 失败: {error}，" + ("已放回队列" if retried else "不再重试")
+                )
+            idle_since = time.monotonic()
+    finally:
+        spider.write_metrics()
+        spider.cleanup()
+        queue.close()
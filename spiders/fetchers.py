@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import time
+from typing import Any, Dict, Type
+import requests
+from requests.adapters import HTTPAdapter
+from selenium.common.exceptions import TimeoutException
+from .proxy_pool import normalize_proxy
+from .retry import ProxyFailedError
+
+
+class BaseFetcher:
+    """页面抓取器基类，所有抓取后端都通过 fetch(url) 返回页面 HTML"""
+
+    # 是否支持响应缓存（条件请求）
+    cacheable = False
+
+    def __init__(self, spider):
+        """初始化抓取器
+
+        Args:
+            spider: 使用该抓取器的爬虫实例
+        """
+        self.spider = spider
+        self.config = spider.config
+        self.logger = spider.logger
+
+    def fetch(self, url: str) -> str:
+        """抓取页面（需要在子类中实现）
+
+        Args:
+            url: 页面地址
+
+        Returns:
+            str: 页面 HTML
+        """
+        raise NotImplementedError("子类必须实现fetch方法")
+
+    def fetch_json(self, url: str) -> Any:
+        """抓取 JSON 接口
+
+        Args:
+            url: 接口地址
+
+        Returns:
+            Any: 解析后的 JSON 数据
+        """
+        return json.loads(self.fetch(url))
+
+    def rotate_proxy(self, banned: bool = False) -> None:
+        """放弃当前代理，下次请求改用代理池中的其他代理
+
+        Args:
+            banned: 当前代理是否已被目标网站封禁
+        """
+
+    def close(self) -> None:
+        """释放抓取器占用的资源"""
+
+
+class HttpFetcher(BaseFetcher):
+    """基于 requests.Session 的 HTTP 抓取器，复用 keep-alive 连接，不启动浏览器"""
+
+    cacheable = True
+
+    def __init__(self, spider):
+        super().__init__(spider)
+        fetcher_config = self.config.get("FETCHER_CONFIG", {})
+        self.timeout = fetcher_config.get(
+            "http_timeout", self.config["SPIDER_CONFIG"]["timeout"]
+        )
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=fetcher_config.get("pool_connections", 10),
+            pool_maxsize=fetcher_config.get("pool_maxsize", 10),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        user_agent = spider.get_user_agent()
+        self.session.headers.update(
+            {
+                "User-Agent": user_agent,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+            }
+        )
+        self.logger.info(f"使用 User-Agent: {user_agent}")
+
+        proxy_config = self.config["PROXY_CONFIG"]
+        self.proxy_enabled = proxy_config["enabled"]
+        # driver：整个会话使用同一个代理；request：每次请求从代理池重新选择
+        self.rotate_per_request = proxy_config.get("rotate", "driver") == "request"
+        self.proxy = spider.get_proxy() if self.proxy_enabled else ""
+
+    def request(self, url: str, **kwargs) -> requests.Response:
+        """发送 GET 请求，并把结果反馈给代理池"""
+        proxy = self.proxy
+        if self.proxy_enabled and (self.rotate_per_request or not proxy):
+            proxy = self.spider.get_proxy()
+        self.proxy = proxy
+
+        if proxy:
+            proxy_url = normalize_proxy(
+                proxy, self.config["PROXY_CONFIG"].get("proxy_type", "http")
+            )
+            kwargs["proxies"] = {"http": proxy_url, "https": proxy_url}
+
+        start_time = time.monotonic()
+        try:
+            response = self.session.get(url, timeout=self.timeout, **kwargs)
+        except (requests.exceptions.ProxyError, requests.exceptions.ConnectTimeout) as e:
+            if not proxy:
+                raise
+            self.spider.proxy_pool.report_failure(proxy)
+            # 代理失效后下次请求重新选择
+            self.proxy = ""
+            # 通过代理连接超时也说明代理不可用，按代理错误重试
+            raise ProxyFailedError(f"代理 {proxy} 无法连接: {e}") from e
+        if proxy:
+            self.spider.proxy_pool.report_success(proxy, time.monotonic() - start_time)
+        return response
+
+    def fetch(self, url: str) -> str:
+        """抓取页面，启用响应缓存时带上 ETag/Last-Modified 发送条件请求，未变化时使用缓存"""
+        cache = self.spider.response_cache
+        cached = cache.get(url) if cache is not None else None
+        response = self.request(url, headers=cached.conditional_headers() if cached else None)
+        if cached is not None and response.status_code == 304:
+            cache.touch(url)
+            self.spider.metrics.inc("cache_revalidated")
+            return cached.text
+        response.raise_for_status()
+        # 服务端未声明编码时 requests 默认按 ISO-8859-1 解码，中文站点需要按内容推断
+        if response.encoding is None or response.encoding.lower() == "iso-8859-1":
+            response.encoding = response.apparent_encoding
+        if cache is not None:
+            cache.put(
+                url,
+                response.content,
+                encoding=response.encoding,
+                etag=response.headers.get("ETag", ""),
+                last_modified=response.headers.get("Last-Modified", ""),
+            )
+        return response.text
+
+    def fetch_json(self, url: str) -> Any:
+        response = self.request(
+            url, headers={"Accept": "application/json, text/plain, */*"}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def rotate_proxy(self, banned: bool = False) -> None:
+        if self.proxy and banned:
+            self.spider.proxy_pool.report_failure(self.proxy, banned=True)
+        self.proxy = ""
+
+    def close(self) -> None:
+        self.session.close()
+
+
+# 在页面上下文中请求接口的脚本，最后一个参数是 execute_async_script 提供的回调
+FETCH_JSON_SCRIPT = """
+const done = arguments[arguments.length - 1];
+fetch(arguments[0], {
+    credentials: "include",
+    headers: {"Accept": "application/json, text/plain, */*", "X-Requested-With": "XMLHttpRequest"},
+})
+    .then((response) => response.text())
+    .then(done)
+    .catch((error) => done(JSON.stringify({__fetch_error__: String(error)})));
+"""
+
+
+class SeleniumFetcher(BaseFetcher):
+    """基于 Selenium 的浏览器抓取器，用于需要执行 JavaScript 的页面
+
+    浏览器由爬虫在首次访问 driver 时启动。
+    """
+
+    @property
+    def driver(self):
+        return self.spider.driver
+
+    def fetch(self, url: str) -> str:
+        self.driver.get(url)
+        self.spider.pages_loaded += 1
+        if not self.spider.wait_for_page_load():
+            self.spider.report_proxy_failure(getattr(self.driver, "proxy", ""))
+            raise TimeoutException(f"页面 {url} 加载超时")
+        return self.driver.page_source
+
+    def fetch_json(self, url: str) -> Any:
+        """在当前页面中用 fetch 调用接口，自动带上浏览器的 Cookie 和登录态，不产生页面加载"""
+        self.driver.set_script_timeout(self.config["SPIDER_CONFIG"]["timeout"])
+        text = self.driver.execute_async_script(FETCH_JSON_SCRIPT, url)
+        data = json.loads(text)
+        if isinstance(data, dict) and "__fetch_error__" in data:
+            raise RuntimeError(f"请求 {url} 失败: {data['__fetch_error__']}")
+        return data
+
+    def rotate_proxy(self, banned: bool = False) -> None:
+        # 浏览器启动后无法更换代理，只能换一个新浏览器
+        self.spider.restart_browser(banned=banned)
+
+    def close(self) -> None:
+        # 浏览器由爬虫的 cleanup 负责退出
+        pass
+
+
+FETCHERS: Dict[str, Type[BaseFetcher]] = {
+    "http": HttpFetcher,
+    "selenium": SeleniumFetcher,
+}
+
+
+def create_fetcher(name: str, spider) -> BaseFetcher:
+    """根据名称创建抓取器
+
+    Args:
+        name: 抓取器名称，可选 http/selenium
+        spider: 使用该抓取器的爬虫实例
+
+    Returns:
+        BaseFetcher: 抓取器实例
+    """
+    if name not in FETCHERS:
+        raise ValueError(f"未知的抓取器类型: {name}")
+    return FETCHERS[name](spider)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import hashlib
+import heapq
+import itertools
+import math
+import threading
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urldefrag
+
+
+class BloomFilter:
+    """布隆过滤器，用少量内存判断海量 URL 是否出现过，存在一定误判率（不会漏判）"""
+
+    def __init__(self, capacity: int = 1000000, error_rate: float = 0.001):
+        """初始化布隆过滤器
+
+        Args:
+            capacity: 预计元素数量
+            error_rate: 元素数量达到 capacity 时的误判率
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # 双重哈希：由一次 blake2b 摘要派生出 hash_count 个位置
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> bool:
+        """添加元素
+
+        Returns:
+            bool: 元素此前是否（可能）已经存在
+        """
+        existed = True
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                existed = False
+                self.bits[byte] |= 1 << bit
+        if not existed:
+            self.count += 1
+        return existed
+
+    def __contains__(self, item: str) -> bool:
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class URLFrontier:
+    """爬取队列：优先级队列 + 去重集合，线程安全
+
+    爬虫把发现的 URL 推入队列，工作线程或协程按优先级取出，
+    同一个 URL（忽略 # 锚点）只会入队一次。
+    """
+
+    def __init__(
+        self,
+        use_bloom_filter: bool = False,
+        capacity: int = 1000000,
+        error_rate: float = 0.001,
+    ):
+        """初始化爬取队列
+
+        Args:
+            use_bloom_filter: 是否使用布隆过滤器去重，适合上百万 URL 的场景
+            capacity: 布隆过滤器预计容量
+            error_rate: 布隆过滤器误判率
+        """
+        self._seen = BloomFilter(capacity, error_rate) if use_bloom_filter else set()
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "URLFrontier":
+        """根据 FRONTIER_CONFIG 创建爬取队列"""
+        frontier_config = config.get("FRONTIER_CONFIG", {})
+        return cls(
+            use_bloom_filter=frontier_config.get("bloom_filter", False),
+            capacity=frontier_config.get("capacity", 1000000),
+            error_rate=frontier_config.get("error_rate", 0.001),
+        )
+
+    @staticmethod
+    def normalize(url: str) -> str:
+        """去掉 URL 中的锚点"""
+        return urldefrag(url)[0]
+
+    def mark_seen(self, url: str) -> bool:
+        """标记 URL 已出现（不入队）
+
+        Returns:
+            bool: URL 是首次出现时返回 True
+        """
+        url = self.normalize(url)
+        with self._condition:
+            if isinstance(self._seen, set):
+                if url in self._seen:
+                    return False
+                self._seen.add(url)
+                return True
+            return not self._seen.add(url)
+
+    def seen(self, url: str) -> bool:
+        """判断 URL 是否已出现过"""
+        with self._condition:
+            return self.normalize(url) in self._seen
+
+    def push(self, url: str, priority: int = 0, data: Any = None) -> bool:
+        """把 URL 推入队列，已出现过的 URL 会被忽略
+
+        Args:
+            url: 页面地址
+            priority: 优先级，数值越小越先取出，相同优先级按入队顺序
+            data: 随 URL 一起保存的附加数据
+
+        Returns:
+            bool: 是否成功入队
+        """
+        if not self.mark_seen(url):
+            return False
+        with self._condition:
+            heapq.heappush(self._heap, (priority, next(self._counter), url, data))
+            self._condition.notify()
+        return True
+
+    def pop(self, timeout: Optional[float] = 0) -> Optional[Tuple[str, Any]]:
+        """取出优先级最高的 URL
+
+        Args:
+            timeout: 队列为空时的最长等待时间（秒），0 表示不等待，None 表示一直等待
+
+        Returns:
+            Optional[Tuple[str, Any]]: (URL, 附加数据)，队列为空时返回 None
+        """
+        with self._condition:
+            if timeout != 0 and not self._heap:
+                self._condition.wait_for(lambda: self._heap, timeout)
+            if not self._heap:
+                return None
+            _, _, url, data = heapq.heappop(self._heap)
+            return url, data
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._heap)
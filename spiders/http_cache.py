@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    """缓存的响应"""
+
+    url: str
+    content: bytes
+    encoding: str
+    etag: str
+    last_modified: str
+    fetched_at: float
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """重新验证缓存时使用的条件请求头"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """磁盘上的 HTTP 响应缓存
+
+    响应正文按内容的 SHA-256 保存在 objects 目录下，内容相同的页面只保存一份；
+    URL、ETag、Last-Modified 和抓取时间保存在 SQLite 索引中。
+    总大小超过 max_bytes 时按最近访问时间淘汰最久未使用的响应。
+    读取缓存时只在内存中记录访问时间，攒够 ACCESS_BATCH 条、写入新响应（淘汰之前）或关闭时才批量写入索引。
+    """
+
+    # 内存中最多攒多少条访问时间后写入索引
+    ACCESS_BATCH = 100
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024, ttl: float = 0):
+        """初始化响应缓存
+
+        Args:
+            directory: 缓存目录
+            max_bytes: 缓存正文的总大小上限
+            ttl: 缓存有效期（秒），有效期内直接使用缓存，过期后发送条件请求重新验证，0 表示每次都验证
+        """
+        self.directory = directory
+        self.objects_dir = os.path.join(directory, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._accessed: Dict[str, float] = {}
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "index.db"), timeout=30, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                encoding TEXT NOT NULL,
+                etag TEXT NOT NULL,
+                last_modified TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_digest ON responses (digest)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self._conn.commit()
+        row = self._conn.execute(
+            "SELECT SUM(size) FROM (SELECT MAX(size) AS size FROM responses GROUP BY digest)"
+        ).fetchone()
+        self.total_bytes = row[0] or 0
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Dict[str, Any],
+        spider_name: str,
+        get_data_file: Callable[[str], str],
+    ) -> Optional["ResponseCache"]:
+        """根据 FETCHER_CONFIG["cache"] 创建缓存，未启用时返回 None
+
+        spiders 中可以按爬虫类名覆盖有效期，如 {"BiQuGeSpider": {"ttl": 2592000}}。
+
+        Args:
+            config: 配置字典
+            spider_name: 爬虫类名
+            get_data_file: 把缓存目录名解析为 data 目录下路径的函数，如 BaseSpider.get_data_file
+        """
+        cache_config = config.get("FETCHER_CONFIG", {}).get("cache", {})
+        if not cache_config.get("enabled"):
+            return None
+        spider_config = cache_config.get("spiders", {}).get(spider_name, {})
+        return cls(
+            get_data_file(cache_config.get("dir", "http_cache")),
+            max_bytes=int(cache_config.get("max_size_mb", 512) * 1024 * 1024),
+            ttl=spider_config.get("ttl", cache_config.get("ttl", 0)),
+        )
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """读取缓存的响应并记录最近访问时间，不存在时返回 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest, encoding, etag, last_modified, fetched_at FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            try:
+                with open(self.object_path(row[0]), "rb") as f:
+                    content = f.read()
+            except OSError:
+                # 正文文件丢失时当作未缓存
+                self._accessed.pop(url, None)
+                self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self._conn.commit()
+                return None
+            self._accessed[url] = time.time()
+            if len(self._accessed) >= self.ACCESS_BATCH:
+                self._flush_accessed()
+                self._conn.commit()
+        return CachedResponse(url, content, *row[1:])
+
+    def get_fresh(self, url: str, max_age: Optional[float] = None) -> Optional[CachedResponse]:
+        """读取有效期内的响应
+
+        Args:
+            url: 页面地址
+            max_age: 有效期（秒），默认使用缓存的 ttl
+        """
+        max_age = self.ttl if max_age is None else max_age
+        if max_age <= 0:
+            return None
+        cached = self.get(url)
+        if cached is None or time.time() - cached.fetched_at >= max_age:
+            return None
+        return cached
+
+    def put(
+        self,
+        url: str,
+        content: bytes,
+        encoding: str = "",
+        etag: str = "",
+        last_modified: str = "",
+    ) -> None:
+        """保存响应，正文已存在时只更新索引"""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.object_path(digest)
+        now = time.time()
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # 先写临时文件再改名，避免并发读取到写了一半的文件
+                fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+                with os.fdopen(fd, "wb") as f:
+                    f.write(content)
+                os.replace(temp_path, path)
+                self.total_bytes += len(content)
+            previous = self._conn.execute(
+                "SELECT digest FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (url, digest, size, encoding, etag, last_modified, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (url, digest, len(content), encoding or "", etag or "", last_modified or "", now, now),
+            )
+            if previous and previous[0] != digest:
+                self._release(previous[0])
+            self._accessed.pop(url, None)
+            self._flush_accessed()
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url: str) -> None:
+        """服务端确认缓存未变化（304）后重置抓取时间"""
+        now = time.time()
+        with self._lock:
+            self._accessed.pop(url, None)
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url)
+            )
+            self._conn.commit()
+
+    def _flush_accessed(self) -> None:
+        """把内存中记录的访问时间写入索引，由调用方提交"""
+        if not self._accessed:
+            return
+        self._conn.executemany(
+            "UPDATE responses SET accessed_at = ? WHERE url = ?",
+            [(accessed_at, url) for url, accessed_at in self._accessed.items()],
+        )
+        self._accessed.clear()
+
+    def _release(self, digest: str) -> None:
+        """没有 URL 再引用该正文时删除正文文件"""
+        if self._conn.execute("SELECT 1 FROM responses WHERE digest = ?", (digest,)).fetchone():
+            return
+        path = self.object_path(digest)
+        try:
+            self.total_bytes -= os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """按最近访问时间淘汰，直到总大小不超过上限"""
+        while self.total_bytes > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT url, digest FROM responses ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (row[0],))
+            self._release(row[1])
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+            self._conn.close()
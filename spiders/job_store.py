@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+# 职位链接中的站点职位 ID，如 /job_detail/abc123.html?lid=...，查询参数每次搜索都会变化
+JOB_ID_PATTERN = re.compile(r"/job_detail/([^/?#]+?)\.html")
+
+# 参与变化检测的列表字段，这些字段不变时认为职位未变化，可以沿用已保存的详情
+FINGERPRINT_FIELDS = ("职位", "薪资", "公司", "地点", "要求", "公司类型")
+
+# upsert 的结果
+NEW = "new"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+
+
+def job_identity(record: Dict[str, Any]) -> str:
+    """计算职位的稳定标识：优先使用站点职位 ID，否则使用 公司 + 职位 + 地点"""
+    match = JOB_ID_PATTERN.search(record.get("链接") or "")
+    if match:
+        return f"id:{match.group(1)}"
+    return "key:" + "|".join(str(record.get(field, "")) for field in ("公司", "职位", "地点"))
+
+
+def job_fingerprint(record: Dict[str, Any], fields: Sequence[str] = FINGERPRINT_FIELDS) -> str:
+    """计算职位列表字段的摘要，用于判断职位在两次运行之间是否变化"""
+    payload = json.dumps([record.get(field) for field in fields], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """基于 SQLite 的职位库
+
+    以稳定的职位标识为主键跨运行保存职位，记录首次发现和最近一次发现的时间。
+    写入先缓冲在内存中，每 batch_size 条在一个事务中批量 upsert。
+    """
+
+    def __init__(self, path: str, batch_size: int = 100):
+        """初始化职位库
+
+        Args:
+            path: SQLite 数据库文件路径
+            batch_size: 每批写入的记录数
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.run_started = time.time()
+        self._pending: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        # 并行模式下工作进程只读，主进程写入，使用 WAL 模式避免读写互相阻塞
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                data TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                changed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_first_seen ON jobs (first_seen)")
+        self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """按职位标识读取职位，包含 fingerprint、data、first_seen、last_seen、changed_at"""
+        with self._lock:
+            if job_id in self._pending:
+                fingerprint, data, seen_at = self._pending[job_id]
+                return {"fingerprint": fingerprint, "data": json.loads(data), "last_seen": seen_at}
+            row = self._conn.execute(
+                "SELECT fingerprint, data, first_seen, last_seen, changed_at FROM jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "fingerprint": row[0],
+            "data": json.loads(row[1]),
+            "first_seen": row[2],
+            "last_seen": row[3],
+            "changed_at": row[4],
+        }
+
+    def find_unchanged(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """查找已保存且列表字段未变化的职位，返回保存的记录，不存在或已变化时返回 None"""
+        stored = self.get(job_identity(record))
+        if stored is None or stored["fingerprint"] != job_fingerprint(record):
+            return None
+        return stored["data"]
+
+    def status(self, record: Dict[str, Any]) -> str:
+        """判断职位相对于职位库是新职位、已变化还是未变化"""
+        stored = self.get(job_identity(record))
+        if stored is None:
+            return NEW
+        return UNCHANGED if stored["fingerprint"] == job_fingerprint(record) else CHANGED
+
+    def upsert(self, record: Dict[str, Any]) -> str:
+        """保存职位，已存在时更新数据和最近发现时间，首次发现时间保持不变
+
+        Returns:
+            str: NEW / CHANGED / UNCHANGED
+        """
+        result = self.status(record)
+        with self._lock:
+            self._pending[job_identity(record)] = (
+                job_fingerprint(record),
+                json.dumps(record, ensure_ascii=False),
+                time.time(),
+            )
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+        return result
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        rows = [
+            (job_id, fingerprint, data, seen_at, seen_at, seen_at)
+            for job_id, (fingerprint, data, seen_at) in self._pending.items()
+        ]
+        with self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO jobs (job_id, fingerprint, data, first_seen, last_seen, changed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (job_id) DO UPDATE SET
+                    changed_at = CASE WHEN jobs.fingerprint = excluded.fingerprint
+                        THEN jobs.changed_at ELSE excluded.changed_at END,
+                    fingerprint = excluded.fingerprint,
+                    data = excluded.data,
+                    last_seen = excluded.last_seen
+                """,
+                rows,
+            )
+        self._pending.clear()
+
+    def flush(self) -> None:
+        """把缓冲的记录写入数据库"""
+        with self._lock:
+            self._flush()
+
+    def iter_jobs(self, since: float = 0, new_only: bool = False) -> Iterator[Dict[str, Any]]:
+        """遍历 since 之后发现（new_only 为 True 时为首次发现）的职位"""
+        self.flush()
+        column = "first_seen" if new_only else "last_seen"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM jobs WHERE {column} >= ? ORDER BY first_seen", (since,)
+            ).fetchall()
+        for row in rows:
+            yield json.loads(row[0])
+
+    def new_jobs(self) -> List[Dict[str, Any]]:
+        """本次运行中首次发现的职位"""
+        return list(self.iter_jobs(self.run_started, new_only=True))
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._conn.close()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+# 默认耗时分桶（秒），覆盖从毫秒级的解析到数十秒的页面加载
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Histogram:
+    """耗时直方图：按分桶计数，同时记录总数、总和与最值"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * (len(self.buckets) + 1)  # 最后一个为 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        """记录一次观测值"""
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "Histogram") -> None:
+        """合并另一个分桶相同的直方图"""
+        if other.buckets != self.buckets:
+            raise ValueError("直方图分桶不一致，无法合并")
+        self.bucket_counts = [a + b for a, b in zip(self.bucket_counts, other.bucket_counts)]
+        self.count += other.count
+        self.sum += other.sum
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """按分桶估算分位数，返回所在分桶的上界"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+        }
+
+
+class Metrics:
+    """爬虫运行指标：计数器和各阶段耗时直方图，线程安全
+
+    阶段耗时统一记录在 stage_seconds 直方图中，按阶段名区分，
+    如 fetch、page_load、extract、detail、delay、save。
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counters: Dict[str, float] = {}
+        self.stages: Dict[str, Histogram] = {}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # 锁不能序列化，工作进程把指标传回主进程时去掉
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def merge(self, other: "Metrics") -> None:
+        """合并另一个指标（如工作进程的指标）的计数器和阶段耗时"""
+        with self._lock:
+            for name, value in other.counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for stage, histogram in other.stages.items():
+                target = self.stages.get(stage)
+                if target is None:
+                    target = self.stages[stage] = Histogram(histogram.buckets)
+                target.merge(histogram)
+
+    def inc(self, name: str, value: float = 1) -> None:
+        """计数器加 value"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """记录某个阶段的一次耗时"""
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """统计代码块耗时，代码块抛出异常时额外计入 {stage}_errors 计数器"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc(f"{stage}_errors")
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start_time)
+
+    def summary(self) -> Dict[str, Any]:
+        """返回所有指标的汇总"""
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "elapsed": round(time.time() - self.started_at, 3),
+                "counters": dict(self.counters),
+                "stages": {
+                    stage: histogram.summary()
+                    for stage, histogram in sorted(self.stages.items())
+                },
+            }
+
+    def to_prometheus(self, prefix: str = "spider", labels: Dict[str, str] = None) -> str:
+        """导出为 Prometheus 文本格式
+
+        Args:
+            prefix: 指标名前缀
+            labels: 附加到每个指标上的标签，如 {"spider": "BossSpider"}
+        """
+
+        def format_labels(extra: Dict[str, str]) -> str:
+            merged = {**(labels or {}), **extra}
+            if not merged:
+                return ""
+            pairs = ",".join(f'{key}="{value}"' for key, value in merged.items())
+            return "{" + pairs + "}"
+
+        lines: List[str] = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = f"{prefix}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric}{format_labels({})} {value}")
+
+            metric = f"{prefix}_stage_seconds"
+            if self.stages:
+                lines.append(f"# TYPE {metric} histogram")
+            for stage, histogram in sorted(self.stages.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+                    cumulative += count
+                    bucket_labels = format_labels({"stage": stage, "le": str(bound)})
+                    lines.append(f"{metric}_bucket{bucket_labels} {cumulative}")
+                bucket_labels = format_labels({"stage": stage, "le": "+Inf"})
+                lines.append(f"{metric}_bucket{bucket_labels} {histogram.count}")
+                stage_labels = format_labels({"stage": stage})
+                lines.append(f"{metric}_sum{stage_labels} {histogram.sum}")
+                lines.append(f"{metric}_count{stage_labels} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str) -> None:
+        """把汇总写入 JSON 文件"""
+        _ensure_dir(path)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+    def write_prometheus(self, path: str, **kwargs: Any) -> None:
+        """把指标写入 Prometheus 文本文件（可由 node_exporter 的 textfile collector 采集）
+
+        先写临时文件再替换，避免采集到写了一半的文件。
+        """
+        _ensure_dir(path)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus(**kwargs))
+        os.replace(tmp_path, path)
+
+
+def _ensure_dir(path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
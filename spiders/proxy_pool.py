@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import requests
+
+
+class ProxyStats:
+    """单个代理的健康状态"""
+
+    def __init__(self, proxy: str):
+        self.proxy = proxy
+        self.alive: Optional[bool] = None  # None 表示尚未检查
+        self.latency: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.banned = False
+        self.last_checked = 0.0
+
+    @property
+    def score(self) -> float:
+        """健康分：成功率越高、延迟越低分数越高"""
+        total = self.successes + self.failures
+        success_rate = (self.successes + 1) / (total + 2)
+        latency = self.latency if self.latency is not None else 5.0
+        return success_rate / (1 + latency)
+
+
+def normalize_proxy(proxy: str, proxy_type: str = "http") -> str:
+    """给没有协议前缀的代理地址加上前缀，如 127.0.0.1:7897 -> http://127.0.0.1:7897"""
+    return proxy if "://" in proxy else f"{proxy_type}://{proxy}"
+
+
+def check_proxy(
+    proxy: str, check_url: str, timeout: float, proxy_type: str = "http"
+) -> Tuple[bool, Optional[float]]:
+    """检查代理是否可用
+
+    Returns:
+        Tuple[bool, Optional[float]]: (是否可用, 响应延迟秒数)
+    """
+    proxy_url = normalize_proxy(proxy, proxy_type)
+    start_time = time.monotonic()
+    try:
+        response = requests.get(
+            check_url,
+            proxies={"http": proxy_url, "https": proxy_url},
+            timeout=timeout,
+        )
+        if response.status_code == 200:
+            return True, time.monotonic() - start_time
+    except requests.RequestException:
+        pass
+    return False, None
+
+
+class ProxyPool:
+    """代理池：一次加载代理列表，后台并发验证，按健康分轮换，自动剔除失效代理"""
+
+    _shared: Dict[str, "ProxyPool"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        proxies: List[str],
+        check_url: str = "https://www.baidu.com",
+        timeout: float = 10,
+        proxy_type: str = "http",
+        check_workers: int = 20,
+        max_failures: int = 3,
+        revalidate_interval: float = 0,
+        logger: logging.Logger = None,
+    ):
+        """初始化代理池
+
+        Args:
+            proxies: 代理地址列表
+            check_url: 用于验证代理的地址
+            timeout: 验证超时时间（秒）
+            proxy_type: 代理地址没有协议前缀时使用的协议
+            check_workers: 并发验证的线程数
+            max_failures: 连续失败多少次后剔除代理
+            revalidate_interval: 后台重新验证的间隔（秒），0 表示只在启动时验证一次
+            logger: 日志记录器
+        """
+        self.check_url = check_url
+        self.timeout = timeout
+        self.proxy_type = proxy_type
+        self.check_workers = check_workers
+        self.max_failures = max_failures
+        self.revalidate_interval = revalidate_interval
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+        self._stats: Dict[str, ProxyStats] = {
+            proxy: ProxyStats(proxy) for proxy in dict.fromkeys(proxies)
+        }
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.validated = threading.Event()
+
+    @staticmethod
+    def load(path: str) -> List[str]:
+        """读取代理文件，每行一个代理，忽略空行和 # 开头的注释"""
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            lines = [line.strip() for line in f]
+        return [line for line in lines if line and not line.startswith("#")]
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], logger: logging.Logger = None) -> "ProxyPool":
+        """根据 PROXY_CONFIG 创建代理池"""
+        proxy_config = config["PROXY_CONFIG"]
+        proxies = cls.load(proxy_config["proxy_file"])
+        if not proxies and logger:
+            logger.warning(f"代理文件 {proxy_config['proxy_file']} 不存在或为空")
+        return cls(
+            proxies,
+            check_url=proxy_config.get("check_url", "https://www.baidu.com"),
+            timeout=proxy_config.get("proxy_timeout", 10),
+            proxy_type=proxy_config.get("proxy_type", "http"),
+            check_workers=proxy_config.get("check_workers", 20),
+            max_failures=proxy_config.get("max_failures", 3),
+            revalidate_interval=proxy_config.get("revalidate_interval", 0),
+            logger=logger,
+        )
+
+    @classmethod
+    def shared(cls, config: Dict[str, Any], logger: logging.Logger = None) -> "ProxyPool":
+        """获取进程内共享的代理池，同一个代理文件只加载和验证一次"""
+        proxy_file = config["PROXY_CONFIG"]["proxy_file"]
+        with cls._shared_lock:
+            pool = cls._shared.get(proxy_file)
+            if pool is None:
+                pool = cls._shared[proxy_file] = cls.from_config(config, logger)
+                if config["PROXY_CONFIG"].get("check_proxy"):
+                    pool.start_validation()
+        return pool
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(1 for stats in self._stats.values() if not stats.banned)
+
+    def start_validation(self) -> None:
+        """在后台线程中并发验证所有代理，不阻塞调用方"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._validation_loop, name="ProxyPoolValidator", daemon=True
+        )
+        self._thread.start()
+
+    def _validation_loop(self) -> None:
+        while not self._stop.is_set():
+            self.validate_all()
+            self.validated.set()
+            if not self.revalidate_interval:
+                return
+            self._stop.wait(self.revalidate_interval)
+
+    def validate_all(self) -> None:
+        """并发验证所有未被剔除的代理"""
+        with self._lock:
+            proxies = [stats.proxy for stats in self._stats.values() if not stats.banned]
+        if not proxies:
+            return
+
+        start_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=min(self.check_workers, len(proxies))) as executor:
+            results = executor.map(
+                lambda proxy: (
+                    proxy,
+                    check_proxy(proxy, self.check_url, self.timeout, self.proxy_type),
+                ),
+                proxies,
+            )
+            for proxy, (alive, latency) in results:
+                with self._lock:
+                    stats = self._stats[proxy]
+                    stats.alive = alive
+                    stats.last_checked = time.time()
+                    if alive:
+                        stats.latency = latency
+                        stats.consecutive_failures = 0
+
+        with self._lock:
+            alive_count = sum(1 for stats in self._stats.values() if stats.alive)
+        self.logger.info(
+            f"代理验证完成：{alive_count}/{len(proxies)} 可用，"
+            f"耗时 {time.monotonic() - start_time:.1f} 秒"
+        )
+
+    def get(self) -> str:
+        """按健康分加权随机选择一个代理
+
+        优先选择验证通过的代理；验证尚未完成时也会返回未验证的代理，没有可用代理时返回空字符串。
+        """
+        with self._lock:
+            candidates = [
+                stats
+                for stats in self._stats.values()
+                if not stats.banned and stats.alive is not False
+            ]
+            verified = [stats for stats in candidates if stats.alive]
+            if verified:
+                candidates = verified
+            if not candidates:
+                return ""
+            chosen = random.choices(
+                candidates, weights=[stats.score for stats in candidates]
+            )[0]
+            return chosen.proxy
+
+    def report_success(self, proxy: str, latency: float = None) -> None:
+        """记录一次成功请求"""
+        with self._lock:
+            stats = self._stats.get(proxy)
+            if stats is None:
+                return
+            stats.successes += 1
+            stats.consecutive_failures = 0
+            stats.alive = True
+            if latency is not None:
+                # 指数加权平均，平滑偶发的慢请求
+                stats.latency = (
+                    latency if stats.latency is None else stats.latency * 0.7 + latency * 0.3
+                )
+
+    def report_failure(self, proxy: str, banned: bool = False) -> None:
+        """记录一次失败请求，连续失败次数过多或被封禁时剔除代理
+
+        Args:
+            proxy: 代理地址
+            banned: 是否被目标网站封禁（如返回验证码页）
+        """
+        with self._lock:
+            stats = self._stats.get(proxy)
+            if stats is None or stats.banned:
+                return
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            if banned or stats.consecutive_failures >= self.max_failures:
+                stats.banned = True
+                reason = "被封禁" if banned else f"连续失败 {stats.consecutive_failures} 次"
+                self.logger.warning(f"剔除代理 {proxy}：{reason}")
+
+    def ranked(self) -> List[ProxyStats]:
+        """按健康分从高到低返回所有可用代理的状态"""
+        with self._lock:
+            alive = [
+                stats for stats in self._stats.values() if stats.alive and not stats.banned
+            ]
+        return sorted(alive, key=lambda stats: stats.score, reverse=True)
+
+    def close(self) -> None:
+        """停止后台验证"""
+        self._stop.set()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import copy
+import random
+import threading
+import time
+from typing import Any, Dict
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """令牌桶：以固定速率生成令牌，最多积累 capacity 个"""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        """初始化令牌桶
+
+        Args:
+            rate: 每秒生成的令牌数
+            capacity: 令牌桶容量，即允许的突发请求数
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def reserve(self) -> float:
+        """预定一个令牌
+
+        令牌不足时允许透支，调用方需要等待返回的秒数后再发起请求，
+        这样多个线程同时预定时会依次排队而不会同时醒来。
+
+        Returns:
+            float: 需要等待的秒数
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class HostRateLimiter:
+    """按主机限速器，每个主机一个令牌桶，线程安全
+
+    只有请求预算用完时才等待，等待时间加入随机抖动，避免请求间隔过于规律。
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = 0,
+        burst: int = 1,
+        jitter: float = 0,
+        hosts: Dict[str, float] = None,
+    ):
+        """初始化限速器
+
+        Args:
+            requests_per_second: 每个主机每秒最多请求数，小于等于 0 表示不限速
+            burst: 允许的突发请求数
+            jitter: 等待时额外增加的随机时间，占请求间隔的比例
+            hosts: 按主机覆盖 requests_per_second
+        """
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.jitter = jitter
+        self.hosts = hosts or {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "HostRateLimiter":
+        """根据 SPIDER_CONFIG["rate_limit"] 创建限速器"""
+        rate_config = config["SPIDER_CONFIG"].get("rate_limit", {})
+        return cls(
+            requests_per_second=rate_config.get("requests_per_second", 0),
+            burst=rate_config.get("burst", 1),
+            jitter=rate_config.get("jitter", 0),
+            hosts=rate_config.get("hosts"),
+        )
+
+    def get_rate(self, host: str) -> float:
+        return self.hosts.get(host, self.requests_per_second)
+
+    def reserve(self, url: str) -> float:
+        """为 url 所在主机预定一次请求，返回需要等待的秒数"""
+        host = urlparse(url).netloc
+        rate = self.get_rate(host)
+        if rate <= 0:
+            return 0.0
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(rate, self.burst)
+            delay = bucket.reserve()
+        if delay > 0 and self.jitter:
+            delay += random.uniform(0, self.jitter / rate)
+        return delay
+
+    def acquire(self, url: str) -> float:
+        """阻塞直到可以向 url 所在主机发起请求
+
+        Returns:
+            float: 实际等待的秒数
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class SharedRateLimiter(HostRateLimiter):
+    """跨节点共享的按主机限速器，令牌状态保存在分布式任务队列中
+
+    所有工作节点共用 SPIDER_CONFIG["rate_limit"] 中配置的速率，增加节点不会提高对同一主机的请求速率。
+    """
+
+    def __init__(self, queue, **kwargs):
+        """初始化限速器
+
+        Args:
+            queue: 提供 reserve_rate 的任务队列，见 spiders.work_queue
+            **kwargs: 同 HostRateLimiter
+        """
+        super().__init__(**kwargs)
+        self.queue = queue
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], queue=None) -> "SharedRateLimiter":
+        rate_config = config["SPIDER_CONFIG"].get("rate_limit", {})
+        return cls(
+            queue,
+            requests_per_second=rate_config.get("requests_per_second", 0),
+            burst=rate_config.get("burst", 1),
+            jitter=rate_config.get("jitter", 0),
+            hosts=rate_config.get("hosts"),
+        )
+
+    def reserve(self, url: str) -> float:
+        host = urlparse(url).netloc
+        rate = self.get_rate(host)
+        if rate <= 0:
+            return 0.0
+        delay = self.queue.reserve_rate(host, rate, self.burst)
+        if delay > 0 and self.jitter:
+            delay += random.uniform(0, self.jitter / rate)
+        return delay
+
+
+def scale_rate_limit(config: Dict[str, Any], factor: float) -> Dict[str, Any]:
+    """返回请求速率按 factor 缩放后的配置副本
+
+    多个进程各自持有限速器时，把总速率平均分给每个进程，整体仍不超过配置的速率。
+    """
+    config = copy.deepcopy(config)
+    rate_config = config["SPIDER_CONFIG"].get("rate_limit")
+    if not rate_config:
+        return config
+    rate_config["requests_per_second"] = rate_config.get("requests_per_second", 0) * factor
+    rate_config["hosts"] = {
+        host: rate * factor for host, rate in rate_config.get("hosts", {}).items()
+    }
+    return config
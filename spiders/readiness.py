@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""页面就绪条件
+
+每个条件都是接收 driver 的可调用对象，满足时返回真值，可直接传给 WebDriverWait.until。
+条件只通过一次 execute_script 读取页面状态，配合较短的轮询间隔，内容一出现就返回，
+而不是固定等待整个超时时间。
+"""
+
+import time
+from typing import Any, Callable, List
+
+Condition = Callable[[Any], Any]
+
+# 最近一次资源请求完成距今的毫秒数和已完成的资源请求数
+RESOURCE_STATE_SCRIPT = """
+const entries = performance.getEntriesByType("resource");
+const lastEnd = entries.reduce((latest, entry) => Math.max(latest, entry.responseEnd), 0);
+return [document.readyState, entries.length, performance.now() - lastEnd];
+"""
+
+XHR_COMPLETED_SCRIPT = """
+const pattern = arguments[0];
+return performance.getEntriesByType("resource").some(
+    (entry) => ["xmlhttprequest", "fetch"].includes(entry.initiatorType)
+        && entry.name.includes(pattern) && entry.responseEnd > 0
+);
+"""
+
+
+def element_present(selector: str) -> Condition:
+    """页面中出现匹配 CSS 选择器的元素"""
+
+    def condition(driver):
+        return driver.execute_script("return !!document.querySelector(arguments[0]);", selector)
+
+    return condition
+
+
+def element_absent(selector: str) -> Condition:
+    """页面中不存在匹配 CSS 选择器的元素，如加载动画消失"""
+
+    def condition(driver):
+        return driver.execute_script("return !document.querySelector(arguments[0]);", selector)
+
+    return condition
+
+
+def element_count_stable(selector: str, min_count: int = 1, stable_for: float = 0.3) -> Condition:
+    """匹配元素的数量不少于 min_count，且在 stable_for 秒内没有变化（列表渲染完成）"""
+    state = {"count": None, "since": 0.0}
+
+    def condition(driver):
+        count = driver.execute_script(
+            "return document.querySelectorAll(arguments[0]).length;", selector
+        )
+        now = time.monotonic()
+        if count != state["count"]:
+            state["count"], state["since"] = count, now
+            return stable_for <= 0 and count >= min_count
+        return count >= min_count and now - state["since"] >= stable_for
+
+    return condition
+
+
+def network_idle(idle_time: float = 0.5) -> Condition:
+    """文档加载完成，且 idle_time 秒内没有新的资源请求完成"""
+    state = {"count": None}
+
+    def condition(driver):
+        ready_state, count, since_last = driver.execute_script(RESOURCE_STATE_SCRIPT)
+        changed = count != state["count"]
+        state["count"] = count
+        return ready_state != "loading" and not changed and since_last >= idle_time * 1000
+
+    return condition
+
+
+def xhr_completed(pattern: str) -> Condition:
+    """URL 包含 pattern 的 XHR/fetch 请求已经完成"""
+
+    def condition(driver):
+        return driver.execute_script(XHR_COMPLETED_SCRIPT, pattern)
+
+    return condition
+
+
+def all_of(*conditions: Condition) -> Condition:
+    """所有条件都满足
+
+    每次轮询都会调用全部条件，保证有状态的条件（如数量稳定）持续更新。
+    """
+
+    def condition(driver):
+        results = [check(driver) for check in conditions]
+        return all(results)
+
+    return condition
+
+
+def any_of(*conditions: Condition) -> Condition:
+    """任一条件满足"""
+
+    def condition(driver):
+        results = [check(driver) for check in conditions]
+        return any(results)
+
+    return condition
+
+
+def wait_until_ready(
+    driver, conditions: List[Condition], timeout: float, poll_frequency: float = 0.1
+) -> None:
+    """轮询直到所有条件满足
+
+    Raises:
+        TimeoutException: 超时仍未满足
+    """
+    from selenium.common.exceptions import JavascriptException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    # 页面跳转过程中执行脚本可能失败，继续轮询即可
+    WebDriverWait(
+        driver,
+        timeout,
+        poll_frequency=poll_frequency,
+        ignored_exceptions=(JavascriptException,),
+    ).until(all_of(*conditions))
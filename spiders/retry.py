@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import functools
+import logging
+import random
+import time
+from typing import Any, Callable, Dict, Optional
+import requests
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+
+class CaptchaError(Exception):
+    """触发验证码或被目标网站判定为异常访问"""
+
+
+class ProxyFailedError(Exception):
+    """代理无法连接"""
+
+
+class RetryPolicy:
+    """单类错误的重试策略：指数退避 + 随机抖动"""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        delay: float = 5,
+        backoff: float = 2,
+        max_delay: float = 60,
+        jitter: float = 0.3,
+        rotate: str = "none",
+    ):
+        """初始化重试策略
+
+        Args:
+            max_attempts: 最多尝试次数（含第一次）
+            delay: 第一次重试前的等待时间（秒）
+            backoff: 每次重试等待时间的增长倍数
+            max_delay: 单次等待时间上限（秒）
+            jitter: 随机抖动占等待时间的比例
+            rotate: 重试前的轮换方式：none/proxy（更换代理）/driver（重启浏览器）
+        """
+        self.max_attempts = max_attempts
+        self.delay = delay
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.rotate = rotate
+
+    def get_delay(self, attempt: int) -> float:
+        """计算第 attempt 次失败后的等待时间"""
+        delay = min(self.max_delay, self.delay * self.backoff ** (attempt - 1))
+        return delay + random.uniform(0, delay * self.jitter)
+
+
+def classify_error(exc: BaseException) -> Optional[str]:
+    """把异常归类为 timeout/proxy/connection/captcha/http，无法重试的异常返回 None"""
+    if isinstance(exc, CaptchaError):
+        return "captcha"
+    if isinstance(exc, (ProxyFailedError, requests.exceptions.ProxyError)):
+        return "proxy"
+    if isinstance(exc, (TimeoutException, requests.exceptions.Timeout)):
+        return "timeout"
+    if isinstance(exc, requests.exceptions.ConnectionError):
+        return "connection"
+    if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        if status == 403:
+            return "captcha"
+        if status == 429 or status >= 500:
+            return "http"
+        return None
+    if isinstance(exc, WebDriverException):
+        message = exc.msg or ""
+        if "ERR_PROXY" in message or "ERR_TUNNEL" in message:
+            return "proxy"
+        if "net::ERR_" in message:
+            return "connection"
+    return None
+
+
+class RetryEngine:
+    """按错误类型选择重试策略并执行重试"""
+
+    def __init__(
+        self,
+        policies: Dict[str, RetryPolicy],
+        on_rotate: Callable[[str, str, BaseException], None] = None,
+        logger: logging.Logger = None,
+        metrics=None,
+    ):
+        """初始化重试引擎
+
+        Args:
+            policies: 错误类型到重试策略的映射
+            on_rotate: 重试前执行轮换的回调，参数为 (轮换方式, 错误类型, 异常)
+            logger: 日志记录器
+            metrics: 运行指标，记录各类错误的重试次数
+        """
+        self.policies = policies
+        self.on_rotate = on_rotate
+        self.metrics = metrics
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Dict[str, Any],
+        on_rotate: Callable = None,
+        logger: logging.Logger = None,
+        metrics=None,
+    ) -> "RetryEngine":
+        """根据 SPIDER_CONFIG["retry"] 创建重试引擎，各错误类型的配置覆盖通用配置"""
+        retry_config = dict(config["SPIDER_CONFIG"].get("retry", {}))
+        overrides = retry_config.pop("policies", {})
+        policies = {}
+        for category in ("timeout", "proxy", "connection", "captcha", "http"):
+            options = {**retry_config, **overrides.get(category, {})}
+            policies[category] = RetryPolicy(**options)
+        return cls(policies, on_rotate=on_rotate, logger=logger, metrics=metrics)
+
+    def call(
+        self,
+        func: Callable,
+        *args,
+        description: str = "",
+        before_retry: Callable[[], None] = None,
+        allow_rotate: bool = True,
+        **kwargs,
+    ) -> Any:
+        """调用 func，失败时按错误类型对应的策略重试
+
+        Args:
+            func: 要执行的函数
+            description: 日志中使用的操作描述
+            before_retry: 每次重试前执行的回调，如刷新页面
+            allow_rotate: 是否允许按策略更换代理或重启浏览器；
+                依赖当前页面状态的操作（如点击元素）应设为 False
+
+        Returns:
+            Any: func 的返回值
+        """
+        description = description or getattr(func, "__name__", "操作")
+        attempt = 1
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as exc:
+                category = classify_error(exc)
+                policy = self.policies.get(category) if category else None
+                if policy is None or attempt >= policy.max_attempts:
+                    raise
+                delay = policy.get_delay(attempt)
+                if self.metrics is not None:
+                    self.metrics.inc(f"retries_{category}")
+                self.logger.warning(
+                    f"{description} 第 {attempt} 次失败（{category}）: {str(exc).strip()}，"
+                    f"{delay:.1f} 秒后重试"
+                )
+                if allow_rotate and policy.rotate != "none" and self.on_rotate:
+                    self.on_rotate(policy.rotate, category, exc)
+                time.sleep(delay)
+                if before_retry is not None:
+                    before_retry()
+                attempt += 1
+
+
+def retryable(
+    description: str = "", allow_rotate: bool = True, before_retry: str = None
+) -> Callable:
+    """把爬虫方法包装为按 self.retry_engine 重试
+
+    Args:
+        description: 日志中使用的操作描述，默认使用方法名
+        allow_rotate: 是否允许按策略更换代理或重启浏览器
+        before_retry: 每次重试前调用的爬虫方法名
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            return self.retry_engine.call(
+                func,
+                self,
+                *args,
+                description=description or func.__name__,
+                before_retry=getattr(self, before_retry) if before_retry else None,
+                allow_rotate=allow_rotate,
+                **kwargs,
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Excel 单个工作表最多 1048576 行（含表头）
+EXCEL_MAX_ROWS = 1048576
+
+
+class JsonLinesWriter:
+    """JSON Lines 追加写入器
+
+    每条记录写成一行 JSON，定期 flush + fsync，进程崩溃时最多丢失最近几条记录，
+    内存中不保留已写入的数据。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fsync_interval: int = 10,
+        append: bool = False,
+        on_sync: Optional[Callable[[], None]] = None,
+    ):
+        """初始化写入器
+
+        Args:
+            path: JSON Lines 文件路径
+            fsync_interval: 每写入多少条记录同步一次磁盘，0 表示只在关闭时同步
+            append: 是否在已有文件末尾追加，否则清空重写
+            on_sync: 每次同步到磁盘后调用，用于在数据落盘后再记录进度
+        """
+        self.path = path
+        self.fsync_interval = fsync_interval
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+        self.on_sync = on_sync
+        self.count = 0
+        # 已同步到磁盘的记录数
+        self.synced_count = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """追加一条记录"""
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+        if self.fsync_interval and self.count % self.fsync_interval == 0:
+            self.sync()
+
+    def sync(self) -> None:
+        """把缓冲区写入磁盘"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.synced_count = self.count
+        if self.on_sync is not None:
+            self.on_sync()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+
+# 分区目录名中需要转义的字符，转义方式与 pyarrow 的 Hive 分区解码（URI 编码）一致
+_PARTITION_UNSAFE = '%/\\=:*?"<>|'
+
+
+def _partition_value(value: str) -> str:
+    if not value:
+        return "__HIVE_DEFAULT_PARTITION__"
+    return "".join(f"%{ord(char):02X}" if char in _PARTITION_UNSAFE else char for char in value)
+
+
+class PartitionedParquetWriter:
+    """按分区写入 Parquet 数据集（Hive 风格目录，如 crawl_date=2024-01-01/城市=深圳/）
+
+    每个分区一个文件，记录在内存中攒够 row_group_size 条后作为一个 row group 写入，
+    下游可以只读取需要的分区和列。分区列只体现在目录名中，不重复写入文件。
+    写入过程中文件名以 _ 开头，读取数据集时会被忽略，close 时写完文件尾再改为正式文件名，
+    进程崩溃时残留的不完整文件不会导致整个数据集无法读取。
+    字段类型与文件的列类型不一致时，字符串列写入 str(值)，其他列无法转换的值写为空值并计入 invalid_values。
+    """
+
+    def __init__(
+        self,
+        root: str,
+        partition_by: Sequence[str] = ("crawl_date",),
+        row_group_size: int = 5000,
+        compression: str = "zstd",
+    ):
+        """初始化写入器
+
+        Args:
+            root: 数据集根目录
+            partition_by: 分区列，crawl_date 表示本次爬取的日期，其余为记录中的字段
+            row_group_size: 每个 row group 的记录数
+            compression: 压缩算法
+        """
+        # pyarrow 为可选依赖，只在启用 Parquet 输出时导入
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._pq = pq
+        self.root = root
+        self.partition_by = list(partition_by)
+        self.row_group_size = max(1, row_group_size)
+        self.compression = compression
+        self.crawl_date = time.strftime("%Y-%m-%d")
+        # 同一天多次运行写入不同的文件，不覆盖之前的数据
+        self.file_name = f"part-{time.strftime('%H%M%S')}-{os.getpid()}.parquet"
+        self._buffers: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        self._writers: Dict[Tuple[str, ...], Any] = {}
+        self._paths: Dict[Tuple[str, ...], str] = {}
+        self.count = 0
+        self.invalid_values = 0
+
+    def partition_of(self, record: Dict[str, Any]) -> Tuple[str, ...]:
+        values = []
+        for column in self.partition_by:
+            value = self.crawl_date if column == "crawl_date" else record.get(column)
+            values.append("" if value is None else str(value))
+        return tuple(values)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """追加一条记录"""
+        partition = self.partition_of(record)
+        row = {key: value for key, value in record.items() if key not in self.partition_by}
+        buffer = self._buffers.setdefault(partition, [])
+        buffer.append(row)
+        self.count += 1
+        if len(buffer) >= self.row_group_size:
+            self._flush(partition)
+
+    def _coerce(self, value: Any, value_type: Any) -> Any:
+        """把与列类型不一致的值转换为该类型，无法转换时返回 None"""
+        if value is None:
+            return None
+        pa = self._pa
+        try:
+            return pa.scalar(value, type=value_type).as_py()
+        except (pa.ArrowException, TypeError, ValueError, OverflowError):
+            pass
+        if pa.types.is_string(value_type):
+            return str(value)
+        self.invalid_values += 1
+        return None
+
+    def _to_table(self, rows: List[Dict[str, Any]], schema: Any = None) -> Any:
+        """按列构建表，某列的值无法按推断或指定的类型转换时逐个转换该列的值
+
+        未指定 schema 时列为所有记录中出现过的字段，混合类型的列按字符串处理。
+        """
+        pa = self._pa
+        if schema is None:
+            names = list(dict.fromkeys(key for row in rows for key in row))
+            types = [None] * len(names)
+        else:
+            names, types = schema.names, schema.types
+        arrays = []
+        for name, value_type in zip(names, types):
+            values = [row.get(name) for row in rows]
+            try:
+                arrays.append(pa.array(values, type=value_type))
+            except (pa.ArrowException, TypeError, ValueError, OverflowError):
+                value_type = value_type or pa.string()
+                arrays.append(
+                    pa.array([self._coerce(value, value_type) for value in values], type=value_type)
+                )
+        if schema is None:
+            return pa.Table.from_arrays(arrays, names=names)
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    def _flush(self, partition: Tuple[str, ...]) -> None:
+        rows = self._buffers.pop(partition, None)
+        if not rows:
+            return
+        pa = self._pa
+        writer = self._writers.get(partition)
+        if writer is None:
+            # 第一批记录决定该分区文件的列和类型，之后缺少的列写为空值、多出的列丢弃；
+            # 第一批中全为空的列按字符串处理
+            table = self._to_table(rows)
+            schema = pa.schema(
+                field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                for field in table.schema
+            )
+            table = table.cast(schema)
+            directory = os.path.join(
+                self.root,
+                *(
+                    f"{column}={_partition_value(value)}"
+                    for column, value in zip(self.partition_by, partition)
+                ),
+            )
+            os.makedirs(directory, exist_ok=True)
+            self._paths[partition] = os.path.join(directory, self.file_name)
+            writer = self._writers[partition] = self._pq.ParquetWriter(
+                os.path.join(directory, f"_{self.file_name}"),
+                schema,
+                compression=self.compression,
+            )
+        else:
+            table = self._to_table(rows, writer.schema)
+        writer.write_table(table, row_group_size=self.row_group_size)
+
+    def flush(self) -> None:
+        """把所有分区中缓冲的记录写入文件"""
+        for partition in list(self._buffers):
+            self._flush(partition)
+
+    def close(self) -> None:
+        """写入缓冲的记录和文件尾，并把文件改为正式文件名"""
+        self.flush()
+        for partition, writer in self._writers.items():
+            writer.close()
+            path = self._paths[partition]
+            os.replace(os.path.join(os.path.dirname(path), f"_{self.file_name}"), path)
+        self._writers.clear()
+        self._paths.clear()
+
+
+def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+    """逐行读取 JSON Lines 文件，跳过崩溃时可能残留的不完整末行"""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def scan_columns(path: str) -> Tuple[List[str], Dict[str, int]]:
+    """扫描所有记录，返回列名（按首次出现顺序）和每列最大文本长度"""
+    columns: List[str] = []
+    widths: Dict[str, int] = {}
+    for record in iter_records(path):
+        for key, value in record.items():
+            if key not in widths:
+                columns.append(key)
+                widths[key] = len(str(key))
+            widths[key] = max(widths[key], len(str(value)))
+    return columns, widths
+
+
+def export_json(jsonl_path: str, json_path: str) -> int:
+    """把 JSON Lines 流式导出为 JSON 数组文件
+
+    Returns:
+        int: 导出的记录数
+    """
+    count = 0
+    with open(json_path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for record in iter_records(jsonl_path):
+            f.write(",\n  " if count else "\n  ")
+            f.write(json.dumps(record, ensure_ascii=False))
+            count += 1
+        f.write("\n]\n" if count else "]\n")
+    return count
+
+
+def export_csv(jsonl_path: str, csv_path: str, columns: List[str]) -> None:
+    """把 JSON Lines 流式导出为 CSV 文件"""
+    with open(csv_path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for record in iter_records(jsonl_path):
+            writer.writerow(record)
+
+
+def _excel_value(value: Any) -> Any:
+    """Excel 单元格只接受标量，其余类型转为字符串"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def export_excel(
+    jsonl_path: str,
+    excel_path: str,
+    columns: List[str],
+    widths: Dict[str, int],
+    sheet_name: str = "数据",
+) -> int:
+    """使用 openpyxl 只写模式把 JSON Lines 流式导出为 Excel 文件
+
+    超出 Excel 行数上限的记录不会导出，完整数据请使用 JSON Lines 或 Parquet 文件。
+
+    Returns:
+        int: 记录总数，超过 EXCEL_MAX_ROWS - 1 时只导出了前 EXCEL_MAX_ROWS - 1 条
+    """
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    for idx, column in enumerate(columns, start=1):
+        worksheet.column_dimensions[get_column_letter(idx)].width = widths[column] + 2
+
+    worksheet.append(columns)
+    count = 0
+    for record in iter_records(jsonl_path):
+        # 超出上限后继续计数，调用方据此判断是否截断
+        if count < EXCEL_MAX_ROWS - 1:
+            worksheet.append([_excel_value(record.get(column)) for column in columns])
+        count += 1
+    workbook.save(excel_path)
+    return count
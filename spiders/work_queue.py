@@ -0,0 +1,535 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""分布式爬取使用的共享任务队列
+
+任务以 (task_id, payload) 的形式放入队列，工作节点租借任务后在可见性超时内完成并确认，
+超时未确认的任务会重新回到队列，由其他节点接手。每次租借生成新的租约令牌，确认和失败都要带上令牌，
+任务被其他节点重新租借后，原节点的确认和失败不会生效。尝试次数达到上限的任务在租借时被放弃。工作节点的爬取结果写入同一个结果队列，
+由协调节点统一保存。队列同时提供跨节点共享的按主机限速。
+
+- RedisWorkQueue：多台机器共享，需要安装 redis
+- SQLiteWorkQueue：同一台机器上的多个进程共享，路径为 ":memory:" 时用于单进程测试
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # redis 为可选依赖，缺失时只能使用 SQLite 队列
+    redis = None
+
+
+class Lease(NamedTuple):
+    """租借到的任务"""
+
+    task_id: str
+    payload: Dict[str, Any]
+    attempts: int
+    token: str
+
+
+class WorkQueue:
+    """共享任务队列基类"""
+
+    def put_tasks(self, tasks: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """放入任务，已存在的任务（包括已完成的）不会重复放入
+
+        Returns:
+            int: 新放入的任务数
+        """
+        raise NotImplementedError("子类必须实现put_tasks方法")
+
+    def lease(self, visibility_timeout: float, max_attempts: int = 3) -> Optional[Lease]:
+        """租借一个任务，visibility_timeout 秒内未确认时任务重新回到队列，队列为空时返回 None
+
+        已尝试 max_attempts 次的任务（如每次都因节点崩溃而租约过期）不再租借，直接放弃。
+        """
+        raise NotImplementedError("子类必须实现lease方法")
+
+    def ack(self, lease: Lease, results: List[Dict[str, Any]]) -> bool:
+        """确认任务完成，并把结果写入结果队列
+
+        Returns:
+            bool: 租约是否仍由当前节点持有；任务已被其他节点重新租借时返回 False，结果不会写入
+        """
+        raise NotImplementedError("子类必须实现ack方法")
+
+    def fail(self, lease: Lease, error: str, max_attempts: int) -> bool:
+        """任务失败，未达到最大尝试次数时立即放回队列
+
+        Returns:
+            bool: 是否放回了队列，达到最大尝试次数或租约已不由当前节点持有时返回 False
+        """
+        raise NotImplementedError("子类必须实现fail方法")
+
+    def reap(self, max_attempts: int) -> int:
+        """放弃租约已过期且已尝试 max_attempts 次的任务
+
+        这些任务本应在下一次 lease() 时被放弃，但持有最后一次租约的节点崩溃后可能不再有节点租借，
+        由协调节点定期调用，保证所有任务最终完成或被放弃。
+
+        Returns:
+            int: 本次放弃的任务数
+        """
+        raise NotImplementedError("子类必须实现reap方法")
+
+    def pop_results(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """取出最多 limit 条结果"""
+        raise NotImplementedError("子类必须实现pop_results方法")
+
+    def counts(self) -> Dict[str, int]:
+        """各状态的任务数：pending、leased、done、dead"""
+        raise NotImplementedError("子类必须实现counts方法")
+
+    def reserve_rate(self, host: str, rate: float, burst: int = 1) -> float:
+        """为主机预定一次请求，返回需要等待的秒数
+
+        使用 GCRA（通用信元速率算法）：只保存每个主机下一个理论到达时间，
+        令牌不足时允许透支，多个节点同时预定时依次排队。
+        """
+        raise NotImplementedError("子类必须实现reserve_rate方法")
+
+    def clear(self) -> None:
+        """清空任务、结果和限速状态"""
+        raise NotImplementedError("子类必须实现clear方法")
+
+    def close(self) -> None:
+        """释放队列占用的资源"""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """基于 SQLite 的任务队列，多个进程通过同一个数据库文件共享"""
+
+    def __init__(self, path: str):
+        """初始化任务队列
+
+        Args:
+            path: SQLite 数据库文件路径，":memory:" 表示只在当前进程内使用
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self._lock = threading.Lock()
+        # 手动管理事务，租借和限速需要 BEGIN IMMEDIATE 保证读写之间不被其他进程插入
+        self._conn = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL,
+                lease_until REAL NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT NOT NULL DEFAULT '',
+                seq INTEGER NOT NULL,
+                token TEXT NOT NULL DEFAULT ''
+            );
+            CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, seq);
+            CREATE TABLE IF NOT EXISTS results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS rates (
+                host TEXT PRIMARY KEY,
+                tat REAL NOT NULL
+            );
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        if "token" not in columns:
+            # 旧版本创建的队列没有租约令牌
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN token TEXT NOT NULL DEFAULT ''")
+
+    def _transaction(self, func, *args):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(*args)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def put_tasks(self, tasks: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        def put(rows):
+            seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM tasks").fetchone()[0]
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tasks (task_id, payload, state, seq) VALUES (?, ?, 'pending', ?)",
+                [(task_id, payload, seq + i) for i, (task_id, payload) in enumerate(rows, 1)],
+            )
+            return self._conn.total_changes - before
+
+        rows = [(task_id, json.dumps(payload, ensure_ascii=False)) for task_id, payload in tasks]
+        return self._transaction(put, rows)
+
+    def lease(self, visibility_timeout: float, max_attempts: int = 3) -> Optional[Lease]:
+        def lease():
+            now = time.time()
+            while True:
+                row = self._conn.execute(
+                    """
+                    SELECT task_id, payload, attempts FROM tasks
+                    WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?)
+                    ORDER BY seq LIMIT 1
+                    """,
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    return None
+                if row[2] < max_attempts:
+                    break
+                self._conn.execute(
+                    """
+                    UPDATE tasks SET state = 'dead', lease_until = 0, token = '', error = ?
+                    WHERE task_id = ?
+                    """,
+                    (f"尝试 {row[2]} 次后租约仍过期", row[0]),
+                )
+            token = uuid.uuid4().hex
+            self._conn.execute(
+                """
+                UPDATE tasks SET state = 'leased', lease_until = ?, attempts = attempts + 1, token = ?
+                WHERE task_id = ?
+                """,
+                (now + visibility_timeout, token, row[0]),
+            )
+            return Lease(row[0], json.loads(row[1]), row[2] + 1, token)
+
+        return self._transaction(lease)
+
+    def ack(self, lease: Lease, results: List[Dict[str, Any]]) -> bool:
+        def ack():
+            cursor = self._conn.execute(
+                """
+                UPDATE tasks SET state = 'done', token = ''
+                WHERE task_id = ? AND state = 'leased' AND token = ?
+                """,
+                (lease.task_id, lease.token),
+            )
+            if not cursor.rowcount:
+                return False
+            self._conn.executemany(
+                "INSERT INTO results (payload) VALUES (?)",
+                [(json.dumps(record, ensure_ascii=False),) for record in results],
+            )
+            return True
+
+        return self._transaction(ack)
+
+    def fail(self, lease: Lease, error: str, max_attempts: int) -> bool:
+        def fail():
+            row = self._conn.execute(
+                "SELECT attempts FROM tasks WHERE task_id = ? AND state = 'leased' AND token = ?",
+                (lease.task_id, lease.token),
+            ).fetchone()
+            if row is None:
+                return False
+            state = "pending" if row[0] < max_attempts else "dead"
+            self._conn.execute(
+                """
+                UPDATE tasks SET state = ?, lease_until = 0, token = '', error = ?
+                WHERE task_id = ?
+                """,
+                (state, error, lease.task_id),
+            )
+            return state == "pending"
+
+        return self._transaction(fail)
+
+    def reap(self, max_attempts: int) -> int:
+        def reap():
+            cursor = self._conn.execute(
+                """
+                UPDATE tasks SET state = 'dead', lease_until = 0, token = '',
+                    error = '尝试 ' || attempts || ' 次后租约仍过期'
+                WHERE state = 'leased' AND lease_until < ? AND attempts >= ?
+                """,
+                (time.time(), max_attempts),
+            )
+            return cursor.rowcount
+
+        return self._transaction(reap)
+
+    def pop_results(self, limit: int = 100) -> List[Dict[str, Any]]:
+        def pop():
+            rows = self._conn.execute(
+                "SELECT id, payload FROM results ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+            if rows:
+                self._conn.execute("DELETE FROM results WHERE id <= ?", (rows[-1][0],))
+            return [json.loads(row[1]) for row in rows]
+
+        return self._transaction(pop)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            now = time.time()
+            rows = self._conn.execute(
+                """
+                SELECT CASE WHEN state = 'leased' AND lease_until < ? THEN 'pending' ELSE state END,
+                       COUNT(*)
+                FROM tasks GROUP BY 1
+                """,
+                (now,),
+            ).fetchall()
+        counts = {"pending": 0, "leased": 0, "done": 0, "dead": 0}
+        counts.update(dict(rows))
+        return counts
+
+    def reserve_rate(self, host: str, rate: float, burst: int = 1) -> float:
+        if rate <= 0:
+            return 0.0
+        interval = 1 / rate
+
+        def reserve():
+            now = time.time()
+            row = self._conn.execute("SELECT tat FROM rates WHERE host = ?", (host,)).fetchone()
+            tat = max(row[0] if row else now, now) + interval
+            self._conn.execute(
+                "INSERT OR REPLACE INTO rates (host, tat) VALUES (?, ?)", (host, tat)
+            )
+            return max(0.0, tat - max(1, burst) * interval - now)
+
+        return self._transaction(reserve)
+
+    def clear(self) -> None:
+        def clear():
+            for table in ("tasks", "results", "rates"):
+                self._conn.execute(f"DELETE FROM {table}")
+
+        self._transaction(clear)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# 把过期的租约放回队列，再从队列中取出一个任务，整个过程在 Redis 中原子执行；
+# 尝试次数已达上限的任务记录为放弃。ARGV: 当前时间, 租约时长, 最大尝试次数, 租约令牌
+REDIS_LEASE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local max_attempts = tonumber(ARGV[3])
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now)
+for _, task_id in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], task_id)
+    redis.call('HDEL', KEYS[5], task_id)
+    redis.call('RPUSH', KEYS[1], task_id)
+end
+while true do
+    local task_id = redis.call('LPOP', KEYS[1])
+    if not task_id then
+        return nil
+    end
+    local attempts = tonumber(redis.call('HGET', KEYS[4], task_id) or '0')
+    if attempts < max_attempts then
+        redis.call('ZADD', KEYS[2], now + tonumber(ARGV[2]), task_id)
+        redis.call('HSET', KEYS[5], task_id, ARGV[4])
+        attempts = redis.call('HINCRBY', KEYS[4], task_id, 1)
+        return {task_id, redis.call('HGET', KEYS[3], task_id), attempts}
+    end
+    redis.call('HSET', KEYS[6], task_id, '尝试 ' .. attempts .. ' 次后租约仍过期')
+end
+"""
+
+# 确认任务：仍持有租约（令牌一致）时标记完成并写入结果。ARGV: 任务, 令牌, 结果...
+REDIS_ACK_SCRIPT = """
+if redis.call('HGET', KEYS[4], ARGV[1]) ~= ARGV[2] or redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('HDEL', KEYS[4], ARGV[1])
+redis.call('SADD', KEYS[2], ARGV[1])
+for i = 3, #ARGV do
+    redis.call('RPUSH', KEYS[3], ARGV[i])
+end
+return 1
+"""
+
+# 任务失败：仍持有租约时，未达到最大尝试次数则放回队列头部，否则记录为放弃。
+# ARGV: 任务, 令牌, 错误信息, 最大尝试次数
+REDIS_FAIL_SCRIPT = """
+if redis.call('HGET', KEYS[5], ARGV[1]) ~= ARGV[2] or redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('HDEL', KEYS[5], ARGV[1])
+local attempts = tonumber(redis.call('HGET', KEYS[3], ARGV[1]) or '0')
+if attempts < tonumber(ARGV[4]) then
+    redis.call('LPUSH', KEYS[2], ARGV[1])
+    return 1
+end
+redis.call('HSET', KEYS[4], ARGV[1], ARGV[3])
+return 0
+"""
+
+# 放弃租约已过期且尝试次数已达上限的任务。ARGV: 当前时间, 最大尝试次数
+REDIS_REAP_SCRIPT = """
+local count = 0
+for _, task_id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])) do
+    local attempts = tonumber(redis.call('HGET', KEYS[2], task_id) or '0')
+    if attempts >= tonumber(ARGV[2]) then
+        redis.call('ZREM', KEYS[1], task_id)
+        redis.call('HDEL', KEYS[3], task_id)
+        redis.call('HSET', KEYS[4], task_id, '尝试 ' .. attempts .. ' 次后租约仍过期')
+        count = count + 1
+    end
+end
+return count
+"""
+
+# GCRA 限速，ARGV: 当前时间, 请求间隔, 突发数
+REDIS_RATE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local tat = math.max(tonumber(redis.call('GET', KEYS[1]) or now), now) + interval
+local ttl = math.ceil((tat - now) * 1000) + 1000
+redis.call('SET', KEYS[1], tostring(tat), 'PX', ttl)
+return tostring(math.max(0, tat - tonumber(ARGV[3]) * interval - now))
+"""
+
+
+class RedisWorkQueue(WorkQueue):
+    """基于 Redis 的任务队列，多台机器连接同一个 Redis 共享任务
+
+    时间使用 Redis 服务器时间，各节点的时钟不需要同步。
+    """
+
+    def __init__(self, url: str, name: str = "spider"):
+        """初始化任务队列
+
+        Args:
+            url: Redis 地址，如 redis://localhost:6379/0
+            name: 队列名称，作为所有键的前缀
+        """
+        if redis is None:
+            raise RuntimeError("使用 Redis 任务队列需要安装 redis")
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.name = name
+        self.keys = {
+            kind: f"{name}:{kind}"
+            for kind in (
+                "pending", "leased", "payloads", "attempts", "tokens", "done", "dead", "results"
+            )
+        }
+        self._lease = self.client.register_script(REDIS_LEASE_SCRIPT)
+        self._ack = self.client.register_script(REDIS_ACK_SCRIPT)
+        self._fail = self.client.register_script(REDIS_FAIL_SCRIPT)
+        self._reap = self.client.register_script(REDIS_REAP_SCRIPT)
+        self._rate = self.client.register_script(REDIS_RATE_SCRIPT)
+
+    def now(self) -> float:
+        seconds, microseconds = self.client.time()
+        return seconds + microseconds / 1e6
+
+    def put_tasks(self, tasks: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        count = 0
+        for task_id, payload in tasks:
+            # HSETNX 保证同一个任务只放入一次，包括已完成的任务
+            if self.client.hsetnx(
+                self.keys["payloads"], task_id, json.dumps(payload, ensure_ascii=False)
+            ):
+                self.client.rpush(self.keys["pending"], task_id)
+                count += 1
+        return count
+
+    def lease(self, visibility_timeout: float, max_attempts: int = 3) -> Optional[Lease]:
+        token = uuid.uuid4().hex
+        result = self._lease(
+            keys=[
+                self.keys[kind]
+                for kind in ("pending", "leased", "payloads", "attempts", "tokens", "dead")
+            ],
+            args=[self.now(), visibility_timeout, max_attempts, token],
+        )
+        if not result:
+            return None
+        task_id, payload, attempts = result
+        return Lease(task_id, json.loads(payload), int(attempts), token)
+
+    def ack(self, lease: Lease, results: List[Dict[str, Any]]) -> bool:
+        return bool(
+            self._ack(
+                keys=[self.keys[kind] for kind in ("leased", "done", "results", "tokens")],
+                args=[
+                    lease.task_id,
+                    lease.token,
+                    *(json.dumps(record, ensure_ascii=False) for record in results),
+                ],
+            )
+        )
+
+    def fail(self, lease: Lease, error: str, max_attempts: int) -> bool:
+        return bool(
+            self._fail(
+                keys=[self.keys[kind] for kind in ("leased", "pending", "attempts", "dead", "tokens")],
+                args=[lease.task_id, lease.token, error, max_attempts],
+            )
+        )
+
+    def reap(self, max_attempts: int) -> int:
+        return int(
+            self._reap(
+                keys=[self.keys[kind] for kind in ("leased", "attempts", "tokens", "dead")],
+                args=[self.now(), max_attempts],
+            )
+        )
+
+    def pop_results(self, limit: int = 100) -> List[Dict[str, Any]]:
+        pipeline = self.client.pipeline()
+        pipeline.lrange(self.keys["results"], 0, limit - 1)
+        pipeline.ltrim(self.keys["results"], limit, -1)
+        records, _ = pipeline.execute()
+        return [json.loads(record) for record in records]
+
+    def counts(self) -> Dict[str, int]:
+        now = self.now()
+        pipeline = self.client.pipeline()
+        pipeline.llen(self.keys["pending"])
+        pipeline.zcount(self.keys["leased"], "-inf", now)
+        pipeline.zcard(self.keys["leased"])
+        pipeline.scard(self.keys["done"])
+        pipeline.hlen(self.keys["dead"])
+        pending, expired, leased, done, dead = pipeline.execute()
+        return {
+            "pending": pending + expired,
+            "leased": leased - expired,
+            "done": done,
+            "dead": dead,
+        }
+
+    def reserve_rate(self, host: str, rate: float, burst: int = 1) -> float:
+        if rate <= 0:
+            return 0.0
+        return float(
+            self._rate(keys=[f"{self.name}:rate:{host}"], args=[self.now(), 1 / rate, max(1, burst)])
+        )
+
+    def clear(self) -> None:
+        rate_keys = list(self.client.scan_iter(f"{self.name}:rate:*"))
+        self.client.delete(*self.keys.values(), *rate_keys)
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def create_work_queue(config: Dict[str, Any]) -> WorkQueue:
+    """根据 DISTRIBUTED_CONFIG 创建任务队列"""
+    distributed_config = config["DISTRIBUTED_CONFIG"]
+    backend = distributed_config.get("backend", "sqlite")
+    name = distributed_config.get("queue_name", "spider")
+    if backend == "redis":
+        return RedisWorkQueue(distributed_config.get("redis_url", "redis://localhost:6379/0"), name)
+    if backend == "sqlite":
+        return SQLiteWorkQueue(distributed_config.get("sqlite_file", f"data/{name}_queue.db"))
+    raise ValueError(f"未知的任务队列类型: {backend}")
@@ -6,6 +6,7 @@ import unittest
 import json
 import pandas as pd
 import logging
+from unittest import mock
 from spiders.base import BaseSpider
 
 class TestBaseSpider(unittest.TestCase):
@@ -39,6 +40,10 @@ class TestBaseSpider(unittest.TestCase):
                 "check_proxy": False,
                 "proxy_timeout": 5
             },
+            "FETCHER_CONFIG": {
+                # 只测试数据保存，不需要启动浏览器
+                "spiders": {"BaseSpider": "http"}
+            },
             "SPIDER_CONFIG": {
                 "max_pages": 1,
                 "timeout": 10,
@@ -70,6 +75,7 @@ class TestBaseSpider(unittest.TestCase):
         # 清理测试文件
         test_files = [
             os.path.join("data", "test_data.json"),
+            os.path.join("data", "test_data.jsonl"),
             os.path.join("data", "test_data.csv"),
             os.path.join("data", "test_data.xlsx"),
             "test_spider.log"
@@ -119,5 +125,40 @@ class TestBaseSpider(unittest.TestCase):
         df = pd.read_excel(excel_path)
         self.assertEqual(len(df), len(self.test_data), "Excel数据行数应该与测试数据一致")
 
+    def test_save_item_streaming(self):
+        """测试逐条追加保存后导出"""
+        self.spider.data = []
+        for record in self.test_data:
+            self.spider.save_item(record)
+
+        # 追加保存的数据不保留在内存中
+        self.assertEqual(self.spider.data, [])
+
+        self.spider.open_storage().sync()
+        jsonl_path = os.path.join("data", "test_data.jsonl")
+        with open(jsonl_path, "r", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(lines, self.test_data, "JSON Lines 数据应该与测试数据一致")
+
+        self.spider.save_data()
+        with open(os.path.join("data", "test_data.json"), "r", encoding="utf-8") as f:
+            saved_data = json.load(f)
+        self.assertEqual(saved_data, self.test_data, "导出的JSON数据应该与测试数据一致")
+
+    def test_excel_row_limit_boundary(self):
+        """测试记录数正好等于 Excel 行数上限时不警告，多一条时截断并警告"""
+        # 上限 4 行：表头 + 3 条记录
+        with mock.patch("spiders.storage.EXCEL_MAX_ROWS", 4), mock.patch(
+            "spiders.base.EXCEL_MAX_ROWS", 4
+        ):
+            with self.assertNoLogs("BaseSpider", level="WARNING"):
+                self.spider.save_data()
+            self.spider.data = [{"name": "测试4", "age": 35, "city": "深圳"}]
+            with self.assertLogs("BaseSpider", level="WARNING") as logs:
+                self.spider.save_data()
+        self.assertIn("记录数 4 超过 Excel 行数上限", logs.output[0])
+        df = pd.read_excel(os.path.join("data", "test_data.xlsx"))
+        self.assertEqual(len(df), 3, "超出上限的记录不应导出到Excel")
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+from spiders.blocking import RESOURCE_TYPE_PATTERNS, get_blocked_urls
+
+
+class TestBlocking(unittest.TestCase):
+    def test_per_spider_rules(self):
+        """测试资源类型展开，以及按爬虫追加和移除规则"""
+        config = {
+            "BROWSER_CONFIG": {
+                "blocking": {
+                    "enabled": True,
+                    "block": ["font", "*hm.baidu.com*"],
+                    "spiders": {"BossSpider": {"block": ["image"], "allow": ["font"]}},
+                }
+            }
+        }
+        self.assertEqual(
+            get_blocked_urls(config, "BiQuGeSpider"),
+            RESOURCE_TYPE_PATTERNS["font"] + ["*hm.baidu.com*"],
+        )
+        self.assertEqual(
+            get_blocked_urls(config, "BossSpider"),
+            ["*hm.baidu.com*"] + RESOURCE_TYPE_PATTERNS["image"],
+        )
+
+        config["BROWSER_CONFIG"]["blocking"]["enabled"] = False
+        self.assertEqual(get_blocked_urls(config, "BossSpider"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
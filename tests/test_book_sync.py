@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+import os
+import tempfile
+import unittest
+from benchmarks.fixture_site import FixtureSite
+from spiders.biquge import BiQuGeSpider
+from spiders.book_sync import BookSyncStore
+
+
+class SyncingBiQuGeSpider(BiQuGeSpider):
+    """只记录章节标题的笔趣阁爬虫，fail_urls 中的章节下载失败"""
+
+    fail_urls = set()
+
+    def get_chapter_content(self, chapter_url):
+        if chapter_url in self.fail_urls:
+            raise ConnectionError("连接被重置")
+        return super().get_chapter_content(chapter_url)
+
+    def handle_chapter(self, index, title, content, url=""):
+        if content is not None:
+            self.chapters.append(title)
+
+
+class TestBookSyncStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "book_sync.db")
+        self.store = BookSyncStore(self.path)
+        self.book_url = "https://example.com/book/list.html"
+        self.chapters = [(f"第{i}章", f"https://example.com/book/{i}.html") for i in range(1, 6)]
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_new_chapters(self):
+        """测试只返回上次同步之后新增的章节，重新打开后进度仍然存在"""
+        self.assertEqual(self.store.new_chapters(self.book_url, self.chapters), (0, self.chapters))
+
+        self.store.advance(self.book_url, 2, *reversed(self.chapters[2]))
+        self.store.close()
+        self.store = BookSyncStore(self.path)
+
+        start, chapters = self.store.new_chapters(self.book_url, self.chapters)
+        self.assertEqual(start, 3)
+        self.assertEqual(chapters, self.chapters[3:])
+
+    def test_locate_by_url(self):
+        """测试目录前面插入章节时按最后章节的地址定位"""
+        self.store.advance(self.book_url, 4, *reversed(self.chapters[4]))
+        chapters = [("序章", "https://example.com/book/0.html")] + self.chapters
+        chapters.append(("第6章", "https://example.com/book/6.html"))
+        self.assertEqual(self.store.new_chapters(self.book_url, chapters), (6, chapters[6:]))
+
+
+class TestBiQuGeSync(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.site = FixtureSite(chapters=5, chapter_size=100).start()
+        self.sync_file = os.path.join(self.temp_dir.name, "book_sync.db")
+        self.config = {
+            "SPIDER_CONFIG": {
+                "timeout": 10,
+                "max_pages": 1,
+                "checkpoint_file": os.path.join(self.temp_dir.name, "checkpoint.db"),
+            },
+            "BROWSER_CONFIG": {},
+            "PROXY_CONFIG": {"enabled": False},
+            "LOG_CONFIG": {
+                "level": "WARNING",
+                "format": "%(message)s",
+                "file": os.path.join(self.temp_dir.name, "spider.log"),
+            },
+            "METRICS_CONFIG": {"enabled": False},
+            "FETCHER_CONFIG": {
+                "cache": {
+                    "enabled": True,
+                    "dir": os.path.join(self.temp_dir.name, "cache"),
+                    "spiders": {"SyncingBiQuGeSpider": {"ttl": 3600}},
+                },
+            },
+            "BOOK_CONFIG": {
+                "book_urls": [self.site.book_url],
+                "sync_file": self.sync_file,
+                "async_enabled": False,
+                "concurrency": 1,
+            },
+        }
+
+    def tearDown(self):
+        self.site.stop()
+        for handler in logging.root.handlers[:]:
+            handler.close()
+            logging.root.removeHandler(handler)
+        self.temp_dir.cleanup()
+
+    def run_spider(self, fail_urls=()):
+        """运行一次同步，返回本次请求的章节数和成功处理的章节标题"""
+        spider = SyncingBiQuGeSpider(self.config)
+        spider.chapters = []
+        spider.fail_urls = set(fail_urls)
+        before = self.site.requests.get("chapter", 0)
+        spider.run()
+        return self.site.requests.get("chapter", 0) - before, spider.chapters
+
+    def synced_title(self):
+        """读取同步进度中最后一个章节的标题"""
+        store = BookSyncStore(self.sync_file)
+        try:
+            return store.get(self.site.book_url)["last_title"]
+        finally:
+            store.close()
+
+    def test_sync_fetches_only_new_chapters(self):
+        """测试目录未更新时只发送一次条件请求，新增章节后只下载新章节"""
+        fetched, chapters = self.run_spider()
+        self.assertEqual(fetched, 5)
+        self.assertEqual(chapters, [f"第{i}章 测试章节" for i in range(1, 6)])
+
+        fetched, chapters = self.run_spider()
+        self.assertEqual(fetched, 0)
+        self.assertEqual(chapters, [])
+        self.assertEqual(self.site.requests["not_modified"], 1)
+
+        self.site.chapters = 8
+        fetched, chapters = self.run_spider()
+        self.assertEqual(fetched, 3)
+        self.assertEqual(chapters, [f"第{i}章 测试章节" for i in range(6, 9)])
+        self.assertEqual(self.site.requests["book_list"], 3)
+
+    def test_failed_chapter_blocks_sync_position(self):
+        """测试某章下载失败后同步进度停在它之前，下次同步从失败的章节重新下载"""
+        self.run_spider()
+        self.assertEqual(self.synced_title(), "第5章 测试章节")
+
+        self.site.chapters = 8
+        fetched, chapters = self.run_spider(fail_urls={f"{self.site.url}/book/7.html"})
+        # 失败章节之后的章节照常下载，但进度只推进到第 6 章
+        self.assertEqual(fetched, 2)
+        self.assertEqual(chapters, ["第6章 测试章节", "第8章 测试章节"])
+        self.assertEqual(self.synced_title(), "第6章 测试章节")
+
+        # 第 8 章重新处理，正文来自响应缓存，只请求失败的第 7 章
+        fetched, chapters = self.run_spider()
+        self.assertEqual(fetched, 1)
+        self.assertEqual(chapters, ["第7章 测试章节", "第8章 测试章节"])
+        self.assertEqual(self.synced_title(), "第8章 测试章节")
+
+
+if __name__ == "__main__":
+    unittest.main()
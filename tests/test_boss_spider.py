@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from spiders.boss import BossSpider, crawl_task
+from spiders.checkpoint import CheckpointStore
+from spiders.storage import iter_records
+
+# 在子进程中保存 13 个职位后被强制杀死，最后 3 条还未同步到磁盘
+KILLED_SPIDER_SCRIPT = """
+import json, os, signal, sys
+from spiders.boss import BossSpider
+
+spider = BossSpider(json.loads(sys.argv[1]))
+for i in range(13):
+    spider.save_job({"职位": f"职位{i}", "链接": f"https://example.com/job/{i}"})
+os.kill(os.getpid(), signal.SIGKILL)
+"""
+
+
+class StubBossSpider(BossSpider):
+    """不启动浏览器，按 (关键词, 页码) 返回固定职位的 BOSS直聘爬虫"""
+
+    # (关键词, 页码) -> 职位编号，同一职位会出现在多个关键词下
+    jobs = {("Python", 1): [1, 2], ("Python", 2): [3], ("Java", 1): [2, 4], ("Java", 2): [3, 5]}
+    rates = []
+
+    def open_search_page(self, url):
+        self.rates.append(self.config["SPIDER_CONFIG"]["rate_limit"]["requests_per_second"])
+        self.url = url
+
+    def crawl_job_list(self, keyword, city):
+        ids = self.jobs[(keyword, self.current_page)]
+        for job_id in ids:
+            job_url = f"https://example.com/job/{job_id}"
+            if self.frontier.mark_seen(job_url):
+                self.save_job({"职位": f"职位{job_id}", "链接": job_url, "搜索关键词": keyword})
+        return len(ids)
+
+    def has_next_page(self):
+        return True
+
+
+class TestBossSpider(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.test_config = {
+            "SEARCH_CONFIG": {"keywords": ["Python"], "city": "深圳"},
+            "STORAGE_CONFIG": {
+                "json_file": "test_boss.json",
+                "csv_file": "test_boss.csv",
+                "excel_file": "test_boss.xlsx",
+                "csv_enabled": False,
+                "excel_enabled": False,
+            },
+            "LOG_CONFIG": {
+                "level": "INFO",
+                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+                "file": "test_spider.log",
+            },
+            "BROWSER_CONFIG": {
+                "headless": True,
+                "image_loading": True,
+                "window_size": {"width": 1920, "height": 1080},
+            },
+            "PROXY_CONFIG": {"enabled": False},
+            "SPIDER_CONFIG": {"max_pages": 1, "timeout": 10},
+        }
+        # 浏览器在首次访问 driver 时才启动，以下测试不会启动 Chrome
+        self.spider = BossSpider(self.test_config)
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        self.spider.cleanup()
+        for handler in logging.root.handlers[:]:
+            handler.close()
+            logging.root.removeHandler(handler)
+        if os.path.exists("test_spider.log"):
+            os.remove("test_spider.log")
+
+    def test_build_search_url(self):
+        """测试根据关键词和城市构建搜索地址"""
+        self.assertEqual(
+            self.spider.build_search_url("Java", "北京"),
+            "https://www.zhipin.com/web/geek/job?query=Java&city=101010100",
+        )
+        self.assertEqual(
+            self.spider.build_search_url("Java", "北京", page=3),
+            "https://www.zhipin.com/web/geek/job?query=Java&city=101010100&page=3",
+        )
+
+    def test_parse_api_job(self):
+        """测试接口职位数据转换为与页面解析一致的字段"""
+        job = {
+            "jobName": "Python开发工程师",
+            "salaryDesc": "20-30K",
+            "brandName": "某科技公司",
+            "cityName": "深圳",
+            "areaDistrict": "南山区",
+            "businessDistrict": "科技园",
+            "jobLabels": ["3-5年", "本科"],
+            "brandIndustry": "互联网",
+            "brandStageName": "",
+            "brandScaleName": "100-499人",
+            "encryptJobId": "abc123",
+        }
+        job_info = self.spider.parse_api_job(job, "Python", "深圳")
+        self.assertEqual(job_info["地点"], "深圳·南山区·科技园")
+        self.assertEqual(job_info["要求"], "3-5年\n本科")
+        self.assertEqual(job_info["公司类型"], "互联网\n100-499人")
+        self.assertEqual(job_info["链接"], "https://www.zhipin.com/job_detail/abc123.html")
+        self.assertEqual(job_info["搜索关键词"], "Python")
+
+    def test_extract_fields_defaults(self):
+        """测试批量提取结果中缺失的文本字段为 N/A，缺失的属性字段为空字符串"""
+
+        class FakeDriver:
+            def execute_script(self, script, container_selector, fields):
+                self.fields = fields
+                return [{"职位": "Python开发工程师", "薪资": None, "链接": None}]
+
+            def quit(self):
+                pass
+
+        fake_driver = FakeDriver()
+        self.spider._driver = fake_driver
+        cards = self.spider.extract_fields(
+            ".job-card-wrapper",
+            {"职位": ".job-name", "薪资": ".salary", "链接": (".job-card-left", "href")},
+        )
+        self.assertEqual(
+            cards, [{"职位": "Python开发工程师", "薪资": "N/A", "链接": ""}]
+        )
+        self.assertEqual(fake_driver.fields["链接"], [".job-card-left", "href"])
+        self.assertEqual(fake_driver.fields["职位"], [".job-name", None])
+
+    def test_crawl_pages_dom_retries_failed_page(self):
+        """测试页面加载失败时返回未完成，再次爬取同一页时会重新打开该页"""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.spider.config["SPIDER_CONFIG"]["checkpoint_file"] = os.path.join(
+            temp_dir.name, "checkpoint.db"
+        )
+        opened = []
+
+        def open_search_page(url):
+            opened.append(url)
+            if len(opened) == 1:
+                raise RuntimeError("页面加载失败")
+
+        self.spider.open_search_page = open_search_page
+        self.spider.crawl_job_list = lambda keyword, city: 15
+        self.spider.has_next_page = lambda: True
+        url = self.spider.build_search_url("Python", "深圳", page=2)
+        self.assertFalse(self.spider.crawl_pages_dom("Python", "深圳", [2]))
+        self.assertTrue(self.spider.crawl_pages_dom("Python", "深圳", [2]))
+        self.assertEqual(opened, [url, url])
+    def test_open_search_page_metrics(self):
+        """测试浏览器打开搜索页时记录请求数和 fetch 耗时"""
+
+        class FakeDriver:
+            current_url = "https://www.zhipin.com/web/geek/job?query=Python"
+
+            def get(self, url):
+                self.url = url
+
+            def quit(self):
+                pass
+
+        self.spider._driver = FakeDriver()
+        self.spider.wait_for_page_load = lambda: True
+        self.spider.open_search_page(FakeDriver.current_url)
+        summary = self.spider.metrics.summary()
+        self.assertEqual(summary["counters"]["requests"], 1)
+        self.assertEqual(summary["stages"]["fetch"]["count"], 1)
+
+    def parallel_config(self, temp_dir):
+        return {
+            **self.test_config,
+            "SEARCH_CONFIG": {"keywords": ["Python", "Java"], "city": "深圳", "mode": "dom"},
+            "STORAGE_CONFIG": {
+                **self.test_config["STORAGE_CONFIG"],
+                "jsonl_file": os.path.join(temp_dir, "jobs.jsonl"),
+            },
+            "LOG_CONFIG": {
+                **self.test_config["LOG_CONFIG"],
+                "file": os.path.join(temp_dir, "spider.log"),
+            },
+            "SPIDER_CONFIG": {
+                "max_pages": 2,
+                "timeout": 10,
+                "rate_limit": {"requests_per_second": 4},
+                "checkpoint_file": os.path.join(temp_dir, "checkpoint.db"),
+            },
+            "PARALLEL_CONFIG": {"enabled": True, "workers": 2, "split_pages": True},
+        }
+
+    def test_crawl_task_returns_records(self):
+        """测试工作进程任务返回爬取的数据、完成状态和运行指标，不直接保存"""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        config = self.parallel_config(temp_dir.name)
+        records, finished, metrics = crawl_task(StubBossSpider, config, "Java", "深圳", [1, 2])
+        self.assertTrue(finished)
+        self.assertEqual([record["链接"][-1] for record in records], ["2", "4", "3", "5"])
+        self.assertFalse(os.path.exists(config["STORAGE_CONFIG"]["jsonl_file"]))
+        self.assertIn("started_at", metrics.summary())
+
+    def test_run_parallel_merges_and_deduplicates(self):
+        """测试按页拆分的并行任务合并结果时去重，速率平均分给各进程，并记录各页和关键词的进度"""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        config = self.parallel_config(temp_dir.name)
+        StubBossSpider.rates = []
+        spider = StubBossSpider(config)
+        # 用线程池代替进程池，在当前进程中运行 crawl_task
+        with mock.patch("spiders.boss.ProcessPoolExecutor", ThreadPoolExecutor):
+            spider.run_parallel()
+        spider.cleanup()
+
+        self.assertEqual(StubBossSpider.rates, [2, 2, 2, 2])
+        records = list(iter_records(config["STORAGE_CONFIG"]["jsonl_file"]))
+        self.assertEqual(
+            sorted(record["链接"] for record in records),
+            [f"https://example.com/job/{job_id}" for job_id in range(1, 6)],
+        )
+        checkpoint = CheckpointStore(config["SPIDER_CONFIG"]["checkpoint_file"])
+        self.addCleanup(checkpoint.close)
+        for keyword in ("Python", "Java"):
+            self.assertTrue(checkpoint.is_done("StubBossSpider:keyword", f"{keyword}|深圳"))
+            for page in (1, 2):
+                self.assertTrue(checkpoint.is_done("StubBossSpider:page", f"{keyword}|深圳|{page}"))
+
+    @unittest.skipUnless(hasattr(signal, "SIGKILL"), "需要 SIGKILL")
+    def test_progress_not_ahead_of_data_after_kill(self):
+        """测试进程在写入和同步之间被杀死时，记录为完成的职位都已写入 JSON Lines"""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        jsonl_file = os.path.join(temp_dir.name, "jobs.jsonl")
+        checkpoint_file = os.path.join(temp_dir.name, "checkpoint.db")
+        config = {
+            **self.test_config,
+            "STORAGE_CONFIG": {
+                **self.test_config["STORAGE_CONFIG"],
+                "jsonl_file": jsonl_file,
+                "fsync_interval": 10,
+            },
+            "LOG_CONFIG": {
+                **self.test_config["LOG_CONFIG"],
+                "file": os.path.join(temp_dir.name, "spider.log"),
+            },
+            "SPIDER_CONFIG": {
+                **self.test_config["SPIDER_CONFIG"],
+                "checkpoint_file": checkpoint_file,
+            },
+        }
+        result = subprocess.run(
+            [sys.executable, "-c", KILLED_SPIDER_SCRIPT, json.dumps(config)],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True,
+        )
+        self.assertEqual(result.returncode, -signal.SIGKILL, result.stderr.decode())
+
+        saved = {record["链接"] for record in iter_records(jsonl_file)}
+        checkpoint = CheckpointStore(checkpoint_file)
+        done = {
+            f"https://example.com/job/{i}"
+            for i in range(13)
+            if checkpoint.is_done("BossSpider:job", f"https://example.com/job/{i}")
+        }
+        checkpoint.close()
+        self.assertEqual(len(saved), 10)
+        self.assertEqual(done, saved)
+
+if __name__ == "__main__":
+    unittest.main()
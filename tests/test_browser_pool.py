@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+from spiders.browser_pool import BrowserPool
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current = handle
+
+
+class FakeDriver:
+    """模拟 WebDriver，只实现浏览器池用到的方法"""
+
+    def __init__(self):
+        self.window_handles = ["main", "detail"]
+        self.current = "main"
+        self.cookies_cleared = False
+        self.quit_called = False
+        self.switch_to = FakeSwitchTo(self)
+
+    def close(self):
+        self.window_handles.remove(self.current)
+
+    def delete_all_cookies(self):
+        self.cookies_cleared = True
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+class TestBrowserPool(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+        self.pool = BrowserPool(size=2, max_pages=10)
+
+    def factory(self):
+        driver = FakeDriver()
+        self.created.append(driver)
+        return driver
+
+    def test_prewarm_and_reuse(self):
+        """测试预启动后重复租借同一批浏览器"""
+        self.pool.prewarm(self.factory)
+        self.assertEqual(len(self.created), 2)
+
+        driver = self.pool.acquire(self.factory)
+        self.pool.release(driver, pages=1)
+        self.assertIs(self.pool.acquire(self.factory), driver)
+        self.assertEqual(len(self.created), 2)
+
+    def test_reset_on_release(self):
+        """测试归还时关闭多余窗口并清空 Cookie"""
+        driver = self.pool.acquire(self.factory)
+        self.pool.release(driver)
+        self.assertEqual(driver.window_handles, ["main"])
+        self.assertTrue(driver.cookies_cleared)
+        self.assertFalse(driver.quit_called)
+
+    def test_recycle_after_max_pages(self):
+        """测试加载页数超过阈值后回收浏览器"""
+        driver = self.pool.acquire(self.factory)
+        self.pool.release(driver, pages=6)
+        self.assertIs(self.pool.acquire(self.factory), driver)
+        self.pool.release(driver, pages=6)
+        self.assertTrue(driver.quit_called)
+        self.assertIsNot(self.pool.acquire(self.factory), driver)
+
+    def test_acquire_timeout_when_exhausted(self):
+        """测试浏览器全部被租出时等待超时"""
+        self.pool.acquire(self.factory)
+        self.pool.acquire(self.factory)
+        with self.assertRaises(TimeoutError):
+            self.pool.acquire(self.factory, timeout=0.1)
+
+    def test_close(self):
+        """测试关闭浏览器池后退出空闲浏览器"""
+        self.pool.prewarm(self.factory)
+        self.pool.close()
+        self.assertTrue(all(driver.quit_called for driver in self.created))
+        with self.assertRaises(RuntimeError):
+            self.pool.acquire(self.factory)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from spiders.chapter_store import ChapterStore
+
+
+class TestChapterStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, "books")
+        self.store = ChapterStore(self.directory, chunk_bytes=4096)
+        self.book_url = "https://example.com/book/list.html"
+        self.chapters = [
+            (i, f"第{i + 1}章", f"第{i + 1}章的正文。" * 200) for i in range(10)
+        ]
+        for index, title, content in self.chapters:
+            self.store.write(self.book_url, index, title, content)
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_random_access(self):
+        """测试重新打开后按章节序号随机读取，数据文件经过压缩"""
+        self.store.close()
+        self.store = ChapterStore(self.directory)
+        self.assertEqual(self.store.read(self.book_url, 7), self.chapters[7][1:])
+        self.assertEqual(self.store.read(self.book_url, 2), self.chapters[2][1:])
+        self.assertIsNone(self.store.read(self.book_url, 10))
+
+        raw_size = sum(len(content.encode("utf-8")) for *_, content in self.chapters)
+        self.assertLess(os.path.getsize(self.store.data_file(self.book_url)), raw_size / 5)
+
+    def test_export_txt(self):
+        """测试按章节顺序导出 txt，重复保存的章节以最后一次为准"""
+        self.store.write(self.book_url, 0, "第1章", "修改后的正文")
+        path = os.path.join(self.temp_dir.name, "book.txt")
+        self.assertEqual(self.store.export_txt(self.book_url, path), 10)
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        self.assertTrue(text.startswith("第1章\n\n修改后的正文\n\n第2章"))
+        self.assertTrue(text.endswith(f"{self.chapters[-1][2]}\n\n"))
+
+    def test_unchanged_chapter_skipped(self):
+        """测试重复保存未变化的章节时跳过，数据文件不再增长"""
+        self.store.flush()
+        size = os.path.getsize(self.store.data_file(self.book_url))
+        for index, title, content in self.chapters:
+            self.assertFalse(self.store.write(self.book_url, index, title, content))
+        self.store.flush()
+        self.assertEqual(os.path.getsize(self.store.data_file(self.book_url)), size)
+        self.assertTrue(self.store.write(self.book_url, 3, "第4章（修订）", self.chapters[3][2]))
+        self.assertFalse(self.store.write(self.book_url, 3, "第4章（修订）", self.chapters[3][2]))
+        self.assertEqual(self.store.read(self.book_url, 3)[0], "第4章（修订）")
+
+
+if __name__ == "__main__":
+    unittest.main()
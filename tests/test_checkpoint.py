@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from spiders.checkpoint import CheckpointStore
+
+
+class TestCheckpointStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "checkpoint.db")
+        self.store = CheckpointStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_mark_done_persists(self):
+        """测试进度在重新打开后仍然存在"""
+        self.store.mark_done("BossSpider:job", "https://example.com/1")
+        self.store.close()
+
+        self.store = CheckpointStore(self.path)
+        self.assertTrue(self.store.is_done("BossSpider:job", "https://example.com/1"))
+        self.assertFalse(self.store.is_done("BossSpider:job", "https://example.com/2"))
+
+    def test_clear_by_prefix(self):
+        """测试只清除指定爬虫的进度"""
+        self.store.mark_done("BossSpider:page", "Python|深圳|1")
+        self.store.mark_done("BiQuGeSpider:chapter", "https://example.com/1.html")
+
+        self.store.clear("BossSpider:")
+        self.assertEqual(self.store.done_keys("BossSpider:page"), set())
+        self.assertEqual(
+            self.store.done_keys("BiQuGeSpider:chapter"), {"https://example.com/1.html"}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
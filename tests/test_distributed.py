@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+import os
+import tempfile
+import threading
+import time
+import unittest
+from spiders.distributed import run_coordinator, run_worker
+from spiders.frontier import URLFrontier
+from spiders.metrics import Metrics
+from spiders.work_queue import SQLiteWorkQueue
+
+
+class StubSpider:
+    """第一次爬取时在职位标记为已见后失败，之后正常爬完的爬虫"""
+
+    def __init__(self):
+        self.config = {
+            "SPIDER_CONFIG": {},
+            "DISTRIBUTED_CONFIG": {
+                "visibility_timeout": 60,
+                "max_attempts": 3,
+                "poll_interval": 0,
+                "idle_timeout": 0,
+            },
+        }
+        self.logger = logging.getLogger("test_distributed")
+        self.metrics = Metrics()
+        self.frontier = URLFrontier()
+        self.data = []
+        self.autosave = True
+        self.calls = []
+
+    def crawl_keyword(self, keyword, city, pages):
+        self.calls.append(pages)
+        job_url = f"https://example.com/job/{pages[0]}"
+        if self.frontier.mark_seen(job_url):
+            self.data.append({"职位": keyword, "链接": job_url})
+        if len(self.calls) == 1:
+            raise RuntimeError("页面加载失败")
+        return True
+
+    def write_metrics(self):
+        pass
+
+    def cleanup(self):
+        pass
+
+
+class CoordinatorSpider(StubSpider):
+    """只拆分任务和保存结果的协调节点爬虫"""
+
+    saved = False
+
+    def get_tasks(self):
+        return [("Python", "深圳")]
+
+    def get_pages(self):
+        return [1]
+
+    def save_job(self, record):
+        self.data.append(record)
+
+    def save_data(self):
+        self.saved = True
+
+
+class TestDistributed(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = os.path.join(temp_dir.name, "queue.db")
+
+    def test_failed_task_retried_with_fresh_state(self):
+        """测试任务失败后放回队列，重新租借时重新爬取并确认，结果不丢失"""
+        queue = SQLiteWorkQueue(self.path)
+        queue.put_tasks([("Python|深圳|1", {"keyword": "Python", "city": "深圳", "page": 1})])
+        queue.close()
+        spider = StubSpider()
+        # run_worker 结束时会关闭队列
+        run_worker(spider, SQLiteWorkQueue(self.path))
+
+        queue = SQLiteWorkQueue(self.path)
+        self.addCleanup(queue.close)
+
+        self.assertEqual(spider.calls, [[1], [1]])
+        self.assertEqual(queue.counts(), {"pending": 0, "leased": 0, "done": 1, "dead": 0})
+        self.assertEqual(
+            queue.pop_results(), [{"职位": "Python", "链接": "https://example.com/job/1"}]
+        )
+        self.assertEqual(spider.metrics.counters, {"tasks_failed": 1, "tasks_done": 1})
+        self.assertFalse(spider.autosave)
+
+    def test_coordinator_gives_up_on_crashed_final_attempt(self):
+        """测试最后一次租约过期且没有节点再租借时，协调节点放弃该任务并结束"""
+        queue = SQLiteWorkQueue(self.path)
+        queue.put_tasks([("Python|深圳|1", {"keyword": "Python", "city": "深圳", "page": 1})])
+        # 持有最后一次租约的工作节点崩溃，之后不再有节点调用 lease()
+        queue.lease(0.01, max_attempts=1)
+        queue.close()
+        time.sleep(0.02)
+
+        spider = CoordinatorSpider()
+        spider.config["DISTRIBUTED_CONFIG"]["max_attempts"] = 1
+        thread = threading.Thread(
+            target=run_coordinator, args=(spider, SQLiteWorkQueue(self.path), True), daemon=True
+        )
+        thread.start()
+        thread.join(5)
+        self.assertFalse(thread.is_alive(), "协调节点应该在任务被放弃后结束")
+        self.assertTrue(spider.saved)
+
+        queue = SQLiteWorkQueue(self.path)
+        self.addCleanup(queue.close)
+        self.assertEqual(queue.counts(), {"pending": 0, "leased": 0, "done": 0, "dead": 1})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+from spiders.frontier import BloomFilter, URLFrontier
+
+
+class TestURLFrontier(unittest.TestCase):
+    def test_priority_order(self):
+        """测试按优先级取出，相同优先级按入队顺序"""
+        frontier = URLFrontier()
+        frontier.push("https://example.com/3", priority=3)
+        frontier.push("https://example.com/1", priority=1, data="第一章")
+        frontier.push("https://example.com/1b", priority=1)
+
+        self.assertEqual(frontier.pop(), ("https://example.com/1", "第一章"))
+        self.assertEqual(frontier.pop()[0], "https://example.com/1b")
+        self.assertEqual(frontier.pop()[0], "https://example.com/3")
+        self.assertIsNone(frontier.pop())
+
+    def test_deduplicate(self):
+        """测试重复 URL（忽略锚点）不会再次入队"""
+        for frontier in (URLFrontier(), URLFrontier(use_bloom_filter=True, capacity=1000)):
+            self.assertTrue(frontier.push("https://example.com/job/1"))
+            self.assertFalse(frontier.push("https://example.com/job/1#detail"))
+            self.assertFalse(frontier.mark_seen("https://example.com/job/1"))
+            self.assertEqual(len(frontier), 1)
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_false_positive_rate(self):
+        """测试误判率接近配置值且不会漏判"""
+        bloom = BloomFilter(capacity=10000, error_rate=0.01)
+        for i in range(10000):
+            bloom.add(f"https://example.com/{i}")
+        self.assertTrue(all(f"https://example.com/{i}" in bloom for i in range(10000)))
+
+        false_positives = sum(f"https://other.com/{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives / 10000, 0.03)
+
+
+if __name__ == "__main__":
+    unittest.main()
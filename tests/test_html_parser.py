@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+from utils.html_parser import parse_html
+
+
+class TestHtmlParser(unittest.TestCase):
+    def setUp(self):
+        """构造与笔趣阁目录页、章节页结构相同的 HTML"""
+        self.html = """
+        <div class="book_last">
+          <dl>
+            <dt>最新章节</dt>
+            <dd><a href="/html/1/1.html">第一章</a>
+            <dd><a href="/html/1/2.html">第二章</a>
+          </dl>
+        </div>
+        <div id="chaptercontent">第一段<br/><br>&nbsp;&nbsp;第二段<script>var a = 1;</script></div>
+        """
+
+    def test_select_descendant(self):
+        """测试后代选择器与隐式闭合的 dd 标签"""
+        links = parse_html(self.html).select(".book_last dl dd a")
+        self.assertEqual([link.text for link in links], ["第一章", "第二章"])
+        self.assertEqual(links[1].get("href"), "/html/1/2.html")
+
+    def test_text_by_id(self):
+        """测试按 id 获取正文，<br> 转为换行并忽略脚本"""
+        content = parse_html(self.html).select_one("#chaptercontent")
+        self.assertEqual(content.text, "第一段\n第二段")
+
+    def test_select_one_missing(self):
+        """测试未找到节点时返回 None"""
+        self.assertIsNone(parse_html(self.html).select_one("#missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+import os
+import sqlite3
+import tempfile
+import unittest
+from benchmarks.fixture_site import FixtureSite
+from spiders.biquge import BiQuGeSpider
+from spiders.http_cache import ResponseCache
+
+
+class CountingBiQuGeSpider(BiQuGeSpider):
+    """只记录章节标题、不输出正文的笔趣阁爬虫"""
+
+    def handle_chapter(self, index, title, content, url=""):
+        self.chapters.append(title)
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(os.path.join(self.temp_dir.name, "cache"), max_bytes=100, ttl=60)
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_put_and_get(self):
+        """测试保存后读取，内容相同的页面只保存一份正文"""
+        self.cache.put("https://example.com/1", "正文".encode("utf-8"), encoding="utf-8", etag='"a"')
+        self.cache.put("https://example.com/2", "正文".encode("utf-8"), encoding="utf-8")
+        cached = self.cache.get("https://example.com/1")
+        self.assertEqual(cached.text, "正文")
+        self.assertEqual(cached.conditional_headers(), {"If-None-Match": '"a"'})
+        self.assertEqual(self.cache.total_bytes, len("正文".encode("utf-8")))
+        self.assertIsNotNone(self.cache.get_fresh("https://example.com/2"))
+        self.assertIsNone(self.cache.get_fresh("https://example.com/2", max_age=0))
+        self.assertIsNone(self.cache.get("https://example.com/3"))
+
+    def test_lru_eviction(self):
+        """测试超过大小上限时淘汰最久未访问的页面"""
+        self.cache.put("https://example.com/1", b"1" * 40)
+        self.cache.put("https://example.com/2", b"2" * 40)
+        self.cache.get("https://example.com/1")
+        self.cache.put("https://example.com/3", b"3" * 40)
+        self.assertIsNotNone(self.cache.get("https://example.com/1"))
+        self.assertIsNone(self.cache.get("https://example.com/2"))
+        self.assertLessEqual(self.cache.total_bytes, 100)
+
+    def test_access_time_batched(self):
+        """测试读取缓存时不立即写入访问时间，关闭时批量写入"""
+        self.cache.put("https://example.com/1", b"1")
+        index_path = os.path.join(self.cache.directory, "index.db")
+
+        def accessed_at():
+            conn = sqlite3.connect(index_path)
+            try:
+                return conn.execute("SELECT accessed_at FROM responses").fetchone()[0]
+            finally:
+                conn.close()
+
+        saved_at = accessed_at()
+        self.cache.get("https://example.com/1")
+        self.assertEqual(accessed_at(), saved_at)
+        self.cache.close()
+        self.assertGreaterEqual(accessed_at(), saved_at)
+        self.assertEqual(self.cache._accessed, {})
+        self.cache = ResponseCache(self.cache.directory)
+
+
+class TestBiQuGeCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.site = FixtureSite(chapters=5, chapter_size=100).start()
+        self.config = {
+            "SPIDER_CONFIG": {
+                "timeout": 10,
+                "max_pages": 1,
+                "checkpoint_file": os.path.join(self.temp_dir.name, "checkpoint.db"),
+            },
+            "BROWSER_CONFIG": {},
+            "PROXY_CONFIG": {"enabled": False},
+            "LOG_CONFIG": {
+                "level": "WARNING",
+                "format": "%(message)s",
+                "file": os.path.join(self.temp_dir.name, "spider.log"),
+            },
+            "METRICS_CONFIG": {"enabled": False},
+            "FETCHER_CONFIG": {
+                "cache": {
+                    "enabled": True,
+                    "dir": os.path.join(self.temp_dir.name, "cache"),
+                    "spiders": {"CountingBiQuGeSpider": {"ttl": 3600}},
+                },
+            },
+            "BOOK_CONFIG": {"book_url": self.site.book_url, "async_enabled": False, "concurrency": 1},
+        }
+
+    def tearDown(self):
+        self.site.stop()
+        for handler in logging.root.handlers[:]:
+            handler.close()
+            logging.root.removeHandler(handler)
+        self.temp_dir.cleanup()
+
+    def run_spider(self):
+        spider = CountingBiQuGeSpider(self.config)
+        spider.chapters = []
+        spider.run()
+        return spider
+
+    def test_rerun_fetches_only_new_chapters(self):
+        """测试书籍新增章节后重新运行只请求新章节，目录页通过条件请求验证"""
+        self.run_spider()
+        self.assertEqual(self.site.requests["chapter"], 5)
+
+        spider = self.run_spider()
+        self.assertEqual(len(spider.chapters), 5)
+        self.assertEqual(self.site.requests["chapter"], 5)
+        self.assertEqual(self.site.requests["not_modified"], 1)
+
+        self.site.chapters = 10
+        spider = self.run_spider()
+        self.assertEqual(len(spider.chapters), 10)
+        self.assertEqual(self.site.requests["chapter"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
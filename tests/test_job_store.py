@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from spiders.job_store import CHANGED, NEW, UNCHANGED, JobStore, job_identity
+
+
+class TestJobStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "jobs.db")
+        self.store = JobStore(self.path, batch_size=2)
+        self.job = {
+            "职位": "Python 工程师",
+            "薪资": "15-30K",
+            "公司": "测试公司",
+            "地点": "深圳·南山区",
+            "链接": "https://www.zhipin.com/job_detail/abc123.html?lid=1&securityId=x",
+            "详细要求": "负责后端开发",
+        }
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_identity(self):
+        """测试职位标识忽略链接中的查询参数，没有链接时使用公司 + 职位 + 地点"""
+        other = dict(self.job, 链接="https://www.zhipin.com/job_detail/abc123.html?lid=2")
+        self.assertEqual(job_identity(self.job), job_identity(other))
+        self.assertEqual(job_identity(dict(self.job, 链接="")), "key:测试公司|Python 工程师|深圳·南山区")
+
+    def test_upsert_across_runs(self):
+        """测试重新打开后识别未变化和变化的职位，首次发现时间保持不变"""
+        self.assertEqual(self.store.upsert(self.job), NEW)
+        self.store.close()
+
+        self.store = JobStore(self.path)
+        first_seen = self.store.get(job_identity(self.job))["first_seen"]
+        card = {key: value for key, value in self.job.items() if key != "详细要求"}
+        self.assertEqual(self.store.find_unchanged(card)["详细要求"], "负责后端开发")
+        self.assertEqual(self.store.upsert(self.job), UNCHANGED)
+
+        raised = dict(card, 薪资="20-35K")
+        self.assertIsNone(self.store.find_unchanged(raised))
+        self.assertEqual(self.store.upsert(raised), CHANGED)
+        self.store.flush()
+
+        stored = self.store.get(job_identity(self.job))
+        self.assertEqual(stored["first_seen"], first_seen)
+        self.assertGreaterEqual(stored["last_seen"], first_seen)
+        self.assertEqual(stored["data"]["薪资"], "20-35K")
+        self.assertEqual(self.store.new_jobs(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pickle
+import unittest
+from spiders.metrics import Histogram, Metrics
+
+
+class TestMetrics(unittest.TestCase):
+    def test_histogram(self):
+        """测试直方图分桶计数与汇总"""
+        histogram = Histogram(buckets=(0.1, 1))
+        for value in (0.05, 0.5, 0.5, 3):
+            histogram.observe(value)
+        self.assertEqual(histogram.bucket_counts, [1, 2, 1])
+        summary = histogram.summary()
+        self.assertEqual(summary["count"], 4)
+        self.assertAlmostEqual(summary["sum"], 4.05)
+        self.assertEqual(summary["max"], 3)
+        self.assertEqual(summary["p50"], 1)
+
+    def test_timer_counts_errors(self):
+        """测试计时器在异常时仍记录耗时并计入错误数"""
+        metrics = Metrics()
+        with metrics.timer("fetch"):
+            pass
+        with self.assertRaises(ValueError):
+            with metrics.timer("fetch"):
+                raise ValueError()
+        summary = metrics.summary()
+        self.assertEqual(summary["stages"]["fetch"]["count"], 2)
+        self.assertEqual(summary["counters"], {"fetch_errors": 1})
+
+    def test_prometheus_format(self):
+        """测试 Prometheus 文本格式的计数器和累计分桶"""
+        metrics = Metrics(buckets=(1,))
+        metrics.inc("items", 3)
+        metrics.observe("save", 0.5)
+        metrics.observe("save", 2)
+        text = metrics.to_prometheus(labels={"spider": "Test"})
+        self.assertIn('spider_items_total{spider="Test"} 3', text)
+        self.assertIn('spider_stage_seconds_bucket{spider="Test",stage="save",le="1"} 1', text)
+        self.assertIn('spider_stage_seconds_bucket{spider="Test",stage="save",le="+Inf"} 2', text)
+        self.assertIn('spider_stage_seconds_count{spider="Test",stage="save"} 2', text)
+
+    def test_merge_worker_metrics(self):
+        """测试合并序列化传回的工作进程指标"""
+        metrics = Metrics(buckets=(1,))
+        metrics.inc("items", 2)
+        metrics.observe("fetch", 0.5)
+        worker = Metrics(buckets=(1,))
+        worker.inc("items", 3)
+        worker.inc("captcha")
+        worker.observe("fetch", 2)
+        worker.observe("save", 0.1)
+        metrics.merge(pickle.loads(pickle.dumps(worker)))
+        summary = metrics.summary()
+        self.assertEqual(summary["counters"], {"items": 5, "captcha": 1})
+        self.assertEqual(summary["stages"]["fetch"]["count"], 2)
+        self.assertEqual(summary["stages"]["fetch"]["min"], 0.5)
+        self.assertEqual(summary["stages"]["fetch"]["max"], 2)
+        self.assertEqual(summary["stages"]["save"]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+from spiders.proxy_pool import ProxyPool
+
+
+class TestProxyPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = ProxyPool(["1.1.1.1:80", "2.2.2.2:80", "1.1.1.1:80"], max_failures=2)
+
+    def test_deduplicate_on_load(self):
+        """测试重复的代理只保留一个"""
+        self.assertEqual(len(self.pool), 2)
+
+    def test_evict_after_consecutive_failures(self):
+        """测试连续失败达到上限后剔除代理，成功会重置连续失败次数"""
+        self.pool.report_failure("1.1.1.1:80")
+        self.pool.report_success("1.1.1.1:80", latency=0.1)
+        self.pool.report_failure("1.1.1.1:80")
+        self.assertEqual(len(self.pool), 2)
+
+        self.pool.report_failure("1.1.1.1:80")
+        self.assertEqual(len(self.pool), 1)
+        self.assertEqual({self.pool.get() for _ in range(20)}, {"2.2.2.2:80"})
+
+    def test_banned_proxy_evicted_immediately(self):
+        """测试被封禁的代理立即剔除，全部剔除后返回空字符串"""
+        self.pool.report_failure("1.1.1.1:80", banned=True)
+        self.pool.report_failure("2.2.2.2:80", banned=True)
+        self.assertEqual(self.pool.get(), "")
+
+    def test_prefer_verified_proxies(self):
+        """测试存在验证通过的代理时优先使用"""
+        self.pool.report_success("2.2.2.2:80", latency=0.2)
+        self.assertEqual({self.pool.get() for _ in range(20)}, {"2.2.2.2:80"})
+
+
+if __name__ == "__main__":
+    unittest.main()
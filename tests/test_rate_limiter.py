@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+from spiders.rate_limiter import HostRateLimiter, scale_rate_limit
+
+
+class TestHostRateLimiter(unittest.TestCase):
+    def test_burst_then_wait(self):
+        """测试突发额度内不等待，超出后按速率排队"""
+        limiter = HostRateLimiter(requests_per_second=10, burst=2)
+        self.assertEqual(limiter.reserve("https://a.com/1"), 0)
+        self.assertEqual(limiter.reserve("https://a.com/2"), 0)
+        self.assertAlmostEqual(limiter.reserve("https://a.com/3"), 0.1, delta=0.02)
+        self.assertAlmostEqual(limiter.reserve("https://a.com/4"), 0.2, delta=0.02)
+
+    def test_hosts_are_independent(self):
+        """测试不同主机使用各自的令牌桶，且可按主机覆盖速率"""
+        limiter = HostRateLimiter(requests_per_second=1, hosts={"b.com": 0})
+        self.assertEqual(limiter.reserve("https://a.com/1"), 0)
+        self.assertEqual(limiter.reserve("https://c.com/1"), 0)
+        for _ in range(5):
+            self.assertEqual(limiter.reserve("https://b.com/1"), 0)
+
+    def test_scale_rate_limit(self):
+        """测试按进程数缩放速率且不修改原配置"""
+        config = {"SPIDER_CONFIG": {"rate_limit": {"requests_per_second": 1, "hosts": {"a.com": 4}}}}
+        scaled = scale_rate_limit(config, 0.5)
+        self.assertEqual(scaled["SPIDER_CONFIG"]["rate_limit"]["requests_per_second"], 0.5)
+        self.assertEqual(scaled["SPIDER_CONFIG"]["rate_limit"]["hosts"], {"a.com": 2})
+        self.assertEqual(config["SPIDER_CONFIG"]["rate_limit"]["requests_per_second"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
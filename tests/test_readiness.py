@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import unittest
+from selenium.common.exceptions import TimeoutException
+from spiders.readiness import element_count_stable, wait_until_ready
+
+
+class CountingDriver:
+    """每次查询返回下一个元素数量的假浏览器"""
+
+    def __init__(self, counts):
+        self.counts = list(counts)
+
+    def execute_script(self, script, *args):
+        return self.counts.pop(0) if len(self.counts) > 1 else self.counts[0]
+
+
+class TestReadiness(unittest.TestCase):
+    def test_element_count_stable(self):
+        """测试元素数量变化时不就绪，保持不变 stable_for 秒后就绪"""
+        condition = element_count_stable(".card", min_count=1, stable_for=0.05)
+        driver = CountingDriver([0, 5, 10, 10])
+        self.assertFalse(condition(driver))
+        self.assertFalse(condition(driver))
+        self.assertFalse(condition(driver))
+        self.assertFalse(condition(driver))
+        time.sleep(0.06)
+        self.assertTrue(condition(driver))
+
+    def test_wait_returns_early_or_times_out(self):
+        """测试条件满足后立即返回，数量不足时超时"""
+        start_time = time.monotonic()
+        wait_until_ready(
+            CountingDriver([3]), [element_count_stable(".card", stable_for=0)], 5, 0.01
+        )
+        self.assertLess(time.monotonic() - start_time, 1)
+
+        with self.assertRaises(TimeoutException):
+            wait_until_ready(
+                CountingDriver([0]), [element_count_stable(".card", stable_for=0)], 0.1, 0.01
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+from unittest import mock
+from selenium.common.exceptions import TimeoutException
+from spiders.retry import (
+    CaptchaError,
+    RetryEngine,
+    RetryPolicy,
+    classify_error,
+)
+
+
+class TestRetryEngine(unittest.TestCase):
+    def setUp(self):
+        self.config = {
+            "SPIDER_CONFIG": {
+                "retry": {
+                    "max_attempts": 3,
+                    "delay": 0,
+                    "jitter": 0,
+                    "policies": {"captcha": {"max_attempts": 2, "rotate": "driver"}},
+                }
+            }
+        }
+        self.rotations = []
+        self.engine = RetryEngine.from_config(
+            self.config, on_rotate=lambda *args: self.rotations.append(args[:2])
+        )
+
+    def test_backoff_delay(self):
+        """测试退避时间按倍数增长且不超过上限"""
+        policy = RetryPolicy(delay=1, backoff=2, max_delay=5, jitter=0)
+        self.assertEqual([policy.get_delay(i) for i in range(1, 5)], [1, 2, 4, 5])
+
+    def test_retry_until_success(self):
+        """测试可重试的错误在达到次数上限前重试"""
+        func = mock.Mock(side_effect=[TimeoutException(), TimeoutException(), "ok"])
+        self.assertEqual(self.engine.call(func), "ok")
+        self.assertEqual(func.call_count, 3)
+        self.assertEqual(self.rotations, [])
+
+    def test_per_error_policy_and_rotation(self):
+        """测试按错误类型使用各自的次数上限，并在重试前轮换"""
+        func = mock.Mock(side_effect=CaptchaError("验证码"))
+        with self.assertRaises(CaptchaError):
+            self.engine.call(func)
+        self.assertEqual(func.call_count, 2)
+        self.assertEqual(self.rotations, [("driver", "captcha")])
+
+        self.rotations.clear()
+        func = mock.Mock(side_effect=[CaptchaError("验证码"), "ok"])
+        self.assertEqual(self.engine.call(func, allow_rotate=False), "ok")
+        self.assertEqual(self.rotations, [])
+
+    def test_unknown_error_not_retried(self):
+        """测试无法归类的错误直接抛出"""
+        func = mock.Mock(side_effect=ValueError("解析失败"))
+        with self.assertRaises(ValueError):
+            self.engine.call(func)
+        self.assertEqual(func.call_count, 1)
+        self.assertIsNone(classify_error(ValueError()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import importlib.util
+import os
+import tempfile
+import unittest
+
+from spiders.storage import PartitionedParquetWriter
+
+
+@unittest.skipIf(importlib.util.find_spec("pyarrow") is None, "未安装 pyarrow")
+class TestPartitionedParquetWriter(unittest.TestCase):
+    def setUp(self):
+        """测试前的准备工作"""
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tempdir.name, "jobs")
+
+    def tearDown(self):
+        """测试后的清理工作"""
+        self.tempdir.cleanup()
+
+    def test_partitioned_dataset(self):
+        """测试按分区写入并以 Hive 分区读取"""
+        import pyarrow.dataset as ds
+
+        writer = PartitionedParquetWriter(self.root, partition_by=["crawl_date", "城市"], row_group_size=2)
+        for i in range(5):
+            writer.write({"职位": f"职位{i}", "薪资": f"{i}K", "城市": "深圳" if i % 2 else "广州"})
+        writer.close()
+
+        cities = sorted(name for name in os.listdir(os.path.join(self.root, f"crawl_date={writer.crawl_date}")))
+        self.assertEqual(len(cities), 2, "每个城市应该对应一个分区目录")
+
+        dataset = ds.dataset(self.root, format="parquet", partitioning="hive")
+        table = dataset.to_table(filter=ds.field("城市") == "深圳")
+        self.assertEqual(sorted(table.column("职位").to_pylist()), ["职位1", "职位3"])
+        self.assertEqual(dataset.count_rows(), 5)
+
+    def test_row_groups_and_missing_columns(self):
+        """测试按 row_group_size 写入 row group，后续记录缺少的列写为空值"""
+        import pyarrow.parquet as pq
+
+        writer = PartitionedParquetWriter(self.root, partition_by=["crawl_date"], row_group_size=2)
+        writer.write({"职位": "a", "薪资": "1K"})
+        writer.write({"职位": "b", "薪资": "2K"})
+        writer.write({"职位": "c"})
+        writer.close()
+
+        directory = os.path.join(self.root, f"crawl_date={writer.crawl_date}")
+        path = os.path.join(directory, os.listdir(directory)[0])
+        parquet_file = pq.ParquetFile(path)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 2)
+        self.assertEqual(parquet_file.read().column("薪资").to_pylist(), ["1K", "2K", None])
+
+    def test_type_change_between_row_groups(self):
+        """测试后续 row group 中字段类型变化时转换为列类型，不中断写入"""
+        import pyarrow.parquet as pq
+
+        writer = PartitionedParquetWriter(self.root, row_group_size=2)
+        writer.write({"职位": "a", "页码": 1, "标签": None})
+        writer.write({"职位": "b", "页码": 2, "标签": None})
+        writer.write({"职位": 3, "页码": "第三页", "标签": ["急招"]})
+        writer.write({"职位": "d", "页码": 4, "标签": {"类型": "全职"}})
+        writer.write({"职位": "e", "页码": "5", "标签": "远程"})
+        writer.write({"职位": "f", "页码": 6, "标签": 7})
+        writer.close()
+
+        directory = os.path.join(self.root, f"crawl_date={writer.crawl_date}")
+        table = pq.read_table(os.path.join(directory, os.listdir(directory)[0]))
+        self.assertEqual(table.column("职位").to_pylist(), ["a", "b", "3", "d", "e", "f"])
+        self.assertEqual(table.column("页码").to_pylist(), [1, 2, None, 4, None, 6])
+        self.assertEqual(table.column("标签").to_pylist()[2:5], ["['急招']", "{'类型': '全职'}", "远程"])
+        self.assertEqual(table.column("标签").to_pylist()[5], "7")
+        self.assertEqual(writer.invalid_values, 2)
+
+    def test_unfinished_file_is_hidden(self):
+        """测试未关闭的写入器只产生以 _ 开头的文件，不影响读取已完成的数据"""
+        import pyarrow.dataset as ds
+
+        finished = PartitionedParquetWriter(self.root, row_group_size=1)
+        finished.file_name = "part-finished.parquet"
+        finished.write({"职位": "a"})
+        finished.close()
+        crashed = PartitionedParquetWriter(self.root, row_group_size=1)
+        crashed.file_name = "part-crashed.parquet"
+        crashed.write({"职位": "b"})
+
+        directory = os.path.join(self.root, f"crawl_date={finished.crawl_date}")
+        self.assertEqual(
+            sorted(os.listdir(directory)), ["_part-crashed.parquet", "part-finished.parquet"]
+        )
+        dataset = ds.dataset(self.root, format="parquet", partitioning="hive")
+        self.assertEqual(dataset.to_table().column("职位").to_pylist(), ["a"])
+        crashed.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
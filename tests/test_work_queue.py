@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import time
+import unittest
+from spiders.rate_limiter import SharedRateLimiter
+from spiders.work_queue import SQLiteWorkQueue
+
+
+class TestSQLiteWorkQueue(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "queue.db")
+        self.queue = SQLiteWorkQueue(self.path)
+        self.tasks = [(f"Python|深圳|{page}", {"page": page}) for page in range(1, 4)]
+
+    def tearDown(self):
+        self.queue.close()
+        self.temp_dir.cleanup()
+
+    def test_lease_and_ack(self):
+        """测试按放入顺序租借任务，确认后结果写入结果队列，重复放入的任务被忽略"""
+        self.assertEqual(self.queue.put_tasks(self.tasks), 3)
+        self.assertEqual(self.queue.put_tasks(self.tasks), 0)
+
+        lease = self.queue.lease(60)
+        self.assertEqual(lease.task_id, "Python|深圳|1")
+        self.assertEqual(lease.payload, {"page": 1})
+        self.assertTrue(self.queue.ack(lease, [{"职位": "a"}, {"职位": "b"}]))
+        self.assertFalse(self.queue.ack(lease, [{"职位": "c"}]))
+
+        # 另一个进程打开同一个队列文件
+        other = SQLiteWorkQueue(self.path)
+        self.assertEqual(other.pop_results(1), [{"职位": "a"}])
+        self.assertEqual(other.pop_results(), [{"职位": "b"}])
+        self.assertEqual(other.counts(), {"pending": 2, "leased": 0, "done": 1, "dead": 0})
+        other.close()
+
+    def test_visibility_timeout(self):
+        """测试租约过期的任务重新被租借，原节点的确认和失败都不生效"""
+        self.queue.put_tasks(self.tasks[:1])
+        lease = self.queue.lease(0.05)
+        self.assertIsNone(self.queue.lease(60))
+        time.sleep(0.1)
+
+        retry = self.queue.lease(60)
+        self.assertEqual((retry.task_id, retry.attempts), (lease.task_id, 2))
+        self.assertNotEqual(retry.token, lease.token)
+        self.assertFalse(self.queue.fail(lease, "超时", max_attempts=3))
+        self.assertFalse(self.queue.ack(lease, [{"职位": "旧"}]))
+        self.assertTrue(self.queue.ack(retry, [{"职位": "新"}]))
+        self.assertEqual(self.queue.pop_results(), [{"职位": "新"}])
+
+    def test_fail_until_dead(self):
+        """测试失败的任务放回队列，达到最大尝试次数后放弃"""
+        self.queue.put_tasks(self.tasks[:1])
+        self.assertTrue(self.queue.fail(self.queue.lease(60), "超时", max_attempts=2))
+        self.assertFalse(self.queue.fail(self.queue.lease(60), "超时", max_attempts=2))
+        self.assertIsNone(self.queue.lease(60))
+        self.assertEqual(self.queue.counts()["dead"], 1)
+
+    def test_expired_lease_until_dead(self):
+        """测试租约多次过期（如节点反复崩溃）的任务在租借时被放弃"""
+        self.queue.put_tasks(self.tasks[:2])
+        self.queue.lease(0.01, max_attempts=2)
+        time.sleep(0.02)
+        self.assertEqual(self.queue.lease(0.01, max_attempts=2).task_id, "Python|深圳|1")
+        time.sleep(0.02)
+        lease = self.queue.lease(60, max_attempts=2)
+        self.assertEqual(lease.task_id, "Python|深圳|2")
+        self.assertEqual(self.queue.counts(), {"pending": 0, "leased": 1, "done": 0, "dead": 1})
+
+    def test_shared_rate_limit(self):
+        """测试多个节点共享同一个主机的请求速率"""
+        limiters = [
+            SharedRateLimiter(self.queue, requests_per_second=10),
+            SharedRateLimiter(SQLiteWorkQueue(self.path), requests_per_second=10),
+        ]
+        delays = [limiters[i % 2].reserve("https://www.zhipin.com/job") for i in range(4)]
+        self.assertEqual(delays[0], 0)
+        for previous, delay in zip(delays, delays[1:]):
+            self.assertAlmostEqual(delay - previous, 0.1, delta=0.02)
+        limiters[1].queue.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
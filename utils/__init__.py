@@ -2,5 +2,6 @@
 # -*- coding: utf-8 -*-
 
 from .city_mapping import get_city_id
+from .html_parser import parse_html
 
-__all__ = ["get_city_id"]
+__all__ = ["get_city_id", "parse_html"]
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""基于标准库 html.parser 的轻量级 HTML 解析工具
+
+供不启动浏览器的 HTTP 抓取模式使用，只支持简单的 CSS 选择器：
+标签名、.class、#id 及其组合（如 ``dd a``、``div.book_last``、``#content``），
+多个选择器之间用空格表示后代关系。
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+# 没有结束标签的元素
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+# 遇到同名开始标签时会隐式闭合的元素
+IMPLICIT_CLOSE_TAGS = {"p", "li", "dd", "dt", "option", "tr", "td", "th"}
+
+# 提取文本时需要换行的块级元素
+BLOCK_TAGS = {
+    "p", "div", "br", "li", "dd", "dt", "tr", "h1", "h2", "h3",
+    "h4", "h5", "h6", "section", "article", "ul", "ol", "dl", "table",
+}
+
+# 文本内容不需要提取的元素
+SKIP_TEXT_TAGS = {"script", "style", "noscript", "template"}
+
+_SIMPLE_SELECTOR_RE = re.compile(r"^([a-zA-Z0-9]*)((?:[.#][\w-]+)*)$")
+
+
+class Node:
+    """HTML 节点"""
+
+    def __init__(self, tag: str, attrs: Dict[str, str] = None, parent: "Node" = None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.parent = parent
+        self.children: List = []
+
+    @property
+    def classes(self) -> List[str]:
+        return self.attrs.get("class", "").split()
+
+    def get(self, name: str, default: str = "") -> str:
+        """获取属性值"""
+        value = self.attrs.get(name)
+        return default if value is None else value
+
+    def iter(self):
+        """深度优先遍历所有子孙节点"""
+        for child in self.children:
+            if isinstance(child, Node):
+                yield child
+                yield from child.iter()
+
+    def _collect_text(self, parts: List[str]) -> None:
+        for child in self.children:
+            if isinstance(child, str):
+                parts.append(child)
+            elif child.tag in SKIP_TEXT_TAGS:
+                continue
+            else:
+                if child.tag in BLOCK_TAGS:
+                    parts.append("\n")
+                child._collect_text(parts)
+                if child.tag in BLOCK_TAGS:
+                    parts.append("\n")
+
+    @property
+    def text(self) -> str:
+        """获取节点文本，块级元素和 <br> 按行分隔，行首尾空白被去除"""
+        parts: List[str] = []
+        self._collect_text(parts)
+        lines = [line.strip() for line in "".join(parts).replace("\xa0", " ").splitlines()]
+        return "\n".join(line for line in lines if line)
+
+    def matches(self, selector: str) -> bool:
+        """判断节点是否匹配单个简单选择器（如 ``a``、``div.cls``、``#id``）"""
+        match = _SIMPLE_SELECTOR_RE.match(selector)
+        if not match:
+            raise ValueError(f"不支持的选择器: {selector}")
+        tag, rest = match.groups()
+        if tag and tag.lower() != self.tag:
+            return False
+        for token in re.findall(r"[.#][\w-]+", rest):
+            if token[0] == "." and token[1:] not in self.classes:
+                return False
+            if token[0] == "#" and self.attrs.get("id") != token[1:]:
+                return False
+        return True
+
+    def select(self, selector: str) -> List["Node"]:
+        """按后代选择器查找所有匹配节点，结果按文档顺序排列"""
+        parts = selector.split()
+        if not parts:
+            return []
+        results = []
+        for node in self.iter():
+            if not node.matches(parts[-1]):
+                continue
+            # 自底向上依次匹配祖先选择器
+            ancestor = node.parent
+            index = len(parts) - 2
+            while index >= 0 and ancestor is not None and ancestor is not self.parent:
+                if ancestor.matches(parts[index]):
+                    index -= 1
+                ancestor = ancestor.parent
+            if index < 0:
+                results.append(node)
+        return results
+
+    def select_one(self, selector: str) -> Optional["Node"]:
+        """查找第一个匹配节点，未找到返回 None"""
+        results = self.select(selector)
+        return results[0] if results else None
+
+
+class _TreeBuilder(HTMLParser):
+    """把 HTML 文本解析成 Node 树"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("document")
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        if tag in IMPLICIT_CLOSE_TAGS and self.current.tag == tag:
+            self.current = self.current.parent
+        node = Node(tag, {k: (v if v is not None else "") for k, v in attrs}, self.current)
+        self.current.children.append(node)
+        if tag not in VOID_TAGS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, {k: (v if v is not None else "") for k, v in attrs}, self.current)
+        self.current.children.append(node)
+
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        # 找不到对应的开始标签时忽略该结束标签
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+def parse_html(html: str) -> Node:
+    """解析 HTML 文本
+
+    Args:
+        html: HTML 字符串
+
+    Returns:
+        Node: 文档根节点
+    """
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root